@@ -0,0 +1,3 @@
+"""
+Benchmark suite of the acquisition pipeline
+"""
@@ -0,0 +1,40 @@
+"""
+Run the benchmark suite, e.g.
+
+    python -m benchmarks --output benchmark.json
+    python -m benchmarks --output current.json --compare baseline.json
+"""
+import argparse
+import json
+import sys
+
+from benchmarks.suite import compare_results, run_suite
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks', description='Benchmark the acquisition pipeline')
+    parser.add_argument('--iterations', type=int, default=20, help='runs of each collector and game series')
+    parser.add_argument('--validation-seconds', type=float, default=1.,
+                        help='duration of validating each scheme')
+    parser.add_argument('--latency', type=float, default=0., help='seconds injected into each stand-in response')
+    parser.add_argument('--output', help='where the JSON result is written, default is stdout')
+    parser.add_argument('--compare', help='JSON result of a former run, which the current one is compared with')
+    args = parser.parse_args()
+
+    result = run_suite(args.iterations, args.validation_seconds, args.latency)
+    content = json.dumps(result, indent=2, sort_keys=True)
+    if args.output:
+        with open(args.output, 'w') as fp:
+            fp.write(content)
+    else:
+        print(content)
+
+    if args.compare:
+        with open(args.compare, 'r') as fp:
+            baseline = json.load(fp)
+        for line in compare_results(baseline, result):
+            print(line, file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
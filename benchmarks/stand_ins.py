@@ -0,0 +1,200 @@
+"""
+Local stand-ins of NBA Stats and S3, so that benchmarks never touch remote
+"""
+import datetime
+import hashlib
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from minio import S3Error
+from urllib3 import BaseHTTPResponse, HTTPHeaderDict
+
+
+__all__ = ['InMemoryS3Client', 'StandInServer']
+
+
+FIXTURE_DIRECTORY = os.path.join('tests', 'data', 'endpoints')
+# headers which are kept as they are, the others are user-defined metadata
+STANDARD_OBJECT_HEADERS = ('content-type', 'content-encoding')
+
+
+class StandInServer(object):
+    """
+    HTTP server in background thread which replies fixtures of endpoints,
+    the only fixture of an endpoint is replied whatever its parameters are
+
+    Args:
+        fixture_directory (str): where '{endpoint}/*.json' are located
+        latency (float): seconds injected into each response
+    """
+    def __init__(self, fixture_directory: str = FIXTURE_DIRECTORY, latency: float = 0.) -> None:
+        self.latency = latency
+        self.request_count = 0
+        self._fixtures: Dict[str, Tuple[bytes, str]] = {}
+        for endpoint in os.listdir(fixture_directory):
+            endpoint_directory = os.path.join(fixture_directory, endpoint)
+            if not os.path.isdir(endpoint_directory):
+                continue
+            file_name, *_ = sorted(name for name in os.listdir(endpoint_directory) if name.endswith('.json'))
+            with open(os.path.join(endpoint_directory, file_name), 'rb') as fp:
+                content = fp.read()
+            self._fixtures[endpoint] = (content, f'"{hashlib.md5(content).hexdigest()}"')
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), self._get_handler_class())
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f'http://127.0.0.1:{self._server.server_port}/stats/'
+
+    def _get_handler_class(self) -> type:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+
+            protocol_version = 'HTTP/1.1'
+            # headers and body are written separately, which shouldn't wait for delayed ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self) -> None:  # NOQA
+                server.request_count += 1
+                if server.latency > 0:
+                    time.sleep(server.latency)
+                endpoint = urlparse(self.path).path.rstrip('/').rsplit('/', 1)[-1]
+                if endpoint not in server._fixtures:
+                    self._reply(HTTPStatus.NOT_FOUND, b'')
+                    return
+                content, etag = server._fixtures[endpoint]
+                if self.headers.get('if-none-match') == etag:
+                    self._reply(HTTPStatus.NOT_MODIFIED, b'', etag)
+                    return
+                self._reply(HTTPStatus.OK, content, etag)
+
+            def _reply(self, status: HTTPStatus, content: bytes, etag: Optional[str] = None) -> None:
+                self.send_response(status.value)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(content)))
+                if etag:
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(content)
+
+            def log_message(self, *args: Any) -> None:  # NOQA
+                pass
+
+        return Handler
+
+    def start(self) -> 'StandInServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, name='stand-in-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> 'StandInServer':
+        return self.start()
+
+    def __exit__(self, *args: Any) -> None:
+        self.stop()
+
+
+class _StoredObject(object):
+
+    def __init__(self, data: bytes, headers: Dict[str, str]) -> None:
+        self.data = data
+        self.headers = HTTPHeaderDict(headers)
+        self.last_modified = datetime.datetime.now(datetime.timezone.utc)
+
+    @property
+    def metadata(self) -> HTTPHeaderDict:
+        return self.headers
+
+    def close(self) -> None:
+        pass
+
+    def release_conn(self) -> None:
+        pass
+
+
+class InMemoryS3Client(object):
+    """
+    Subset of 'minio.Minio' which swish_acquisition.s3 relies on, whose objects are kept in memory
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._objects: Dict[Tuple[str, str], _StoredObject] = {}
+        self.buckets: Set[str] = set()
+
+    def __len__(self) -> int:
+        return len(self._objects)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._objects.clear()
+
+    @staticmethod
+    def _get_headers(content_type: str, metadata: Optional[Dict[str, str]]) -> Dict[str, str]:
+        headers = {'content-type': content_type}
+        for key, value in (metadata or {}).items():
+            key = key.lower()
+            if key not in STANDARD_OBJECT_HEADERS and not key.startswith('x-amz-meta-'):
+                key = f'x-amz-meta-{key}'
+            headers[key] = value
+        return headers
+
+    def _get_object(self, bucket_name: str, object_name: str) -> _StoredObject:
+        with self._lock:
+            stored_object = self._objects.get((bucket_name, object_name))
+        if stored_object is None:
+            raise S3Error(
+                code='NoSuchKey',
+                message='The specified key does not exist.',
+                resource=f'/{bucket_name}{object_name}',
+                request_id='STANDIN',
+                host_id='stand-in',
+                response=BaseHTTPResponse(
+                    status=HTTPStatus.NOT_FOUND.value,
+                    version=1,
+                    reason=None,
+                    decode_content=False,
+                    request_url=None
+                ),
+                bucket_name=bucket_name,
+                object_name=object_name
+            )
+        return stored_object
+
+    def put_object(self, bucket_name: str, object_name: str, data: io.BytesIO, length: int,
+                   content_type: str = 'application/octet-stream',
+                   metadata: Optional[Dict[str, str]] = None, **_: Any) -> None:
+        stored_object = _StoredObject(data.read(length), self._get_headers(content_type, metadata))
+        with self._lock:
+            self._objects[(bucket_name, object_name)] = stored_object
+
+    def get_object(self, bucket_name: str, object_name: str, **_: Any) -> _StoredObject:
+        return self._get_object(bucket_name, object_name)
+
+    def stat_object(self, bucket_name: str, object_name: str, **_: Any) -> _StoredObject:
+        return self._get_object(bucket_name, object_name)
+
+    def copy_object(self, bucket_name: str, object_name: str, source: Any,
+                    metadata: Optional[Dict[str, str]] = None, **_: Any) -> None:
+        source_object = self._get_object(source.bucket_name, source.object_name)
+        headers = self._get_headers(source_object.headers.get('content-type', 'application/octet-stream'), metadata)
+        with self._lock:
+            self._objects[(bucket_name, object_name)] = _StoredObject(source_object.data, headers)
+
+    def bucket_exists(self, bucket_name: str) -> bool:
+        return bucket_name in self.buckets
+
+    def make_bucket(self, bucket_name: str) -> None:
+        self.buckets.add(bucket_name)
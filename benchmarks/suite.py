@@ -0,0 +1,269 @@
+"""
+Scenarios of the benchmark suite
+
+* collectors, latency of each collector, which requests the stand-in server and stores into in-memory S3
+* game_series, end-to-end time of a game series, cold (nothing stored) and warm (everything stored)
+* schemes, documents validated per second by each scheme of endpoints,
+  along with the ones constructed from trusted data
+
+Memory high-water mark of each scenario is traced by 'tracemalloc' in a separate run,
+so that tracing doesn't skew the timings
+"""
+from contextlib import contextmanager, ExitStack
+import datetime
+import json
+import math
+import os
+import platform
+import resource
+import subprocess
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple, Type
+from unittest.mock import patch
+
+from benchmarks.stand_ins import FIXTURE_DIRECTORY, InMemoryS3Client, StandInServer
+from swish_acquisition.celery_app import app
+from swish_acquisition.collectors import (
+    BoxscoreSummaryCollector,
+    CommonPlayerInfoCollector,
+    PlayByPlayCollector,
+    ScoreboardCollector,
+    TeamDetailsCollector
+)
+from swish_acquisition.conf import settings
+from swish_acquisition.endpoints import (
+    BoxScoreSummaryV3Endpoint,
+    CommonPlayerInfoEndpoint,
+    PlayByPlayV3Endpoint,
+    ScoreboardV3Endpoint,
+    TeamDetailsEndpoint
+)
+from swish_acquisition.endpoints.base import Endpoint
+from swish_acquisition.latency import reset_latency_trackers
+from swish_acquisition.scheme.trusted import construct_model
+from swish_acquisition.tasks import scrape_single_game_series
+from swish_acquisition.transport import reset_http_client
+
+
+__all__ = ['compare_results', 'run_suite']
+
+
+GAME_DATE = datetime.date(2010, 6, 17)
+GAME_ID = '0040900407'
+COLLECTOR_SPECS: Sequence[Tuple[Type, Dict]] = (
+    (ScoreboardCollector, {'game_date': GAME_DATE, 'league_id': '00'}),
+    (BoxscoreSummaryCollector, {'game_date': GAME_DATE, 'game_id': GAME_ID}),
+    (TeamDetailsCollector, {'game_date': GAME_DATE, 'team_id': 1610612741}),
+    (CommonPlayerInfoCollector, {'game_date': GAME_DATE, 'player_id': 893}),
+    (PlayByPlayCollector, {'game_date': GAME_DATE, 'game_id': GAME_ID})
+)
+SCHEME_ENDPOINTS: Sequence[Type[Endpoint]] = (
+    BoxScoreSummaryV3Endpoint,
+    CommonPlayerInfoEndpoint,
+    PlayByPlayV3Endpoint,
+    ScoreboardV3Endpoint,
+    TeamDetailsEndpoint
+)
+
+
+def _summarize(durations: List[float]) -> Dict[str, float]:
+    """
+    Statistics of durations in seconds, percentiles are nearest-rank
+    """
+    ordered = sorted(durations)
+
+    def _percentile(q: float) -> float:
+        return ordered[min(max(math.ceil(q / 100 * len(ordered)), 1), len(ordered)) - 1]
+
+    return {
+        'count': len(ordered),
+        'mean': sum(ordered) / len(ordered),
+        'min': ordered[0],
+        'p50': _percentile(50),
+        'p95': _percentile(95),
+        'max': ordered[-1]
+    }
+
+
+def _time(func: Callable[[], Any], iterations: int, before: Optional[Callable[[], Any]] = None) -> List[float]:
+    durations = []
+    for _ in range(max(iterations, 1)):
+        if before is not None:
+            before()
+        started_time = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - started_time)
+    return durations
+
+
+def _get_throughput(func: Callable[[], Any], seconds: float) -> float:
+    """
+    Calls per second, which is called at least once
+    """
+    count = 0
+    started_time = time.perf_counter()
+    elapsed = 0.
+    while count == 0 or elapsed < seconds:
+        func()
+        count += 1
+        elapsed = time.perf_counter() - started_time
+    return count / elapsed
+
+
+def _trace_peak_memory(func: Callable[[], Any], before: Optional[Callable[[], Any]] = None) -> int:
+    """
+    Peak of memory allocated by Python during a single run, in bytes
+    """
+    if before is not None:
+        before()
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+@contextmanager
+def stand_in_environment(latency: float = 0.) -> Iterator[Tuple[StandInServer, InMemoryS3Client]]:
+    """
+    Endpoints request the stand-in server, and collectors store into in-memory S3.
+    Rate limit and entity index are disabled, and Celery tasks are run eagerly
+    """
+    s3_client = InMemoryS3Client()
+    with StandInServer(latency=latency) as server, ExitStack() as stack:
+        patchers: Sequence[Any] = (
+            patch.object(Endpoint, 'BASE_URL', server.base_url),
+            patch('swish_acquisition.s3.S3_CLIENT', s3_client),
+            patch.object(settings, 'HTTP_CASSETTE_MODE', None),
+            patch.object(settings, 'RATE_LIMIT_RATE', 0),
+            patch.object(settings, 'CIRCUIT_BREAKER_BACKEND', 'memory'),
+            patch.object(settings, 'KNOWN_ENTITY_BACKEND', None)
+        )
+        for patcher in patchers:
+            stack.enter_context(patcher)
+        stack.callback(app.conf.update, task_always_eager=app.conf.task_always_eager,
+                       task_eager_propagates=app.conf.task_eager_propagates)
+        app.conf.update(task_always_eager=True, task_eager_propagates=True)
+        reset_http_client()
+        reset_latency_trackers()
+        try:
+            yield server, s3_client
+        finally:
+            reset_http_client()
+            reset_latency_trackers()
+
+
+def benchmark_collectors(s3_client: InMemoryS3Client, iterations: int) -> Dict[str, Dict]:
+    results = {}
+    for collector_class, kwargs in COLLECTOR_SPECS:
+        def _run() -> None:
+            collector_class(**kwargs).run(lazy=True)
+
+        results[collector_class.__name__] = {
+            'latency': _summarize(_time(_run, iterations, before=s3_client.clear)),
+            'peak_memory': _trace_peak_memory(_run, before=s3_client.clear)
+        }
+    return results
+
+
+def benchmark_game_series(server: StandInServer, s3_client: InMemoryS3Client, iterations: int) -> Dict[str, Dict]:
+    def _run() -> None:
+        scrape_single_game_series.apply(kwargs={'game_date': GAME_DATE.isoformat(), 'game_id': GAME_ID})
+
+    request_count = server.request_count
+    _run()
+    s3_client.clear()
+    requests_per_game = server.request_count - request_count
+    return {
+        'cold': {
+            'latency': _summarize(_time(_run, iterations, before=s3_client.clear)),
+            'peak_memory': _trace_peak_memory(_run, before=s3_client.clear),
+            'requests': requests_per_game
+        },
+        # everything has been stored by the former run
+        'warm': {
+            'latency': _summarize(_time(_run, iterations)),
+            'peak_memory': _trace_peak_memory(_run)
+        }
+    }
+
+
+def benchmark_schemes(seconds: float) -> Dict[str, Dict]:
+    results = {}
+    for endpoint_class in SCHEME_ENDPOINTS:
+        endpoint_directory = os.path.join(FIXTURE_DIRECTORY, endpoint_class.ENDPOINT)
+        file_name, *_ = sorted(name for name in os.listdir(endpoint_directory) if name.endswith('.json'))
+        with open(os.path.join(endpoint_directory, file_name), 'r') as fp:
+            document = json.load(fp)
+        model = endpoint_class.DATA_MODEL
+        results[model.__name__] = {
+            'docs_per_second': _get_throughput(lambda: model.model_validate(document), seconds),
+            'trusted_docs_per_second': _get_throughput(lambda: construct_model(model, document), seconds),
+            'peak_memory': _trace_peak_memory(lambda: model.model_validate(document))
+        }
+    return results
+
+
+def _get_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, check=True,
+                              text=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_suite(iterations: int = 20, validation_seconds: float = 1., latency: float = 0.) -> Dict[str, Any]:
+    """
+    Run every scenario, whose durations are in seconds and memory in bytes
+
+    Args:
+        iterations (int): runs of each collector and game series
+        validation_seconds (float): duration of validating each scheme
+        latency (float): seconds injected into each response of the stand-in server
+    """
+    with stand_in_environment(latency) as (server, s3_client):
+        collectors = benchmark_collectors(s3_client, iterations)
+        game_series = benchmark_game_series(server, s3_client, iterations)
+    schemes = benchmark_schemes(validation_seconds)
+    return {
+        'commit': _get_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'created_time': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'parameters': {'iterations': iterations, 'validation_seconds': validation_seconds, 'latency': latency},
+        'results': {
+            'collectors': collectors,
+            'game_series': game_series,
+            'schemes': schemes,
+            # kilobytes on Linux, whole process since it started
+            'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        }
+    }
+
+
+def _flatten(data: Any, prefix: str = '') -> Dict[str, float]:
+    if isinstance(data, dict):
+        flattened = {}
+        for key, value in data.items():
+            flattened.update(_flatten(value, f'{prefix}.{key}' if prefix else key))
+        return flattened
+    if isinstance(data, (int, float)) and not isinstance(data, bool):
+        return {prefix: data}
+    return {}
+
+
+def compare_results(baseline: Dict[str, Any], current: Dict[str, Any]) -> List[str]:
+    """
+    Relative change of each metric which both results have
+    """
+    baseline_metrics = _flatten(baseline.get('results', {}))
+    current_metrics = _flatten(current.get('results', {}))
+    lines = []
+    for key in sorted(baseline_metrics.keys() & current_metrics.keys()):
+        before, after = baseline_metrics[key], current_metrics[key]
+        change = f'{(after - before) / before:+.1%}' if before else 'n/a'
+        lines.append(f'{key}: {before:.6g} -> {after:.6g} ({change})')
+    return lines
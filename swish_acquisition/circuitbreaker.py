@@ -0,0 +1,113 @@
+"""
+Circuit breaker towards remote endpoints
+
+Once remote keeps failing, requests towards it fail fast instead of waiting for timeouts,
+until a single probe finds it recovered
+"""
+import logging
+import time
+
+from swish_acquisition.conf import settings
+from swish_acquisition.shared_state import get_shared_state, SharedState
+
+
+__all__ = ['CircuitBreaker', 'CircuitOpenError', 'get_circuit_breaker']
+
+
+logger = logging.getLogger(__name__)
+
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+
+class CircuitOpenError(Exception):
+    """
+    Request is rejected since the circuit is open
+
+    Args:
+        name (str): name of the circuit breaker
+        retry_after (float): seconds before the circuit would be probed
+    """
+    def __init__(self, name: str, retry_after: float) -> None:
+        super().__init__(f'circuit \'{name}\' is open, retry after {retry_after:.0f}s')
+        self.name = name
+        self.retry_after = retry_after
+
+
+class CircuitBreaker(object):
+    """
+    Circuit breaker whose state is shared by all of its holders
+
+    * closed, requests pass, it opens after 'failure_threshold' consecutive failures
+    * open, requests are rejected until 'recovery_timeout' seconds passed
+    * half-open, a single request passes as the probe, which either closes or opens the circuit again,
+      the others are still rejected. A probe without result for 'recovery_timeout' seconds is abandoned
+    """
+    def __init__(self, name: str, failure_threshold: int, recovery_timeout: float,
+                 shared_state: SharedState) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self._shared_state = shared_state
+
+    @property
+    def state_key(self) -> str:
+        return f'circuit_breaker.{self.name}'
+
+    def before_request(self) -> None:
+        """
+        Raises:
+            CircuitOpenError: the request is rejected
+        """
+        if self.failure_threshold <= 0:
+            return
+        with self._shared_state.locked(self.state_key) as state:
+            status = state.get('status', CLOSED)
+            if status == CLOSED:
+                return
+            now = time.time()
+            retry_after = state['opened_time'] + self.recovery_timeout - now
+            if retry_after <= 0:
+                # the first one after recovery timeout is the probe
+                state['status'] = HALF_OPEN
+                state['opened_time'] = now
+                logger.info(f'circuit \'{self.name}\' is half-open, probing')
+                return
+        raise CircuitOpenError(self.name, retry_after)
+
+    def record_success(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._shared_state.locked(self.state_key) as state:
+            if state.get('status', CLOSED) != CLOSED:
+                logger.info(f'circuit \'{self.name}\' is closed')
+            state.clear()
+
+    def record_failure(self) -> None:
+        if self.failure_threshold <= 0:
+            return
+        with self._shared_state.locked(self.state_key) as state:
+            status = state.get('status', CLOSED)
+            failures = state.get('failures', 0) + 1
+            state['failures'] = failures
+            if status == HALF_OPEN or (status == CLOSED and failures >= self.failure_threshold):
+                state['status'] = OPEN
+                state['opened_time'] = time.time()
+                logger.warning(f'circuit \'{self.name}\' is open after {failures} consecutive failures')
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """
+    Circuit breaker of the named remote endpoint, configured by
+    * settings.CIRCUIT_BREAKER_BACKEND, refer to swish_acquisition.shared_state::get_shared_state
+    * settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD, non-positive value disables the circuit breaker
+    * settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT
+    """
+    return CircuitBreaker(
+        name=name,
+        failure_threshold=settings.CIRCUIT_BREAKER_FAILURE_THRESHOLD,
+        recovery_timeout=settings.CIRCUIT_BREAKER_RECOVERY_TIMEOUT,
+        shared_state=get_shared_state(settings.CIRCUIT_BREAKER_BACKEND)
+    )
@@ -1,45 +1,269 @@
 """
 Basis components which can collect and store raw data
 """
+import asyncio
+import datetime
 import json
 import logging
-from typing import Dict, Protocol
+from typing import Callable, Dict, Optional, Protocol, Sequence, Tuple
 
 from minio import S3Error
 
+from swish_acquisition.conf import settings
+from swish_acquisition.entity_index import get_known_entity_index, KnownEntityIndex
+from swish_acquisition.s3 import StoredObjectStat
+
 
 logger = logging.getLogger(__name__)
 
 
 class EndpointCollectorProtocol(Protocol):
 
+    # refer to S3MixIn::object_path
+    @property
+    def object_path(self) -> str: ...
+
     # refer to S3MixIn::upload_to_s3
-    def upload_to_s3(self, data: Dict) -> None: ...
+    def upload_to_s3(self, data: Dict, upstream_validators: Optional[Dict[str, str]] = None,
+                     partial: bool = False) -> None: ...
+
+    # refer to S3MixIn::renew_object
+    def renew_object(self, stat: StoredObjectStat) -> None: ...
 
     # refer to Endpoint::get_dict
     def get_dict(self, overwritten: bool = False) -> Dict: ...
 
+    # refer to Endpoint::get_modified_dict
+    def get_modified_dict(self, validators: Dict[str, str]) -> Optional[Dict]: ...
+
+    # refer to Endpoint::get_validators
+    def get_validators(self) -> Dict[str, str]: ...
+
     # refer to Endpoint::_set_data_dict
-    def _set_data_dict(self, data_dict: Dict) -> None: ...
+    def _set_data_dict(self, data_dict: Dict, trusted: bool = False) -> None: ...
+
+    # refer to Endpoint::_set_data_loader
+    def _set_data_loader(self, data_loader: Callable[[], Dict]) -> None: ...
 
     # refer to S3MixIn::get_object_data
     def get_object_data(self) -> Dict: ...
 
+    # refer to S3MixIn::is_object_existed
+    def is_object_existed(self) -> bool: ...
+
+    # refer to S3MixIn::get_object_stat
+    def get_object_stat(self) -> Optional[StoredObjectStat]: ...
+
+    # refer to S3MixIn::get_object_data_and_stat
+    def get_object_data_and_stat(self) -> Tuple[Dict, StoredObjectStat]: ...
+
     # refer to Endpoint::get_params
     def get_params(self) -> Dict: ...
 
+    # refer to EndpointCollectorMixIn::get_refresh_interval
+    def get_refresh_interval(self) -> Optional[int]: ...
+
+    # refer to EndpointCollectorMixIn::get_known_entity_index
+    def get_known_entity_index(self) -> Optional[KnownEntityIndex]: ...
+
+    # refer to EndpointCollectorMixIn::is_collected
+    def is_collected(self) -> bool: ...
+
+    # refer to EndpointCollectorMixIn::_is_stale
+    def _is_stale(self, stat: StoredObjectStat) -> bool: ...
+
+    # refer to EndpointCollectorMixIn::_use_stored_object
+    def _use_stored_object(self, lazy: bool) -> Tuple[bool, Optional[StoredObjectStat]]: ...
+
+    # refer to EndpointCollectorMixIn::_collect
+    def _collect(self, overwritten: bool, stat: Optional[StoredObjectStat]) -> Optional[Dict]: ...
+
+    # refer to EndpointCollectorMixIn::run
+    def run(self, overwritten: bool = False, lazy: bool = False) -> None: ...
+
+    # refer to EndpointCollectorMixIn::arun
+    async def arun(self, overwritten: bool = False, lazy: bool = False) -> None: ...
+
 
 class EndpointCollectorMixIn(object):
 
-    def run(self: EndpointCollectorProtocol, overwritten: bool = False) -> None:
-        if not overwritten:
+    # whether stored objects are indexed, which suits entities shared by games,
+    # refer to swish_acquisition.entity_index
+    IS_ENTITY_INDEXED: bool = False
+    # seconds before the stored object is stale and collected again, None means never refreshed
+    REFRESH_INTERVAL: Optional[int] = None
+    # whether partial objects may be stored, e.g. incremental collection of a live game,
+    # which are checked along with their metadata and collected again, refer to StoredObjectStat::is_partial
+    HAS_PARTIAL_OBJECTS: bool = False
+
+    def get_refresh_interval(self: EndpointCollectorProtocol) -> Optional[int]:
+        """
+        Refresh policy of the stored object, which can be overridden, e.g. refreshed more often in season
+        """
+        return getattr(self, 'REFRESH_INTERVAL', None)
+
+    def get_known_entity_index(self: EndpointCollectorProtocol) -> Optional[KnownEntityIndex]:
+        bucket_name = getattr(self, 'BUCKET_NAME', None)
+        if not getattr(self, 'IS_ENTITY_INDEXED', False) or bucket_name is None:
+            return None
+        # known entities expire along with the refresh policy
+        return get_known_entity_index(bucket_name, self.get_refresh_interval())
+
+    def is_collected(self: EndpointCollectorProtocol) -> bool:
+        """
+        Whether the object has been stored, known entities skip the check, partial objects aren't counted
+        """
+        known_entity_index = self.get_known_entity_index()
+        if known_entity_index is not None and known_entity_index.is_known(self.object_path):
+            return True
+        if getattr(self, 'HAS_PARTIAL_OBJECTS', False):
+            stat = self.get_object_stat()
+            return stat is not None and not stat.is_partial
+        return self.is_object_existed()
+
+    def _is_stale(self: EndpointCollectorProtocol, stat: StoredObjectStat) -> bool:
+        if stat.is_partial:
+            logger.info(f'{self.__class__.__name__} | {json.dumps(self.get_params())} | '
+                        f'stored object is partial')
+            return True
+        refresh_interval = self.get_refresh_interval()
+        if refresh_interval is None or stat.last_modified is None:
+            return False
+        age = (datetime.datetime.now(datetime.timezone.utc) - stat.last_modified).total_seconds()
+        if age < refresh_interval:
+            return False
+        logger.info(f'{self.__class__.__name__} | {json.dumps(self.get_params())} | '
+                    f'stored object is stale, which was modified {age:.0f}s ago')
+        return True
+
+    def _use_stored_object(self: EndpointCollectorProtocol, lazy: bool) -> Tuple[bool, Optional[StoredObjectStat]]:
+        """
+        Returns:
+            bool: whether the stored object is used, false when it doesn't exist or it is stale
+            Optional[StoredObjectStat]: metadata of the stored object, when it has been checked
+        """
+        known_entity_index = self.get_known_entity_index()
+        if lazy and known_entity_index is not None and known_entity_index.is_known(self.object_path):
+            self._set_data_loader(self.get_object_data)
+            return True, None
+
+        # objects under refresh policy or possibly partial are checked along with their metadata,
+        # which costs a single round trip in both modes
+        stat: Optional[StoredObjectStat] = None
+        if self.get_refresh_interval() is None and not getattr(self, 'HAS_PARTIAL_OBJECTS', False):
+            if lazy:
+                if not self.is_object_existed():
+                    return False, None
+                self._set_data_loader(self.get_object_data)
+            else:
+                try:
+                    self._set_data_dict(self.get_object_data(), trusted=True)
+                except S3Error:
+                    return False, None
+        elif lazy:
+            stat = self.get_object_stat()
+            if stat is None or self._is_stale(stat):
+                return False, stat
+            self._set_data_loader(self.get_object_data)
+        else:
             try:
-                obj_data = self.get_object_data()
-                self._set_data_dict(obj_data)
-                return
+                data, stat = self.get_object_data_and_stat()
             except S3Error:
-                pass
+                return False, None
+            if self._is_stale(stat):
+                return False, stat
+            self._set_data_dict(data, trusted=True)
+
+        if known_entity_index is not None:
+            # entities under refresh policy are known since they were modified
+            known_entity_index.add(
+                self.object_path,
+                stat.last_modified.timestamp() if stat is not None and stat.last_modified else None
+            )
+        return True, stat
+
+    def _collect(self: EndpointCollectorProtocol, overwritten: bool,
+                 stat: Optional[StoredObjectStat]) -> Optional[Dict]:
+        """
+        Collect data from remote, conditionally when the stored object carries validators of upstream
+
+        Returns:
+            Optional[Dict]: None when upstream data isn't modified since the object was stored
+        """
+        if overwritten and stat is None and settings.CONDITIONAL_REQUEST_ENABLED:
+            # checking metadata of stored object is much cheaper than downloading from remote
+            stat = self.get_object_stat()
+        validators = stat.get_upstream_validators() if stat is not None else {}
+        if not validators or not settings.CONDITIONAL_REQUEST_ENABLED:
+            return self.get_dict(overwritten)
+
+        data = self.get_modified_dict(validators)
+        if data is None:
+            assert stat is not None
+            # the stored copy is kept, and it's fresh again
+            self.renew_object(stat)
+            self._set_data_loader(self.get_object_data)
+        return data
+
+    def run(self: EndpointCollectorProtocol, overwritten: bool = False, lazy: bool = False) -> None:
+        """
+        Collect data from remote and store it, unless it has been stored and isn't stale
+
+        Args:
+            overwritten (bool): when true, always collect data from remote and overwrite the stored one,
+                unless upstream replies that it isn't modified to the conditional request
+            lazy (bool): when true, only check whether the object exists,
+                the stored data would be downloaded until it is asked for.
+                Indexed entities which are known skip the check
+        """
+        stat: Optional[StoredObjectStat] = None
+        if not overwritten:
+            is_used, stat = self._use_stored_object(lazy)
+            if is_used:
+                return
+
+        data = self._collect(overwritten, stat)
+        if data is not None:
+            self.upload_to_s3(data, self.get_validators())
+        known_entity_index = self.get_known_entity_index()
+        if known_entity_index is not None:
+            known_entity_index.add(self.object_path)
+        status = 'finished' if data is not None else 'not modified'
+        logger.info(f'{self.__class__.__name__} | {json.dumps(self.get_params())} | {status}')
+
+    async def arun(self: EndpointCollectorProtocol, overwritten: bool = False, lazy: bool = False) -> None:
+        # endpoint requests are blocking I/O, which are delegated to threads
+        await asyncio.to_thread(self.run, overwritten, lazy)
+
+
+async def _run_collectors(collectors: Sequence[EndpointCollectorProtocol],
+                          overwritten: bool, lazy: bool, concurrency: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def _run(collector: EndpointCollectorProtocol) -> None:
+        async with semaphore:
+            await collector.arun(overwritten, lazy)
+
+    results = await asyncio.gather(*[_run(collector) for collector in collectors], return_exceptions=True)
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+def run_collectors(collectors: Sequence[EndpointCollectorProtocol], overwritten: bool = False,
+                   lazy: bool = False, concurrency: Optional[int] = None) -> None:
+    """
+    Run collectors concurrently, which waits until all of them finished
+    requests towards remote are still limited by swish_acquisition.ratelimit::get_rate_limiter
 
-        data = self.get_dict(overwritten)
-        self.upload_to_s3(data)
-        logger.info(f'{self.__class__.__name__} | {json.dumps(self.get_params())} | finished')
+    Args:
+        collectors (Sequence[EndpointCollectorProtocol]): collectors to be run
+        overwritten (bool): refer to EndpointCollectorMixIn::run
+        lazy (bool): refer to EndpointCollectorMixIn::run
+        concurrency (int): upper limit of collectors running at the same time,
+            default is settings.COLLECTOR_CONCURRENCY
+    """
+    if not collectors:
+        return
+    concurrency = settings.COLLECTOR_CONCURRENCY if concurrency is None else concurrency
+    asyncio.run(_run_collectors(collectors, overwritten, lazy, max(concurrency, 1)))
@@ -1,7 +1,8 @@
 """
 Collect and store Common Player Info raw data
 """
-from typing import Any, Dict
+import datetime
+from typing import Any, Dict, Optional
 
 from swish_acquisition.collectors.base import EndpointCollectorMixIn
 from swish_acquisition.endpoints import CommonPlayerInfoEndpoint
@@ -11,6 +12,10 @@ from swish_acquisition.s3 import S3MixIn
 class CommonPlayerInfoCollector(CommonPlayerInfoEndpoint, S3MixIn, EndpointCollectorMixIn):
 
     BUCKET_NAME = 'commonplayerinfo'
+    IS_ENTITY_INDEXED = True
+    REFRESH_INTERVAL = 86400  # 1 day, during the season
+    OFF_SEASON_REFRESH_INTERVAL = 604800  # 7 days
+    OFF_SEASON_MONTHS = (7, 8, 9)
     OBJECT_NAME_PATTERN = '/{player_id}.json'
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:  # NOQA
@@ -20,3 +25,9 @@ class CommonPlayerInfoCollector(CommonPlayerInfoEndpoint, S3MixIn, EndpointColle
         return {
             'player_id': self.player_id
         }
+
+    def get_refresh_interval(self) -> Optional[int]:
+        # players rarely change when there is no game
+        if datetime.datetime.now(datetime.timezone.utc).month in self.OFF_SEASON_MONTHS:
+            return self.OFF_SEASON_REFRESH_INTERVAL
+        return self.REFRESH_INTERVAL
@@ -1,17 +1,30 @@
 """
 Collect and store PlayByPlay raw data
 """
-from typing import Any, Dict
+import json
+import logging
+from typing import Any, Dict, List
+
+from minio import S3Error
 
 from swish_acquisition.collectors.base import EndpointCollectorMixIn
 from swish_acquisition.endpoints import PlayByPlayV3Endpoint
 from swish_acquisition.s3 import S3MixIn
 
 
+logger = logging.getLogger(__name__)
+
+
+# upper bound of periods requested by live polling, far beyond the most overtimes ever played
+LIVE_END_PERIOD = 20
+
+
 class PlayByPlayCollector(PlayByPlayV3Endpoint, S3MixIn, EndpointCollectorMixIn):
 
     BUCKET_NAME = 'playbyplay'
     OBJECT_NAME_PATTERN = '/{year:04d}/{month:02d}/{day:02d}/{game_id}.json'
+    # live games are stored partially, refer to merge_live_actions
+    HAS_PARTIAL_OBJECTS = True
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:  # NOQA
         super().__init__(*args, **kwargs)
@@ -23,3 +36,41 @@ class PlayByPlayCollector(PlayByPlayV3Endpoint, S3MixIn, EndpointCollectorMixIn)
             'day': self.game_date.day,
             'game_id': self.game_id
         }
+
+    def merge_live_actions(self) -> int:
+        """
+        Collect actions of an in-progress game, which are merged into the stored object append-only
+
+        Only periods since the latest stored one are requested, and the actions whose
+        (actionNumber, actionId) haven't been stored are appended. The stored object is
+        uploaded again only when there are new actions, which is marked as partial,
+        so that it is collected in whole by the next run instead of being used
+
+        Returns:
+            int: amount of actions appended
+        """
+        try:
+            stored_data = self.get_object_data()
+        except S3Error:
+            stored_data = {}
+        stored_actions: List[Dict] = stored_data.get('game', {}).get('actions', [])
+        if stored_actions:
+            # the latest stored period may be still in progress
+            self.start_period = max(action['period'] for action in stored_actions)
+            self.end_period = LIVE_END_PERIOD
+
+        data = self.get_dict(overwritten=True)
+        # actions of the same event share actionNumber, which are told apart by actionId
+        stored_keys = {(action['actionNumber'], action['actionId']) for action in stored_actions}
+        new_actions = [
+            action for action in data['game']['actions']
+            if (action['actionNumber'], action['actionId']) not in stored_keys
+        ]
+        if new_actions:
+            merged_data = {**data, 'game': {**data['game'], 'actions': stored_actions + new_actions}}
+            # validators of the partial response don't describe the merged object
+            self.upload_to_s3(merged_data, partial=True)
+            self._set_data_dict(merged_data)
+        logger.info(f'{self.__class__.__name__} | {json.dumps(self.get_params())} | '
+                    f'{len(new_actions)} new actions merged into {len(stored_actions)} stored')
+        return len(new_actions)
@@ -11,6 +11,8 @@ from swish_acquisition.s3 import S3MixIn
 class TeamDetailsCollector(TeamDetailsEndpoint, S3MixIn, EndpointCollectorMixIn):
 
     BUCKET_NAME = 'teamdetails'
+    IS_ENTITY_INDEXED = True
+    REFRESH_INTERVAL = 604800  # 7 days
     OBJECT_NAME_PATTERN = '/{team_id}.json'
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:  # NOQA
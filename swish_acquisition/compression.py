@@ -0,0 +1,102 @@
+"""
+Compression of stored raw data
+
+Compressed objects are declared by 'Content-Encoding',
+while reading relies on the magic number of content,
+so that it is compatible with uncompressed objects and transparently decoded responses
+"""
+import gzip
+from typing import Dict, Optional, Type
+
+
+__all__ = ['decompress', 'get_storage_codec', 'StorageCodec']
+
+
+class StorageCodec(object):
+
+    name: str
+    content_encoding: Optional[str] = None  # value of 'Content-Encoding' header
+    magic_number: Optional[bytes] = None    # leading bytes of compressed content
+
+    def compress(self, content: bytes) -> bytes:
+        raise NotImplementedError
+
+    def decompress(self, content: bytes) -> bytes:
+        raise NotImplementedError
+
+
+class IdentityCodec(StorageCodec):
+
+    name = 'identity'
+
+    def compress(self, content: bytes) -> bytes:
+        return content
+
+    def decompress(self, content: bytes) -> bytes:
+        return content
+
+
+class GzipCodec(StorageCodec):
+
+    name = 'gzip'
+    content_encoding = 'gzip'
+    magic_number = b'\x1f\x8b'
+
+    def __init__(self, level: int = 6) -> None:
+        self._level = level
+
+    def compress(self, content: bytes) -> bytes:
+        # fixed mtime makes the output deterministic
+        return gzip.compress(content, compresslevel=self._level, mtime=0)
+
+    def decompress(self, content: bytes) -> bytes:
+        return gzip.decompress(content)
+
+
+class ZstdCodec(StorageCodec):
+    """
+    Requires optional dependency 'zstandard'
+    """
+    name = 'zstd'
+    content_encoding = 'zstd'
+    magic_number = b'\x28\xb5\x2f\xfd'
+
+    def __init__(self, level: int = 3) -> None:
+        import zstandard  # NOQA
+
+        self._zstandard = zstandard
+        self._level = level
+
+    def compress(self, content: bytes) -> bytes:
+        return self._zstandard.ZstdCompressor(level=self._level).compress(content)  # type: ignore[no-any-return]
+
+    def decompress(self, content: bytes) -> bytes:
+        # content size may be absent from frame header when it is compressed by stream
+        return self._zstandard.ZstdDecompressor().decompressobj().decompress(content)  # type: ignore[no-any-return]
+
+
+STORAGE_CODECS: Dict[str, Type[StorageCodec]] = {
+    IdentityCodec.name: IdentityCodec,
+    GzipCodec.name: GzipCodec,
+    ZstdCodec.name: ZstdCodec
+}
+
+
+def get_storage_codec(name: str) -> StorageCodec:
+    """
+    Args:
+        name (str): one of the keys of STORAGE_CODECS
+    """
+    if name not in STORAGE_CODECS:
+        raise ValueError(f'Unsupported storage codec [{name}]')
+    return STORAGE_CODECS[name]()
+
+
+def decompress(content: bytes) -> bytes:
+    """
+    Decompress content by its magic number, which is returned as it is when uncompressed
+    """
+    for codec_cls in STORAGE_CODECS.values():
+        if codec_cls.magic_number and content.startswith(codec_cls.magic_number):
+            return codec_cls().decompress(content)
+    return content
@@ -46,3 +46,8 @@ REGISTERED_STAT_SOURCES = [
     SCOREBOARD,
     TEAM_DETAILS
 ]
+
+# identifiers of game status, e.g. Game.gameStatus of scoreboardv3
+GAME_STATUS_SCHEDULED = 1
+GAME_STATUS_LIVE = 2
+GAME_STATUS_FINAL = 3
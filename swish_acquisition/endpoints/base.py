@@ -1,23 +1,37 @@
 """
 Basis components for collecting endpoint raw data
 """
+import datetime
+from email.utils import parsedate_to_datetime
 from http import HTTPStatus
 import json
 import logging
+import random
+import time
 from typing import (
     Any,
+    Callable,
     Dict,
     Generic,
     get_args,
     Optional,
+    Tuple,
     Type,
-    TypeVar
+    TypeVar,
+    Union
 )
 from urllib.parse import urljoin
 
 from pydantic import BaseModel
-import requests
-from requests import ConnectTimeout, ReadTimeout, Response
+from requests import ConnectionError as RequestsConnectionError, ConnectTimeout, ReadTimeout, Response
+
+from swish_acquisition import serialization
+from swish_acquisition.circuitbreaker import get_circuit_breaker
+from swish_acquisition.conf import settings
+from swish_acquisition.latency import get_latency_tracker
+from swish_acquisition.ratelimit import get_rate_limiter
+from swish_acquisition.scheme.trusted import construct_model
+from swish_acquisition.transport import get_http_client
 
 
 logger = logging.getLogger(__name__)
@@ -34,9 +48,57 @@ NBA_STATS_REQUEST_HEADERS = {
                   'AppleWebKit/605.1.15 (KHTML, like Gecko) Mobile/15E148'
 }
 DEFAULT_TIMEOUT = 5
+# validators of response and the conditional request headers which carry them back
+CONDITIONAL_REQUEST_HEADERS = {
+    'etag': 'if-none-match',
+    'last-modified': 'if-modified-since'
+}
 
 
 Model = TypeVar('Model', bound=BaseModel)
+Projection = TypeVar('Projection', bound=BaseModel)
+
+
+class EndpointRequestError(Exception):
+    """
+    Request towards remote failed, which is either unexpected or still failed after retries
+    """
+    def __init__(self, message: str, status_code: Optional[int] = None) -> None:
+        super().__init__(message)
+        self.status_code = status_code
+
+
+def _get_retry_after(response: Response) -> Optional[float]:
+    """
+    Seconds asked by 'Retry-After' header, which is either delay seconds or HTTP date
+    """
+    retry_after = response.headers.get('retry-after')
+    if not retry_after:
+        return None
+    try:
+        return max(float(retry_after), 0.)
+    except ValueError:
+        pass
+    try:
+        retry_time: datetime.datetime = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        return None
+    return max((retry_time - datetime.datetime.now(datetime.timezone.utc)).total_seconds(), 0.)
+
+
+def get_retry_delay(attempt: int, response: Optional[Response] = None) -> float:
+    """
+    Exponential backoff with full jitter, unless remote asks for the delay by 'Retry-After'
+
+    Args:
+        attempt (int): amount of failed attempts, starting from 1
+        response (Response): the failed response, None when the request raised
+    """
+    retry_after = _get_retry_after(response) if response is not None else None
+    if retry_after is not None:
+        return float(min(retry_after, settings.REQUEST_RETRY_BACKOFF_MAX))
+    backoff = min(settings.REQUEST_RETRY_BACKOFF_FACTOR * 2 ** (attempt - 1), settings.REQUEST_RETRY_BACKOFF_MAX)
+    return random.uniform(0, backoff)
 
 
 class Endpoint(Generic[Model]):
@@ -45,12 +107,21 @@ class Endpoint(Generic[Model]):
     DATA_MODEL: Type[Model]
     ENDPOINT: str
     HEADERS: Dict = NBA_STATS_REQUEST_HEADERS
-    TIMEOUT: int = DEFAULT_TIMEOUT
+    TIMEOUT: float = DEFAULT_TIMEOUT  # seconds, which is adapted to observed latency in 'adaptive' mode
+    # whether data from our own bucket is constructed without validation, refer to settings.TRUSTED_LOAD_ENABLED,
+    # which pays off for schemes with unions of row sets, whose validation costs much more than construction,
+    # while plain nested models are validated faster by pydantic-core than constructed recursively
+    TRUSTED_LOAD: bool = False
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         self._url = urljoin(self.BASE_URL, self.ENDPOINT)
         self._data_dict: Dict = {}
-        self._has_called_remote = False
+        self._data_model: Optional[Model] = None
+        self._projections: Dict[Type[BaseModel], BaseModel] = {}
+        self._data_loader: Optional[Callable[[], Dict]] = None
+        self._is_data_loaded = False
+        self._is_data_trusted = False
+        self._validators: Dict[str, str] = {}
 
     def __init_subclass__(cls, **kwargs):
         cls.DATA_MODEL, *_ = get_args(cls.__orig_bases__[0])  # type: ignore
@@ -59,43 +130,196 @@ class Endpoint(Generic[Model]):
     def get_params(self) -> Dict:
         raise NotImplementedError
 
-    def request(self) -> Optional[Response]:
+    @classmethod
+    def get_timeout(cls) -> Union[float, Tuple[float, float]]:
+        """
+        Timeout of requests, depending on settings.REQUEST_TIMEOUT_MODE
+        * 'fixed', always Endpoint::TIMEOUT
+        * 'adaptive', (connect, read) timeouts derived from p99 of the latest latencies of the endpoint,
+          Endpoint::TIMEOUT is used until enough latencies are observed
+
+        Returns:
+            Union[float, Tuple[float, float]]: seconds, or (connect, read) seconds
+        """
+        if settings.REQUEST_TIMEOUT_MODE != 'adaptive':
+            return cls.TIMEOUT
+        read_timeout = get_latency_tracker(cls.ENDPOINT, settings.LATENCY_WINDOW_SIZE).get_timeout(
+            multiplier=settings.ADAPTIVE_TIMEOUT_MULTIPLIER,
+            min_samples=settings.ADAPTIVE_TIMEOUT_MIN_SAMPLES,
+            bounds=(settings.ADAPTIVE_TIMEOUT_MIN, settings.ADAPTIVE_TIMEOUT_MAX)
+        )
+        if read_timeout is None:
+            return cls.TIMEOUT
+        return min(read_timeout, settings.ADAPTIVE_CONNECT_TIMEOUT), read_timeout
+
+    def request(self, validators: Optional[Dict[str, str]] = None) -> Response:
+        """
+        Request remote, which is retried on timeouts and the status codes of settings.REQUEST_RETRY_STATUS_CODES
+
+        Args:
+            validators (Dict[str, str]): validators of a previous response, i.e. 'etag' and 'last-modified',
+                which make the request conditional, so that 304 is expected as well
+
+        Raises:
+            EndpointRequestError: unexpected status code, or retries are exhausted
+        """
         params = self.get_params()
+        headers = self.HEADERS
+        if validators:
+            headers = {
+                **headers,
+                **{
+                    CONDITIONAL_REQUEST_HEADERS[key]: value
+                    for key, value in validators.items() if key in CONDITIONAL_REQUEST_HEADERS
+                }
+            }
         request_args = {
             'url': self._url,
             'params': params,
-            'headers': self.HEADERS,
-            'timeout': self.TIMEOUT
+            'headers': headers
         }
-        response = None
-        # TODO: add try-catch and logging when raise exceptions
-        try:
-            response = self._send_api_request(**request_args)
-        except (ConnectTimeout, ReadTimeout) as e:  # NOQA
-            pass
-        if response and response.status_code != HTTPStatus.OK:
-            response = None
-        self._has_called_remote = True
-        return response
+        expected_status_codes = (HTTPStatus.OK, HTTPStatus.NOT_MODIFIED) if validators else (HTTPStatus.OK,)
+        max_retries = max(settings.REQUEST_MAX_RETRIES, 0)
+        attempt = 0
+        while True:
+            attempt += 1
+            response: Optional[Response] = None
+            try:
+                # timeout is derived again for retries, which follows the latest latencies
+                response = self._send_api_request(**request_args, timeout=self.get_timeout())
+            except (ConnectTimeout, ReadTimeout, RequestsConnectionError) as e:
+                error = f'{e.__class__.__name__}: {e}'
+                status_code = None
+            else:
+                if response.status_code in expected_status_codes:
+                    return response
+                status_code = response.status_code
+                error = f'status code {status_code}'
+                if status_code not in settings.REQUEST_RETRY_STATUS_CODES:
+                    raise EndpointRequestError(f'{self.ENDPOINT} | {json.dumps(params, default=str)} | {error}',
+                                               status_code)
+
+            if attempt > max_retries:
+                raise EndpointRequestError(
+                    f'{self.ENDPOINT} | {json.dumps(params, default=str)} | {error}, after {max_retries} retries',
+                    status_code
+                )
+            delay = get_retry_delay(attempt, response)
+            logger.warning(f'{self.ENDPOINT} | {json.dumps(params, default=str)} | {error}, '
+                           f'retry {attempt}/{max_retries} in {delay:.2f}s')
+            time.sleep(delay)
 
     # which is easy to be mocked
-    @staticmethod
-    def _send_api_request(*args: Any, **kwargs: Any) -> Response:
-        return requests.get(*args, **kwargs)
+    @classmethod
+    def _send_api_request(cls, *args: Any, **kwargs: Any) -> Response:
+        if settings.HTTP_CASSETTE_MODE == 'replay':
+            # replayed cassettes never touch remote, which is neither throttled nor guarded by the circuit
+            return get_http_client().get(*args, **kwargs)
+        # rejected by the open circuit before taking a token
+        circuit_breaker = get_circuit_breaker(cls.ENDPOINT)
+        circuit_breaker.before_request()
+        get_rate_limiter().acquire()
+        latency_tracker = get_latency_tracker(cls.ENDPOINT, settings.LATENCY_WINDOW_SIZE)
+        started_time = time.monotonic()
+        try:
+            response = get_http_client().get(*args, **kwargs)
+        except ReadTimeout:
+            # latency is at least the timeout, which lets the adaptive timeout grow on slow endpoint
+            latency_tracker.record(time.monotonic() - started_time)
+            circuit_breaker.record_failure()
+            raise
+        except (ConnectTimeout, RequestsConnectionError):
+            circuit_breaker.record_failure()
+            raise
+        latency_tracker.record(time.monotonic() - started_time)
+        if response.status_code in settings.REQUEST_RETRY_STATUS_CODES:
+            circuit_breaker.record_failure()
+        else:
+            circuit_breaker.record_success()
+        return response
 
     def get_data(self, overwritten: bool = False) -> Optional[Model]:
         data_dict = self.get_dict(overwritten)
         if not data_dict:
             return None
-        return self.DATA_MODEL.model_validate(data_dict)
+        # validated model is cached until the data dict is replaced
+        if self._data_model is None:
+            if self._is_data_trusted and self.TRUSTED_LOAD and settings.TRUSTED_LOAD_ENABLED:
+                self._data_model = construct_model(self.DATA_MODEL, data_dict)
+            else:
+                self._data_model = self.DATA_MODEL.model_validate(data_dict)
+        return self._data_model
+
+    def get_projection(self, projection: Type[Projection]) -> Optional[Projection]:
+        """
+        Parse only the subtree of data which the projection declares, the other fields are skipped
+
+        Args:
+            projection (Type[Projection]): model whose fields are a subset of DATA_MODEL's,
+                which is cached until the data dict is replaced
+        """
+        data_dict = self.get_dict()
+        if not data_dict:
+            return None
+        if projection not in self._projections:
+            self._projections[projection] = projection.model_validate(data_dict)
+        return self._projections[projection]  # type: ignore[return-value]
 
     def get_dict(self, overwritten: bool = False) -> Dict:
-        if not self._has_called_remote or overwritten:
-            response = self.request()
-            data_dict = {} if response is None else json.loads(response.content.decode('utf-8'))
-            self._set_data_dict(data_dict)
+        if self._data_loader is not None and not overwritten:
+            self._set_data_dict(self._data_loader(), trusted=True)
+        elif not self._is_data_loaded or overwritten:
+            self._set_response(self.request())
         return self._data_dict
 
-    def _set_data_dict(self, data_dict: Dict) -> None:
+    def get_modified_dict(self, validators: Dict[str, str]) -> Optional[Dict]:
+        """
+        Request remote conditionally by validators of the data on hand
+
+        Returns:
+            Optional[Dict]: None when remote data isn't modified, otherwise the latest data
+        """
+        response = self.request(validators)
+        if response.status_code == HTTPStatus.NOT_MODIFIED:
+            return None
+        self._set_response(response)
+        return self._data_dict
+
+    def get_validators(self) -> Dict[str, str]:
+        """
+        Validators of the response which current data comes from, empty when it isn't requested from remote
+        """
+        return self._validators
+
+    def _set_response(self, response: Response) -> None:
+        data_dict = serialization.loads(response.content)
+        if not data_dict:
+            raise EndpointRequestError(f'{self.ENDPOINT} | {json.dumps(self.get_params(), default=str)} | '
+                                       f'empty response', response.status_code)
+        self._set_data_dict(data_dict)
+        self._validators = {
+            key: response.headers[key] for key in CONDITIONAL_REQUEST_HEADERS if response.headers.get(key)
+        }
+
+    def _set_data_dict(self, data_dict: Dict, trusted: bool = False) -> None:
+        """
+        Args:
+            data_dict (Dict): raw data
+            trusted (bool): whether the data comes from our own bucket, which has been validated before stored
+        """
         assert isinstance(data_dict, dict)
         self._data_dict = data_dict
+        self._data_model = None
+        self._projections = {}
+        self._data_loader = None
+        self._is_data_loaded = True
+        self._is_data_trusted = trusted
+        self._validators = {}
+
+    def _set_data_loader(self, data_loader: Callable[[], Dict]) -> None:
+        """
+        Data would be loaded by data_loader instead of requesting remote,
+        which is deferred until the data is asked for. The loaded data is trusted,
+        since loaders read our own bucket
+        """
+        self._data_loader = data_loader
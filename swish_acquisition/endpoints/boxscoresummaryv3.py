@@ -6,8 +6,8 @@ from typing import Any, Dict, Optional
 
 from swish_acquisition.constants import BOXSCORE_SUMMARY
 from swish_acquisition.endpoints.base import Endpoint
-from swish_acquisition.scheme.endpoints import BoxScoreSummaryV3
-from swish_acquisition.scheme.endpoints.boxscoresummaryv3 import TeamGameOverallStats
+from swish_acquisition.scheme.endpoints import BoxScoreSummaryV3, BoxScoreSummaryV3Ids
+from swish_acquisition.scheme.endpoints.boxscoresummaryv3 import TeamRosterIds
 
 
 class BoxScoreSummaryV3Endpoint(Endpoint[BoxScoreSummaryV3]):
@@ -26,7 +26,7 @@ class BoxScoreSummaryV3Endpoint(Endpoint[BoxScoreSummaryV3]):
 
     def get_team_ids(self) -> Dict[str, Optional[int]]:
         away_team_id = home_team_id = None
-        dm = self.get_data()
+        dm = self.get_projection(BoxScoreSummaryV3Ids)
         if dm:
             away_team_id = dm.boxScoreSummary.awayTeamId
             home_team_id = dm.boxScoreSummary.homeTeamId
@@ -37,7 +37,7 @@ class BoxScoreSummaryV3Endpoint(Endpoint[BoxScoreSummaryV3]):
 
     def get_player_ids(self) -> Dict[str, Optional[list]]:
         away_player_ids = home_player_ids = None
-        dm = self.get_data()
+        dm = self.get_projection(BoxScoreSummaryV3Ids)
         if dm:
             away_player_ids = self._get_roster_ids_by_team(dm.boxScoreSummary.awayTeam)
             home_player_ids = self._get_roster_ids_by_team(dm.boxScoreSummary.homeTeam)
@@ -47,7 +47,7 @@ class BoxScoreSummaryV3Endpoint(Endpoint[BoxScoreSummaryV3]):
         }
 
     @staticmethod
-    def _get_roster_ids_by_team(team_game_stats: TeamGameOverallStats):
+    def _get_roster_ids_by_team(team_game_stats: TeamRosterIds):
         player_ids = []
         for active_player in team_game_stats.players:
             player_ids.append(active_player.personId)
@@ -12,6 +12,7 @@ from swish_acquisition.scheme.endpoints import CommonPlayerInfo
 class CommonPlayerInfoEndpoint(Endpoint[CommonPlayerInfo]):
 
     ENDPOINT: str = COMMON_PLAYER_INFO.endpoint_name
+    TRUSTED_LOAD: bool = True
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super(CommonPlayerInfoEndpoint, self).__init__(*args, **kwargs)
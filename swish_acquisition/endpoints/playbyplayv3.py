@@ -2,10 +2,11 @@
 Collect playbyplayv3 endpoint data
 """
 import datetime
-from typing import Any, Dict
+from typing import Any, Dict, Optional
 
 from swish_acquisition.constants import PLAY_BY_PLAY
 from swish_acquisition.endpoints.base import Endpoint
+from swish_acquisition.playbyplay import PlayByPlayColumns
 from swish_acquisition.scheme.endpoints import PlayByPlayV3
 
 
@@ -26,3 +27,12 @@ class PlayByPlayV3Endpoint(Endpoint[PlayByPlayV3]):
             'StartPeriod': self.start_period,
             'EndPeriod': self.end_period
         }
+
+    def get_columns(self) -> Optional[PlayByPlayColumns]:
+        """
+        Actions in compact columns, which are built from raw data without validation
+        """
+        data_dict = self.get_dict()
+        if not data_dict:
+            return None
+        return PlayByPlayColumns.from_dicts([data_dict])
@@ -2,14 +2,14 @@
 Collect scoreboardv3 endpoint data
 """
 import datetime
-from typing import Any, Dict
+from typing import Any, Dict, List
 
 from swish_acquisition.constants import SCOREBOARD
 from swish_acquisition.endpoints.base import (
     DATE_FORMAT_V3,
     Endpoint
 )
-from swish_acquisition.scheme.endpoints import ScoreboardV3
+from swish_acquisition.scheme.endpoints import ScoreboardV3, ScoreboardV3GameStatuses
 
 
 class ScoreboardV3Endpoint(Endpoint[ScoreboardV3]):
@@ -26,3 +26,19 @@ class ScoreboardV3Endpoint(Endpoint[ScoreboardV3]):
             'GameDate': self.game_date.strftime(DATE_FORMAT_V3),
             'LeagueID': self.league_id
         }
+
+    def get_game_ids(self) -> List[str]:
+        dm = self.get_projection(ScoreboardV3GameStatuses)
+        if not dm:
+            return []
+        return [game.gameId for game in dm.scoreboard.games]
+
+    def get_game_statuses(self) -> Dict[str, int]:
+        """
+        Returns:
+            Dict[str, int]: status of each game, refer to swish_acquisition.constants::GAME_STATUS_FINAL
+        """
+        dm = self.get_projection(ScoreboardV3GameStatuses)
+        if not dm:
+            return {}
+        return {game.gameId: game.gameStatus for game in dm.scoreboard.games}
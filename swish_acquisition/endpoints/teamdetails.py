@@ -12,6 +12,7 @@ from swish_acquisition.scheme.endpoints import TeamDetails
 class TeamDetailsEndpoint(Endpoint[TeamDetails]):
 
     ENDPOINT: str = TEAM_DETAILS.endpoint_name
+    TRUSTED_LOAD: bool = True
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:
         super(TeamDetailsEndpoint, self).__init__(*args, **kwargs)
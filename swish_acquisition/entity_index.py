@@ -0,0 +1,125 @@
+"""
+Index of entities whose raw data have been stored
+
+Entities like players and teams are shared by games, which are checked repeatedly.
+The index keeps the known ones in process (LRU) and in shared state,
+so that their stored objects needn't be checked again before expired
+"""
+from collections import OrderedDict
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from swish_acquisition.conf import settings
+from swish_acquisition.shared_state import get_shared_state, SharedState
+
+
+__all__ = ['get_known_entity_index', 'KnownEntityIndex', 'reset_known_entity_indexes']
+
+
+class KnownEntityIndex(object):
+    """
+    Keys of known entities with the time when they were known
+
+    Args:
+        name (str): name of the index, which identifies it in shared state
+        ttl (float): seconds before a known entity is expired, non-positive value means never expired
+        shared_state (SharedState): where the index is persisted
+        maxsize (int): upper limit of entities kept in process
+    """
+    def __init__(self, name: str, ttl: float, shared_state: SharedState, maxsize: int = 4096) -> None:
+        self.name = name
+        self.ttl = ttl
+        self._shared_state = shared_state
+        self._maxsize = max(maxsize, 1)
+        self._lock = threading.Lock()
+        self._cache: OrderedDict[str, float] = OrderedDict()
+
+    @property
+    def state_key(self) -> str:
+        return f'known_entities.{self.name}'
+
+    def _is_fresh(self, known_time: Optional[float], now: float) -> bool:
+        if known_time is None:
+            return False
+        return self.ttl <= 0 or now - known_time < self.ttl
+
+    def _put(self, key: str, known_time: float) -> None:
+        self._cache[key] = known_time
+        self._cache.move_to_end(key)
+        while len(self._cache) > self._maxsize:
+            self._cache.popitem(last=False)
+
+    def is_known(self, key: str) -> bool:
+        now = time.time()
+        with self._lock:
+            known_time = self._cache.get(key)
+            if self._is_fresh(known_time, now):
+                self._cache.move_to_end(key)
+                return True
+
+        # missed in process, the persisted index is loaded at once,
+        # since others are likely to be asked soon
+        with self._shared_state.locked(self.state_key) as state:
+            entities: Dict[str, float] = dict(state)
+        with self._lock:
+            for entity_key, entity_known_time in entities.items():
+                if self._is_fresh(entity_known_time, now):
+                    self._put(entity_key, entity_known_time)
+        return self._is_fresh(entities.get(key), now)
+
+    def add(self, key: str, known_time: Optional[float] = None) -> None:
+        """
+        Args:
+            key (str): key of entity
+            known_time (float): timestamp since when the entity is known, default is now,
+                e.g. last modified time of the stored object
+        """
+        now = time.time()
+        known_time = now if known_time is None else known_time
+        with self._lock:
+            self._put(key, known_time)
+        with self._shared_state.locked(self.state_key) as state:
+            # expired ones are evicted by the way, which bounds the persisted index
+            for expired_key in [k for k, v in state.items() if not self._is_fresh(v, now)]:
+                del state[expired_key]
+            state[key] = known_time
+
+
+_KNOWN_ENTITY_INDEXES: Dict[Tuple[str, str, float], KnownEntityIndex] = {}
+_KNOWN_ENTITY_INDEXES_LOCK = threading.Lock()
+
+
+def get_known_entity_index(name: str, ttl: Optional[float] = None) -> Optional[KnownEntityIndex]:
+    """
+    Index configured by
+    * settings.KNOWN_ENTITY_BACKEND, refer to swish_acquisition.shared_state::get_shared_state,
+      None means the index is disabled
+    * settings.KNOWN_ENTITY_TTL, unless ttl is given
+    * settings.KNOWN_ENTITY_CACHE_SIZE
+
+    Which is shared by the callers in current process
+    """
+    backend = settings.KNOWN_ENTITY_BACKEND
+    if backend is None:
+        return None
+    ttl = settings.KNOWN_ENTITY_TTL if ttl is None else ttl
+    # ttl may vary among calls, e.g. refresh policy depending on season
+    key = (name, backend, ttl)
+    with _KNOWN_ENTITY_INDEXES_LOCK:
+        if key not in _KNOWN_ENTITY_INDEXES:
+            _KNOWN_ENTITY_INDEXES[key] = KnownEntityIndex(
+                name=name,
+                ttl=ttl,
+                shared_state=get_shared_state(backend),
+                maxsize=settings.KNOWN_ENTITY_CACHE_SIZE
+            )
+        return _KNOWN_ENTITY_INDEXES[key]
+
+
+def reset_known_entity_indexes() -> None:
+    """
+    Drop the indexes kept in process, whose persisted ones are untouched
+    """
+    with _KNOWN_ENTITY_INDEXES_LOCK:
+        _KNOWN_ENTITY_INDEXES.clear()
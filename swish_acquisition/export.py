@@ -0,0 +1,109 @@
+"""
+Columnar export of stored raw data, which requires optional dependency 'pyarrow', i.e. extra 'export'
+
+Play-by-Play actions of each game are exported into a Parquet file,
+which are partitioned by season and game date in hive style,
+e.g. '/season=2009/game_date=2010-06-17/0040900407.parquet',
+so that scans over a season are vectorized reads instead of JSON parses
+"""
+import datetime
+import io
+import logging
+from typing import Any, Dict, List
+
+from minio import S3Error
+
+from swish_acquisition import s3
+from swish_acquisition.collectors import PlayByPlayCollector
+from swish_acquisition.conf import settings
+from swish_acquisition.scheme.endpoints.playbyplayv3 import PlayByPlayActionItem
+
+
+__all__ = ['export_play_by_play', 'get_play_by_play_table', 'get_season']
+
+
+logger = logging.getLogger(__name__)
+
+
+PARQUET_CONTENT_TYPE = 'application/vnd.apache.parquet'
+PLAY_BY_PLAY_OBJECT_NAME_PATTERN = '/season={season}/game_date={game_date}/{game_id}.parquet'
+# low-cardinality columns which are dictionary-encoded in Arrow
+PLAY_BY_PLAY_DICTIONARY_COLUMNS = ('actionType', 'subType', 'teamTricode')
+
+
+def get_season(game_id: str) -> int:
+    """
+    Starting year of the season which the game belongs to,
+    game identifier is formatted as '00{season type}{last two digits of year}{sequence}', e.g. '0040900407'
+    """
+    year = int(game_id[3:5])
+    # the earliest season of NBA Stats is 1946-47
+    return 1900 + year if year >= 46 else 2000 + year
+
+
+def _get_play_by_play_schema() -> Any:
+    import pyarrow  # NOQA
+
+    arrow_types = {int: pyarrow.int64(), str: pyarrow.string()}
+    fields = [pyarrow.field('gameId', pyarrow.string(), nullable=False)]
+    for name, field_info in PlayByPlayActionItem.model_fields.items():
+        if name in PLAY_BY_PLAY_DICTIONARY_COLUMNS:
+            arrow_type = pyarrow.dictionary(pyarrow.int32(), pyarrow.string())
+        else:
+            arrow_type = arrow_types[field_info.annotation]  # type: ignore[index]
+        fields.append(pyarrow.field(name, arrow_type))
+    return pyarrow.schema(fields)
+
+
+def get_play_by_play_table(data_dict: Dict) -> Any:
+    """
+    Arrow table of Play-by-Play actions, one row per action
+
+    Args:
+        data_dict (Dict): raw data from playbyplayv3 endpoint, which is stored in our own bucket
+
+    Returns:
+        pyarrow.Table: columns are 'gameId' along with the fields of PlayByPlayActionItem,
+            absent fields take their defaults
+    """
+    import pyarrow  # NOQA
+
+    game = data_dict['game']
+    actions: List[Dict] = game['actions']
+    columns: Dict[str, List[Any]] = {'gameId': [game['gameId']] * len(actions)}
+    for name, field_info in PlayByPlayActionItem.model_fields.items():
+        default = None if field_info.is_required() else field_info.default
+        columns[name] = [action.get(name, default) for action in actions]
+    return pyarrow.Table.from_pydict(columns, schema=_get_play_by_play_schema())
+
+
+def export_play_by_play(game_date: datetime.date, game_id: str) -> str:
+    """
+    Export stored Play-by-Play of the game into settings.PLAY_BY_PLAY_EXPORT_BUCKET,
+    which overwrites the former export of the same game
+
+    Returns:
+        str: object name of the exported Parquet file
+    """
+    import pyarrow.parquet  # NOQA
+
+    data_dict = PlayByPlayCollector(game_date=game_date, game_id=game_id).get_object_data()
+    table = get_play_by_play_table(data_dict)
+    buffer = io.BytesIO()
+    pyarrow.parquet.write_table(table, buffer, compression=settings.PLAY_BY_PLAY_EXPORT_COMPRESSION)
+    data_length = buffer.tell()
+    buffer.seek(0)
+
+    object_name = PLAY_BY_PLAY_OBJECT_NAME_PATTERN.format(
+        season=get_season(game_id),
+        game_date=game_date.isoformat(),
+        game_id=game_id
+    )
+    try:
+        s3.S3_CLIENT.put_object(settings.PLAY_BY_PLAY_EXPORT_BUCKET, object_name, buffer,
+                                data_length, content_type=PARQUET_CONTENT_TYPE)
+    except S3Error:
+        logger.exception('export failed')
+        raise
+    logger.info(f'export | play by play | {game_id} | {table.num_rows} actions into {object_name}')
+    return object_name
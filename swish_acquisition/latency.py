@@ -0,0 +1,87 @@
+"""
+Latency tracking of remote endpoints
+
+Latencies are kept in a rolling window of current process,
+which derives the timeouts of requests towards each endpoint
+"""
+from collections import deque
+import math
+import threading
+from typing import Deque, Dict, Optional, Tuple
+
+
+__all__ = ['get_latency_tracker', 'LatencyTracker', 'reset_latency_trackers']
+
+
+class LatencyTracker(object):
+    """
+    Rolling window of the latest latencies
+
+    Args:
+        name (str): name of the tracked endpoint
+        window_size (int): amount of the latest latencies which are kept
+    """
+    def __init__(self, name: str, window_size: int) -> None:
+        self.name = name
+        self._lock = threading.Lock()
+        self._latencies: Deque[float] = deque(maxlen=max(window_size, 1))
+
+    def __len__(self) -> int:
+        return len(self._latencies)
+
+    def record(self, latency: float) -> None:
+        with self._lock:
+            self._latencies.append(latency)
+
+    def percentile(self, q: float) -> Optional[float]:
+        """
+        Nearest-rank percentile of the window, None when nothing is recorded
+
+        Args:
+            q (float): between 0 and 100
+        """
+        with self._lock:
+            latencies = sorted(self._latencies)
+        if not latencies:
+            return None
+        rank = min(max(math.ceil(q / 100 * len(latencies)), 1), len(latencies))
+        return latencies[rank - 1]
+
+    def get_timeout(self, multiplier: float, min_samples: int, bounds: Tuple[float, float]) -> Optional[float]:
+        """
+        Timeout derived from p99 of the window
+
+        Args:
+            multiplier (float): headroom on p99
+            min_samples (int): latencies needed before the timeout is derived
+            bounds (Tuple[float, float]): lower and upper limits of the timeout
+
+        Returns:
+            Optional[float]: None when the samples are not enough
+        """
+        if len(self) < max(min_samples, 1):
+            return None
+        p99 = self.percentile(99)
+        assert p99 is not None
+        lower_limit, upper_limit = bounds
+        return min(max(p99 * multiplier, lower_limit), upper_limit)
+
+
+_LATENCY_TRACKERS: Dict[Tuple[str, int], LatencyTracker] = {}
+_LATENCY_TRACKERS_LOCK = threading.Lock()
+
+
+def get_latency_tracker(name: str, window_size: int) -> LatencyTracker:
+    """
+    Tracker of the named endpoint, which is shared by the callers in current process
+    """
+    key = (name, window_size)
+    with _LATENCY_TRACKERS_LOCK:
+        if key not in _LATENCY_TRACKERS:
+            _LATENCY_TRACKERS[key] = LatencyTracker(name, window_size)
+        return _LATENCY_TRACKERS[key]
+
+
+def reset_latency_trackers() -> None:
+    with _LATENCY_TRACKERS_LOCK:
+        _LATENCY_TRACKERS.clear()
@@ -152,6 +152,21 @@ class SwishTask(BaseModel):
         comment='Time when the task completed')
 
 
+class SwishSharedState(BaseModel):
+
+    __tablename__ = 'swish_shared_state'
+
+    state_key: Mapped[str] = mapped_column(
+        String(320), primary_key=True,
+        doc='Identifier of the state',
+        comment='Identifier of the state')
+    state_value: Mapped[str] = mapped_column(
+        String, nullable=False,
+        server_default='{}', default=json.dumps({}),
+        doc='Value of the state as JSON string',
+        comment='Value of the state as JSON string')
+
+
 event.listen(BaseModel.metadata, 'before_create', CREATE_FUNCTION_UPDATED_TIME_TRIGGER)
 
 
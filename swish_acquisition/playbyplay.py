@@ -0,0 +1,301 @@
+"""
+Compact in-memory representation of Play-by-Play actions
+
+Actions are kept as a struct of arrays, i.e. one typed array per field rather than one model per action,
+strings which repeat among actions (e.g. 'actionType', 'playerName') are dictionary-encoded,
+so that a batch of games fits in a worker's memory. Rows are built on demand
+
+Game time and running scores are derived over whole columns by PlayByPlayTimeline,
+which is indexed by (game, period, elapsed seconds) for range queries
+"""
+from array import array
+import bisect
+import re
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from swish_acquisition.scheme.endpoints.playbyplayv3 import PlayByPlayActionItem
+
+
+__all__ = ['get_period_offset', 'parse_clock', 'PlayByPlayColumns', 'PlayByPlayTimeline']
+
+
+# signed 32-bit integers, which cover identifiers of NBA Stats, e.g. '1610612747'
+INTEGER_TYPECODE = 'i'
+# codes of dictionary-encoded strings
+CODE_TYPECODE = 'I'
+# strings which hardly repeat are kept as they are
+PLAIN_TEXT_COLUMNS = ('description',)
+
+
+def _get_field_defaults() -> Dict[str, Any]:
+    return {
+        name: None if field_info.is_required() else field_info.default
+        for name, field_info in PlayByPlayActionItem.model_fields.items()
+    }
+
+
+ACTION_FIELD_DEFAULTS = _get_field_defaults()
+INTEGER_COLUMNS = tuple(
+    name for name, field_info in PlayByPlayActionItem.model_fields.items() if field_info.annotation is int
+)
+TEXT_COLUMNS = tuple(name for name in PlayByPlayActionItem.model_fields if name not in INTEGER_COLUMNS)
+# identifier of game which each action belongs to, which is dictionary-encoded as well
+GAME_ID_COLUMN = 'gameId'
+
+REGULATION_PERIODS = 4
+REGULATION_PERIOD_SECONDS = 12 * 60
+OVERTIME_PERIOD_SECONDS = 5 * 60
+# count down of a period in ISO-8601 duration, e.g. 'PT11M46.00S'
+CLOCK_PATTERN = re.compile(r'^PT(?:(?P<minutes>\d+)M)?(?:(?P<seconds>\d+(?:\.\d+)?)S)?$')
+
+
+def parse_clock(clock: str) -> float:
+    """
+    Seconds remaining in the period, e.g. 'PT11M46.00S' is 706.0
+
+    Raises:
+        ValueError: when clock isn't an ISO-8601 duration of minutes and seconds
+    """
+    matched = CLOCK_PATTERN.match(clock)
+    if matched is None:
+        raise ValueError(f'invalid clock: {clock!r}')
+    return int(matched['minutes'] or 0) * 60 + float(matched['seconds'] or 0)
+
+
+def get_period_seconds(period: int) -> int:
+    return REGULATION_PERIOD_SECONDS if period <= REGULATION_PERIODS else OVERTIME_PERIOD_SECONDS
+
+
+def get_period_offset(period: int) -> int:
+    """
+    Seconds of the game elapsed before the period starts, periods after regulation are overtimes
+    """
+    regulation_periods = min(period, REGULATION_PERIODS + 1) - 1
+    overtime_periods = max(period - REGULATION_PERIODS - 1, 0)
+    return regulation_periods * REGULATION_PERIOD_SECONDS + overtime_periods * OVERTIME_PERIOD_SECONDS
+
+
+class _Categories(object):
+    """
+    Dictionary of a string column, whose codes are the positions of interned strings
+    """
+    __slots__ = ('values', '_codes')
+
+    def __init__(self) -> None:
+        self.values: List[str] = []
+        self._codes: Dict[str, int] = {}
+
+    def encode(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is None:
+            code = self._codes[value] = len(self.values)
+            self.values.append(sys.intern(value))
+        return code
+
+
+class PlayByPlayColumns(object):
+    """
+    Struct of arrays of Play-by-Play actions from one or more games, in the order they are added
+
+    * integer fields are kept in typed arrays
+    * string fields are dictionary-encoded, whose codes are kept in typed arrays, except 'description'
+    """
+    def __init__(self) -> None:
+        self._size = 0
+        self._integers: Dict[str, array] = {name: array(INTEGER_TYPECODE) for name in INTEGER_COLUMNS}
+        self._codes: Dict[str, array] = {
+            name: array(CODE_TYPECODE) for name in (GAME_ID_COLUMN, *TEXT_COLUMNS) if name not in PLAIN_TEXT_COLUMNS
+        }
+        self._categories: Dict[str, _Categories] = {name: _Categories() for name in self._codes}
+        self._texts: Dict[str, List[str]] = {name: [] for name in PLAIN_TEXT_COLUMNS}
+
+    @classmethod
+    def from_dicts(cls, data_dicts: Iterable[Dict]) -> 'PlayByPlayColumns':
+        """
+        Args:
+            data_dicts (Iterable[Dict]): raw data from playbyplayv3 endpoint, one per game
+        """
+        columns = cls()
+        for data_dict in data_dicts:
+            columns.add_game(data_dict)
+        return columns
+
+    def add_game(self, data_dict: Dict) -> None:
+        """
+        Append actions of a game, which are built straight from raw data without validation,
+        absent fields take the defaults of PlayByPlayActionItem
+        """
+        game = data_dict['game']
+        actions: List[Dict] = game['actions']
+        game_id_code = self._categories[GAME_ID_COLUMN].encode(game['gameId'])
+        self._codes[GAME_ID_COLUMN].extend([game_id_code] * len(actions))
+        for name, values in self._integers.items():
+            default = ACTION_FIELD_DEFAULTS[name]
+            values.extend([action.get(name, default) for action in actions])
+        for name, codes in self._codes.items():
+            if name == GAME_ID_COLUMN:
+                continue
+            encode = self._categories[name].encode
+            default = ACTION_FIELD_DEFAULTS[name]
+            codes.extend([encode(action.get(name, default)) for action in actions])
+        for name, texts in self._texts.items():
+            default = ACTION_FIELD_DEFAULTS[name]
+            texts.extend([action.get(name, default) for action in actions])
+        self._size += len(actions)
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def game_ids(self) -> List[str]:
+        return list(self._categories[GAME_ID_COLUMN].values)
+
+    def get_column(self, name: str) -> Any:
+        """
+        Returns:
+            array for integer columns, otherwise list of strings which are decoded on demand
+        """
+        if name in self._integers:
+            return self._integers[name]
+        if name in self._texts:
+            return self._texts[name]
+        values = self._categories[name].values
+        return [values[code] for code in self._codes[name]]
+
+    def get_codes(self, name: str) -> Tuple[array, List[str]]:
+        """
+        Codes and dictionary of a dictionary-encoded column,
+        so that a computation over the column is done once per distinct value
+        """
+        return self._codes[name], self._categories[name].values
+
+    def get_row(self, index: int) -> PlayByPlayActionItem:
+        """
+        Action at the position, which is built on demand
+        """
+        if index < 0:
+            index += self._size
+        if not 0 <= index < self._size:
+            raise IndexError('action index out of range')
+        values: Dict[str, Any] = {name: values[index] for name, values in self._integers.items()}
+        for name, codes in self._codes.items():
+            if name != GAME_ID_COLUMN:
+                values[name] = self._categories[name].values[codes[index]]
+        for name, texts in self._texts.items():
+            values[name] = texts[index]
+        return PlayByPlayActionItem.model_construct(**values)
+
+    def get_game_id(self, index: int) -> str:
+        codes, values = self.get_codes(GAME_ID_COLUMN)
+        return values[int(codes[index])]
+
+    def __getitem__(self, index: int) -> PlayByPlayActionItem:
+        return self.get_row(index)
+
+    def __iter__(self) -> Iterator[PlayByPlayActionItem]:
+        for index in range(self._size):
+            yield self.get_row(index)
+
+    def get_nbytes(self, name: Optional[str] = None) -> int:
+        """
+        Approximate bytes held by the column, or by all columns when name is None,
+        strings of dictionaries and texts are counted by their sizes
+        """
+        if name is None:
+            return sum(self.get_nbytes(name) for name in (*self._integers, *self._codes, *self._texts))
+        if name in self._integers:
+            return self._integers[name].itemsize * len(self._integers[name])
+        if name in self._texts:
+            texts = self._texts[name]
+            return sys.getsizeof(texts) + sum(sys.getsizeof(text) for text in texts)
+        codes = self._codes[name]
+        return codes.itemsize * len(codes) + sum(sys.getsizeof(value) for value in self._categories[name].values)
+
+
+class PlayByPlayTimeline(object):
+    """
+    Game time and running scores of every action in the columns, which are aligned with the rows
+
+    Clock is parsed once per distinct value through its dictionary, and the derived columns are
+
+    * elapsed, seconds elapsed in the period
+    * period_offset, seconds of the game elapsed before the period starts
+    * game_elapsed, seconds elapsed in the game
+    * score_home and score_away, scores forward-filled from the latest scoring action of the same game
+
+    Args:
+        columns (PlayByPlayColumns): actions of one or more games
+    """
+    def __init__(self, columns: PlayByPlayColumns) -> None:
+        self.columns = columns
+
+        clock_codes, clock_values = columns.get_codes('clock')
+        remaining_seconds = [parse_clock(clock) for clock in clock_values]
+        periods = columns.get_column('period')
+        period_seconds = {period: get_period_seconds(period) for period in set(periods)}
+        period_offsets = {period: get_period_offset(period) for period in period_seconds}
+
+        self.elapsed = array('d', [
+            period_seconds[period] - remaining_seconds[code] for period, code in zip(periods, clock_codes)
+        ])
+        self.period_offset = array('i', [period_offsets[period] for period in periods])
+        self.game_elapsed = array('d', [
+            offset + elapsed for offset, elapsed in zip(self.period_offset, self.elapsed)
+        ])
+        game_codes, _ = columns.get_codes(GAME_ID_COLUMN)
+        self.score_home = self._forward_fill(*columns.get_codes('scoreHome'), game_codes)
+        self.score_away = self._forward_fill(*columns.get_codes('scoreAway'), game_codes)
+
+        # positions of actions ordered by (game, period, elapsed), ties are kept in the order of actions
+        keys = list(zip(game_codes, periods, self.elapsed))
+        self._positions = sorted(range(len(keys)), key=keys.__getitem__)
+        self._keys = [keys[position] for position in self._positions]
+
+    @staticmethod
+    def _forward_fill(codes: array, values: List[str], game_codes: array) -> array:
+        # scores are empty strings unless the action scores
+        scores = [int(value) if value else None for value in values]
+        filled = array('i', bytes(len(codes) * array('i').itemsize))
+        latest_game_code, latest_score = None, 0
+        for index, (game_code, code) in enumerate(zip(game_codes, codes)):
+            if game_code != latest_game_code:
+                latest_game_code, latest_score = game_code, 0
+            score = scores[code]
+            if score is not None:
+                latest_score = score
+            filled[index] = latest_score
+        return filled
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def select(self, period: int, start: float = 0., end: Optional[float] = None,
+               game_id: Optional[str] = None) -> List[int]:
+        """
+        Positions of the actions whose elapsed seconds in the period are within [start, end],
+        which are ordered by game time, e.g. last 2 minutes of the 4th quarter is
+        select(4, start=600.)
+
+        Args:
+            period (int): period number, start from 1
+            start (float): seconds elapsed in the period
+            end (Optional[float]): seconds elapsed in the period, end of the period when None
+            game_id (Optional[str]): one of the games, all games when None
+        """
+        if end is None:
+            end = float(get_period_seconds(period))
+        game_codes, game_ids = self.columns.get_codes(GAME_ID_COLUMN)
+        if game_id is None:
+            candidate_codes = range(len(game_ids))
+        elif game_id in game_ids:
+            candidate_codes = range(game_ids.index(game_id), game_ids.index(game_id) + 1)
+        else:
+            return []
+
+        positions = []
+        for game_code in candidate_codes:
+            lower = bisect.bisect_left(self._keys, (game_code, period, start))
+            upper = bisect.bisect_right(self._keys, (game_code, period, end))
+            positions.extend(self._positions[lower:upper])
+        return positions
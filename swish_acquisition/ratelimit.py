@@ -0,0 +1,72 @@
+"""
+Rate limiter towards remote endpoints
+"""
+import logging
+import time
+
+from swish_acquisition.conf import settings
+from swish_acquisition.shared_state import get_shared_state, SharedState
+
+
+__all__ = ['get_rate_limiter', 'TokenBucket']
+
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket(object):
+    """
+    Token bucket whose state is shared by all of its holders
+
+    Tokens are refilled at 'rate' per second, at most 'burst' tokens are kept.
+    An acquirer always takes the token at once, and waits for its turn when the bucket is in debt,
+    so that it only needs a single round trip to the shared state
+    """
+    def __init__(self, name: str, rate: float, burst: int, shared_state: SharedState) -> None:
+        self.name = name
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self._shared_state = shared_state
+
+    def reserve(self, tokens: int = 1) -> float:
+        """
+        Take tokens from the bucket
+
+        Returns:
+            float: seconds to wait before the tokens are available
+        """
+        if self.rate <= 0:
+            return 0
+        with self._shared_state.locked(f'token_bucket.{self.name}') as state:
+            now = time.time()
+            refreshed_time = state.get('refreshed_time', now)
+            available_tokens: float = state.get('tokens', self.burst)
+            available_tokens = min(self.burst, available_tokens + max(now - refreshed_time, 0) * self.rate)
+            available_tokens -= tokens
+            state['tokens'] = available_tokens
+            state['refreshed_time'] = now
+        return max(-available_tokens / self.rate, 0)
+
+    def acquire(self, tokens: int = 1) -> None:
+        """
+        Block until tokens are available
+        """
+        wait_seconds = self.reserve(tokens)
+        if wait_seconds > 0:
+            logger.debug(f'rate limited by token bucket \'{self.name}\', wait for {wait_seconds:.3f}s')
+            time.sleep(wait_seconds)
+
+
+def get_rate_limiter() -> TokenBucket:
+    """
+    Rate limiter of NBA Stats requests, configured by
+    * settings.RATE_LIMIT_BACKEND, refer to swish_acquisition.shared_state::get_shared_state
+    * settings.RATE_LIMIT_RATE, non-positive value means no limit
+    * settings.RATE_LIMIT_BURST
+    """
+    return TokenBucket(
+        name='nba_stats',
+        rate=settings.RATE_LIMIT_RATE,
+        burst=settings.RATE_LIMIT_BURST,
+        shared_state=get_shared_state(settings.RATE_LIMIT_BACKEND)
+    )
@@ -1,14 +1,19 @@
 """
 Utilities on S3 interaction
 """
+from dataclasses import dataclass, field
+import datetime
+from email.utils import parsedate_to_datetime
 import io
 import logging
-import json
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Mapping, Optional, Tuple
 
 from minio import Minio, S3Error
+from minio.commonconfig import CopySource, REPLACE
 
+from swish_acquisition import serialization
+from swish_acquisition.compression import decompress, get_storage_codec, StorageCodec
 from swish_acquisition.conf import settings
 
 
@@ -25,27 +30,119 @@ def get_s3_client():
 S3_CLIENT = get_s3_client()
 
 
-def get_s3_object_data(bucket_name: str, object_name: str) -> Dict:
-    """
-    Commonly need the following keyword arguments,
-    * bucket_name (str)
-    * object_name (str)
-    """
+USER_METADATA_PREFIX = 'x-amz-meta-'
+# validators of upstream response are kept as user-defined metadata, e.g. 'upstream-etag'
+UPSTREAM_VALIDATOR_PREFIX = 'upstream-'
+# objects which don't hold complete data yet, e.g. Play-by-Play of an in-progress game
+PARTIAL_METADATA_KEY = 'partial'
+
+
+@dataclass
+class StoredObjectStat:
+
+    last_modified: Optional[datetime.datetime]
+    metadata: Dict[str, str] = field(default_factory=dict)  # user-defined metadata with lowercase keys
+    content_encoding: Optional[str] = None
+
+    def get_upstream_validators(self) -> Dict[str, str]:
+        """
+        Returns:
+            Dict[str, str]: validators of upstream response which the object was stored from,
+                i.e. 'etag' and 'last-modified'
+        """
+        return {
+            key[len(UPSTREAM_VALIDATOR_PREFIX):]: value
+            for key, value in self.metadata.items()
+            if key.startswith(UPSTREAM_VALIDATOR_PREFIX)
+        }
+
+    @property
+    def is_partial(self) -> bool:
+        return self.metadata.get(PARTIAL_METADATA_KEY) == 'true'
+
+    @classmethod
+    def from_headers(cls, headers: Mapping[str, str],
+                     last_modified: Optional[datetime.datetime] = None) -> 'StoredObjectStat':
+        headers = {key.lower(): value for key, value in headers.items()}
+        if last_modified is None and headers.get('last-modified'):
+            last_modified = parsedate_to_datetime(headers['last-modified'])
+        return cls(
+            last_modified=last_modified,
+            metadata={
+                key[len(USER_METADATA_PREFIX):]: value
+                for key, value in headers.items()
+                if key.startswith(USER_METADATA_PREFIX)
+            },
+            content_encoding=headers.get('content-encoding')
+        )
+
+
+def _read_s3_object(bucket_name: str, object_name: str) -> Tuple[Dict, Mapping[str, str]]:
     response = None
     try:
         response = S3_CLIENT.get_object(bucket_name, object_name)
-        data = json.loads(response.data.decode('utf-8'))
+        data = serialization.loads(decompress(response.data))
+        headers = response.headers
     finally:
         if response:
             response.close()
             response.release_conn()
-    return data  # type: ignore[no-any-return]
+    return data, headers
+
+
+def get_s3_object_data(bucket_name: str, object_name: str) -> Dict:
+    """
+    Commonly need the following keyword arguments,
+    * bucket_name (str)
+    * object_name (str)
+    """
+    data, _ = _read_s3_object(bucket_name, object_name)
+    return data
+
+
+def get_s3_object_data_and_stat(bucket_name: str, object_name: str) -> Tuple[Dict, StoredObjectStat]:
+    """
+    Download the object along with its metadata in a single request
+    """
+    data, headers = _read_s3_object(bucket_name, object_name)
+    return data, StoredObjectStat.from_headers(headers)
+
+
+def is_s3_object_existed(bucket_name: str, object_name: str) -> bool:
+    """
+    Only request the metadata of object rather than its content
+    """
+    try:
+        S3_CLIENT.stat_object(bucket_name, object_name)
+    except S3Error as e:
+        if e.code == 'NoSuchKey':
+            return False
+        raise
+    return True
+
+
+def get_s3_object_stat(bucket_name: str, object_name: str) -> Optional[StoredObjectStat]:
+    """
+    Only request the metadata of object rather than its content
+
+    Returns:
+        Optional[StoredObjectStat]: None when the object doesn't exist
+    """
+    try:
+        stat = S3_CLIENT.stat_object(bucket_name, object_name)
+    except S3Error as e:
+        if e.code == 'NoSuchKey':
+            return None
+        raise
+    last_modified: Optional[datetime.datetime] = stat.last_modified
+    return StoredObjectStat.from_headers(stat.metadata or {}, last_modified)
 
 
 class S3MixIn(object):
 
     BUCKET_NAME: Optional[str] = None
     OBJECT_NAME_PATTERN: str
+    STORAGE_CODEC: Optional[str] = None  # refer to swish_acquisition.compression, default is settings'
 
     def __init__(self, *args: Any, **kwargs: Any) -> None:  # NOQA
         self._validate_bucket_arguments()
@@ -55,18 +152,64 @@ class S3MixIn(object):
             if item is None:
                 raise
 
-    def upload_to_s3(self, data: Dict) -> None:
-        content = json.dumps(data).encode('utf-8')
+    def upload_to_s3(self, data: Dict, upstream_validators: Optional[Dict[str, str]] = None,
+                     partial: bool = False) -> None:
+        """
+        Args:
+            data (Dict): raw data to be stored
+            upstream_validators (Dict[str, str]): validators of upstream response which the data comes from,
+                refer to StoredObjectStat::get_upstream_validators
+            partial (bool): whether the data isn't complete yet, which is collected again instead of being used,
+                refer to StoredObjectStat::is_partial
+
+        Raises:
+            ValueError: data is empty, which is never stored in place of the real one
+        """
+        if not data:
+            raise ValueError(f'empty data is never stored into {self.BUCKET_NAME}{self.object_path}')
+        codec = self.get_storage_codec()
+        content = codec.compress(serialization.dumps(data))
         b_data = io.BytesIO(content)
         data_length = len(content)
+        metadata = {
+            f'{UPSTREAM_VALIDATOR_PREFIX}{key}': value for key, value in (upstream_validators or {}).items()
+        }
+        if partial:
+            metadata[PARTIAL_METADATA_KEY] = 'true'
+        if codec.content_encoding:
+            metadata['Content-Encoding'] = codec.content_encoding
 
         try:
             S3_CLIENT.put_object(self.BUCKET_NAME, self.object_path, b_data,
-                                 data_length, content_type='application/json')
+                                 data_length, content_type='application/json',
+                                 metadata=metadata or None)
         except S3Error:
             logger.exception('upload failed')
             raise
 
+    def renew_object(self, stat: StoredObjectStat) -> None:
+        """
+        Copy the object onto itself with its metadata, which renews its last modified time
+        without uploading the content again, e.g. upstream data isn't modified since it was stored
+        """
+        if self.BUCKET_NAME is None:
+            raise
+        metadata = {f'{USER_METADATA_PREFIX}{key}': value for key, value in stat.metadata.items()}
+        metadata['Content-Type'] = 'application/json'
+        if stat.content_encoding:
+            metadata['Content-Encoding'] = stat.content_encoding
+
+        try:
+            S3_CLIENT.copy_object(self.BUCKET_NAME, self.object_path,
+                                  CopySource(self.BUCKET_NAME, self.object_path),
+                                  metadata=metadata, metadata_directive=REPLACE)
+        except S3Error:
+            logger.exception('renew failed')
+            raise
+
+    def get_storage_codec(self) -> StorageCodec:
+        return get_storage_codec(self.STORAGE_CODEC or settings.S3_STORAGE_CODEC)
+
     @property
     def object_path(self) -> str:
         return self.OBJECT_NAME_PATTERN.format(**self.get_object_path_kwargs())
@@ -79,6 +222,21 @@ class S3MixIn(object):
             raise
         return get_s3_object_data(self.BUCKET_NAME, self.object_path)
 
+    def is_object_existed(self) -> bool:
+        if self.BUCKET_NAME is None:
+            raise
+        return is_s3_object_existed(self.BUCKET_NAME, self.object_path)
+
+    def get_object_stat(self) -> Optional[StoredObjectStat]:
+        if self.BUCKET_NAME is None:
+            raise
+        return get_s3_object_stat(self.BUCKET_NAME, self.object_path)
+
+    def get_object_data_and_stat(self) -> Tuple[Dict, StoredObjectStat]:
+        if self.BUCKET_NAME is None:
+            raise
+        return get_s3_object_data_and_stat(self.BUCKET_NAME, self.object_path)
+
 
 def create_bucket(bucket_name: str) -> bool:
     """
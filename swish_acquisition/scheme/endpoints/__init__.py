@@ -1,8 +1,8 @@
 """
 Schemes of NBA Stats endpoints
 """
-from swish_acquisition.scheme.endpoints.boxscoresummaryv3 import BoxScoreSummaryV3  # NOQA
+from swish_acquisition.scheme.endpoints.boxscoresummaryv3 import BoxScoreSummaryV3, BoxScoreSummaryV3Ids  # NOQA
 from swish_acquisition.scheme.endpoints.commonplayerinfo import CommonPlayerInfo  # NOQA
 from swish_acquisition.scheme.endpoints.playbyplayv3 import PlayByPlayV3  # NOQA
-from swish_acquisition.scheme.endpoints.scoreboardv3 import ScoreboardV3  # NOQA
+from swish_acquisition.scheme.endpoints.scoreboardv3 import ScoreboardV3, ScoreboardV3GameStatuses  # NOQA
 from swish_acquisition.scheme.endpoints.teamdetails import TeamDetails  # NOQA
@@ -9,7 +9,7 @@ from pydantic import BaseModel
 from swish_acquisition.scheme.endpoints.meta import Meta
 
 
-__all__ = ['BoxScoreSummaryV3', 'TeamGameOverallStats']
+__all__ = ['BoxScoreSummaryV3', 'BoxScoreSummaryV3Ids', 'TeamGameOverallStats', 'TeamRosterIds']
 
 
 class GameArena(BaseModel):
@@ -285,3 +285,33 @@ class BoxScoreSummaryV3(BaseModel):
     """
     meta: Meta
     boxScoreSummary: BoxScoreSummary
+
+
+class PlayerIdItem(BaseModel):
+
+    personId: int    # identifier of the player
+
+
+class TeamRosterIds(BaseModel):
+    """
+    Projection of TeamGameOverallStats, which only keeps identifiers of players
+    """
+    players: List[PlayerIdItem]    # active players list
+    inactives: List[PlayerIdItem]  # inactive players list
+
+
+class BoxScoreSummaryIds(BaseModel):
+    """
+    Projection of BoxScoreSummary, which only keeps identifiers of teams and players
+    """
+    awayTeamId: int                 # the identifier of away team
+    homeTeamId: int                 # the identifier of home team
+    homeTeam: TeamRosterIds
+    awayTeam: TeamRosterIds
+
+
+class BoxScoreSummaryV3Ids(BaseModel):
+    """
+    Projection of BoxScoreSummaryV3, the other fields (e.g. officials, broadcasters) are skipped
+    """
+    boxScoreSummary: BoxScoreSummaryIds
@@ -9,7 +9,7 @@ from pydantic import BaseModel
 from swish_acquisition.scheme.endpoints.meta import Meta
 
 
-__all__ = ['ScoreboardV3']
+__all__ = ['ScoreboardV3', 'ScoreboardV3GameStatuses']
 
 
 class GameLeaderItem(BaseModel):
@@ -157,3 +157,26 @@ class ScoreboardV3(BaseModel):
     """
     meta: Meta
     scoreboard: DailyScoreboard
+
+
+class GameStatusItem(BaseModel):
+    """
+    Projection of Game, which only keeps its status
+    """
+    gameId: str                     # the identifier of a game as numeric string
+    gameStatus: int                 # the identifier of game status, such as 3 representing 'Final'
+    gameStatusText: str             # semantic text of game status, such as 'Final'
+
+
+class DailyScoreboardGameStatuses(BaseModel):
+    """
+    Projection of DailyScoreboard, which only keeps statuses of games
+    """
+    games: List[GameStatusItem]
+
+
+class ScoreboardV3GameStatuses(BaseModel):
+    """
+    Projection of ScoreboardV3, the other fields (e.g. leaders, broadcasters) are skipped
+    """
+    scoreboard: DailyScoreboardGameStatuses
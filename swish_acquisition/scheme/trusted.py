@@ -0,0 +1,148 @@
+"""
+Construct schemes from trusted data without validation
+
+Data read from our own bucket has been validated when it was fetched from upstream,
+which can be built into models directly. Scalars are taken as they are,
+while the values whose types need parsing (e.g. datetime) are still validated
+"""
+import functools
+import types
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    get_args,
+    get_origin,
+    get_type_hints,
+    List,
+    Optional,
+    Tuple,
+    Type,
+    TypeVar,
+    Union
+)
+
+from pydantic import BaseModel, TypeAdapter
+
+
+__all__ = ['construct_model']
+
+
+Model = TypeVar('Model', bound=BaseModel)
+Converter = Callable[[Any], Any]
+
+
+PLAIN_TYPES = (bool, float, int, str)
+
+
+def _identity(value: Any) -> Any:
+    return value
+
+
+def _is_named_tuple(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, tuple) and hasattr(annotation, '_fields')
+
+
+def _is_model(annotation: Any) -> bool:
+    return isinstance(annotation, type) and issubclass(annotation, BaseModel)
+
+
+def _get_discriminator_keys(members: List[Type[BaseModel]]) -> Tuple[str, ...]:
+    """
+    Keys of the fields with string defaults, which tell members apart, e.g. 'name' of result sets
+    """
+    return tuple(sorted({
+        field_info.alias or name
+        for member in members
+        for name, field_info in member.model_fields.items()
+        if isinstance(field_info.default, str)
+    }))
+
+
+def _get_union_converter(annotation: Any) -> Converter:
+    members = [member for member in get_args(annotation) if member is not type(None)]
+    if len(members) == 1:
+        converter = _get_converter(members[0])
+        if converter is _identity:
+            return _identity
+        return lambda value: None if value is None else converter(value)
+
+    validate = TypeAdapter(annotation).validate_python
+    if not all(_is_model(member) for member in members):
+        return validate
+
+    # member picked by pydantic for each shape of value, i.e. its keys along with the discriminators,
+    # which is learned by validating the first value of the shape, so that both ways pick the same member
+    discriminator_keys = _get_discriminator_keys(members)
+    picked_members: Dict[Any, Converter] = {}
+
+    def _convert(value: Any) -> Any:
+        if not isinstance(value, dict):
+            return validate(value)
+        shape = (frozenset(value), tuple(value.get(key) for key in discriminator_keys))
+        converter = picked_members.get(shape)
+        if converter is not None:
+            return converter(value)
+        validated = validate(value)
+        picked_members[shape] = _get_converter(type(validated))  # type: ignore[arg-type]
+        return validated
+    return _convert
+
+
+def _get_named_tuple_converter(annotation: Any) -> Converter:
+    type_hints = get_type_hints(annotation)
+    converters = [_get_converter(type_hints[name]) for name in annotation._fields]
+    if all(converter is _identity for converter in converters):
+        return annotation._make  # type: ignore[no-any-return]
+    return lambda value: annotation._make([converter(item) for converter, item in zip(converters, value)])
+
+
+def _get_model_converter(model: Type[BaseModel]) -> Converter:
+    # converters are resolved on the first call, since models may refer to each other,
+    # the plan is published by a single assignment once it is complete, which is shared among threads
+    plan: Optional[List[Tuple[str, str, Converter]]] = None
+
+    def _convert(value: Dict) -> BaseModel:
+        nonlocal plan
+        if plan is None:
+            plan = [
+                (name, field_info.alias or name, _get_converter(field_info.annotation))  # type: ignore[arg-type]
+                for name, field_info in model.model_fields.items()
+            ]
+        return model.model_construct(**{
+            name: converter(value[key]) for name, key, converter in plan if key in value
+        })
+    return _convert
+
+
+@functools.lru_cache(maxsize=None)
+def _get_converter(annotation: Any) -> Converter:
+    if annotation in PLAIN_TYPES:
+        return _identity
+    if _is_model(annotation):
+        return _get_model_converter(annotation)
+    if _is_named_tuple(annotation):
+        return _get_named_tuple_converter(annotation)
+    origin = get_origin(annotation)
+    if origin is list:
+        item_converter = _get_converter(get_args(annotation)[0])
+        if item_converter is _identity:
+            return _identity
+        return lambda value: [item_converter(item) for item in value]
+    if origin in (Union, types.UnionType):
+        return _get_union_converter(annotation)
+    return TypeAdapter(annotation).validate_python
+
+
+def construct_model(model: Type[Model], data: Dict) -> Model:
+    """
+    Build the model from trusted data, which is never validated again
+
+    Nested models are built by 'model_construct' recursively,
+    a member of union is the one which validation picks for values of the same shape
+
+    Args:
+        model (Type[Model]): scheme of the data
+        data (Dict): raw data which has been validated by the scheme
+    """
+    return _get_converter(model)(data)  # type: ignore[no-any-return]
@@ -0,0 +1,90 @@
+"""
+JSON serialization of raw data
+
+Content is parsed from bytes directly, which avoids decoding it into an intermediate string.
+'orjson' is used when it is installed, otherwise falls back to the standard library
+"""
+from functools import lru_cache
+import json
+from typing import Any, Dict, Type, Union
+
+from swish_acquisition.conf import settings
+
+
+__all__ = ['dumps', 'get_json_backend', 'loads']
+
+
+Buffer = Union[bytes, bytearray, memoryview, str]
+
+
+class JSONBackend(object):
+
+    name: str
+
+    def loads(self, content: Buffer) -> Any:
+        raise NotImplementedError
+
+    def dumps(self, obj: Any) -> bytes:
+        raise NotImplementedError
+
+
+class StdlibJSONBackend(JSONBackend):
+
+    name = 'json'
+
+    def loads(self, content: Buffer) -> Any:
+        # 'json' detects the encoding of bytes by itself, but doesn't support memoryview
+        if isinstance(content, memoryview):
+            content = content.tobytes()
+        return json.loads(content)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj).encode('utf-8')
+
+
+class ORJSONBackend(JSONBackend):
+
+    name = 'orjson'
+
+    def __init__(self) -> None:
+        import orjson  # NOQA
+
+        self._orjson = orjson
+
+    def loads(self, content: Buffer) -> Any:
+        return self._orjson.loads(content)
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._orjson.dumps(obj)  # type: ignore[no-any-return]
+
+
+JSON_BACKENDS: Dict[str, Type[JSONBackend]] = {
+    StdlibJSONBackend.name: StdlibJSONBackend,
+    ORJSONBackend.name: ORJSONBackend
+}
+
+
+@lru_cache(maxsize=None)
+def get_json_backend(name: str = 'auto') -> JSONBackend:
+    """
+    Args:
+        name (str): 'auto', or one of the keys of JSON_BACKENDS
+            'auto' prefers the fastest installed one
+    """
+    if name == 'auto':
+        try:
+            return ORJSONBackend()
+        except ImportError:
+            return StdlibJSONBackend()
+
+    if name not in JSON_BACKENDS:
+        raise ValueError(f'Unsupported JSON backend [{name}]')
+    return JSON_BACKENDS[name]()
+
+
+def loads(content: Buffer) -> Any:
+    return get_json_backend(settings.JSON_BACKEND).loads(content)
+
+
+def dumps(obj: Any) -> bytes:
+    return get_json_backend(settings.JSON_BACKEND).dumps(obj)
@@ -12,7 +12,7 @@ from sqlalchemy.pool import QueuePool
 from swish_acquisition.conf import settings
 
 
-__all__ = ['managed_session']
+__all__ = ['independent_session', 'managed_session']
 
 
 POOL_SIZE = 5
@@ -86,3 +86,24 @@ def managed_session():
         raise
     finally:
         SESSION.close()
+
+
+@contextmanager
+def independent_session():
+    """
+    Session owned by the caller rather than shared by current thread,
+    whose transaction won't be ended by a nested managed_session
+
+    Usage:
+        with independent_session() as session:
+            session.execute...
+    """
+    session = SESSION.session_factory()
+    try:
+        yield session
+        session.commit()
+    except:  # NOQA
+        session.rollback()
+        raise
+    finally:
+        session.close()
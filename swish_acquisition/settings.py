@@ -20,3 +20,123 @@ DATABASES = {
 
 # retry upper limit when init backend tables
 PREPARE_MODELS_MAX_RETRIES = 3
+
+
+# connection pool of HTTP transport, which is shared by endpoints in the same process
+HTTP_POOL_CONNECTIONS = 10  # amount of pooled hosts
+HTTP_POOL_MAXSIZE = 10      # amount of pooled connections per host
+HTTP_KEEP_ALIVE = True
+HTTP2 = False               # requires optional dependency 'httpx[http2]'
+
+
+# cassettes of responses, refer to swish_acquisition.transport::CassetteClient
+# None requests remote, 'record' requests remote and records cassettes, 'replay' never touches remote
+HTTP_CASSETTE_MODE = None
+HTTP_CASSETTE_DIRECTORY = 'cassettes'
+HTTP_CASSETTE_LATENCY = None  # seconds injected into each replayed response, None means the recorded latency
+
+
+# JSON serialization of raw data, 'auto' prefers 'orjson' when it is installed
+# refer to swish_acquisition.serialization::get_json_backend
+JSON_BACKEND = 'auto'
+
+
+# compression of objects stored in S3, 'identity', 'gzip' or 'zstd' (requires optional dependency 'zstandard')
+# which can be overridden by S3MixIn::STORAGE_CODEC of each collector
+S3_STORAGE_CODEC = 'gzip'
+
+
+# concurrent collectors, refer to swish_acquisition.collectors.base::run_collectors
+COLLECTOR_CONCURRENCY = 4
+
+
+# directory of states shared among processes of current host
+# refer to swish_acquisition.shared_state::get_shared_state
+SHARED_STATE_DIRECTORY = '/tmp/swish-acquisition'
+
+
+# token bucket which limits requests towards NBA Stats among workers
+RATE_LIMIT_BACKEND = 'file'  # 'memory', 'file' or 'postgres'
+RATE_LIMIT_RATE = 2.0        # requests per second, non-positive value means no limit
+RATE_LIMIT_BURST = 5
+
+
+# index of stored entities shared by games, i.e. players and teams
+# refer to swish_acquisition.entity_index::get_known_entity_index
+KNOWN_ENTITY_BACKEND = 'file'   # 'memory', 'file' or 'postgres', None disables the index
+KNOWN_ENTITY_TTL = 86400        # seconds, non-positive value means never expired
+KNOWN_ENTITY_CACHE_SIZE = 4096  # entities kept in process of each index
+
+
+# game series, refer to swish_acquisition.tasks::scrape_single_game_series
+GAME_SERIES_PLAYER_CHUNK_SIZE = 8  # players collected by one subtask
+GAME_SERIES_MAX_RETRIES = 3        # retries of each subtask
+
+
+# backfill of game series, refer to swish_acquisition.tasks::backfill_game_series
+BACKFILL_STATE_BACKEND = 'postgres'  # where the progress is kept, which should survive worker restarts
+BACKFILL_WINDOW_DAYS = 7             # dates whose games are enqueued at once
+BACKFILL_CHUNK_SIZE = 5              # games published by one group
+BACKFILL_POLL_INTERVAL = 60          # seconds between two checks of window's progress
+BACKFILL_MAX_POLLS = 120             # checks before giving up waiting for the uncollected games in window
+
+
+# tracking of tasks' lifecycles into SwishPipeline and SwishTask, refer to swish_acquisition.tracking
+TASK_TRACKING_ENABLED = True
+TASK_TRACKING_BATCH_SIZE = 100     # records which trigger a write at once
+TASK_TRACKING_FLUSH_INTERVAL = 5   # seconds
+
+
+# re-fetches carry validators of upstream response (ETag / Last-Modified) which the stored object comes from,
+# so that unmodified data isn't downloaded again, refer to swish_acquisition.collectors.base::EndpointCollectorMixIn
+CONDITIONAL_REQUEST_ENABLED = True
+
+
+# retries of requests towards remote, refer to swish_acquisition.endpoints.base::Endpoint.request
+REQUEST_MAX_RETRIES = 3
+REQUEST_RETRY_BACKOFF_FACTOR = 1    # seconds, upper limit of jittered delay is doubled by each retry
+REQUEST_RETRY_BACKOFF_MAX = 30      # seconds, which caps 'Retry-After' as well
+REQUEST_RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+# circuit breaker of each endpoint, refer to swish_acquisition.circuitbreaker::get_circuit_breaker
+CIRCUIT_BREAKER_BACKEND = 'file'          # 'memory', 'file' or 'postgres'
+CIRCUIT_BREAKER_FAILURE_THRESHOLD = 5     # consecutive failures which open the circuit, non-positive value disables it
+CIRCUIT_BREAKER_RECOVERY_TIMEOUT = 60     # seconds before the open circuit is probed
+CIRCUIT_BREAKER_MAX_DEFERRALS = 60        # times a task is deferred by the open circuit before it fails
+
+
+# timeout of requests towards remote, refer to swish_acquisition.endpoints.base::Endpoint.get_timeout
+REQUEST_TIMEOUT_MODE = 'adaptive'  # 'fixed' or 'adaptive'
+LATENCY_WINDOW_SIZE = 200          # latest latencies of each endpoint kept in process
+ADAPTIVE_TIMEOUT_MIN_SAMPLES = 20  # latencies observed before the timeout is adapted
+ADAPTIVE_TIMEOUT_MULTIPLIER = 3    # headroom on p99 of latencies
+ADAPTIVE_TIMEOUT_MIN = 2           # seconds
+ADAPTIVE_TIMEOUT_MAX = 30          # seconds
+ADAPTIVE_CONNECT_TIMEOUT = 3.05    # seconds, upper limit of connect timeout
+
+
+# data read from our own bucket is constructed into schemes without validation by endpoints which opt in,
+# refer to swish_acquisition.endpoints.base::Endpoint.TRUSTED_LOAD, fresh upstream payloads are always validated
+TRUSTED_LOAD_ENABLED = True
+
+
+# columnar export of stored Play-by-Play, refer to swish_acquisition.export
+# which requires optional dependency 'pyarrow', i.e. extra 'export'
+PLAY_BY_PLAY_EXPORT_ENABLED = False            # whether each collected game is exported
+PLAY_BY_PLAY_EXPORT_BUCKET = 'playbyplay-parquet'
+PLAY_BY_PLAY_EXPORT_COMPRESSION = 'zstd'       # compression of Parquet, e.g. 'snappy', 'gzip' or 'zstd'
+
+
+# live polling of in-progress games, refer to swish_acquisition.tasks::poll_live_play_by_play
+LIVE_PLAY_BY_PLAY_POLL_INTERVAL = 60  # seconds between two polls
+LIVE_PLAY_BY_PLAY_MAX_POLLS = 360     # polls before giving up a game which never goes final
+
+
+# watcher of live scoreboard, refer to swish_acquisition.tasks::watch_live_scoreboard
+# which is scheduled by Celery beat every LIVE_SCOREBOARD_POLL_INTERVAL seconds
+LIVE_SCOREBOARD_LEAGUE_ID = '00'
+LIVE_SCOREBOARD_STATE_BACKEND = 'postgres'     # where the last snapshot of game statuses is kept
+LIVE_SCOREBOARD_TIMEZONE = 'America/New_York'  # which game dates of scoreboard follow
+LIVE_SCOREBOARD_POLL_INTERVAL = 60             # seconds between two polls while games are live
+LIVE_SCOREBOARD_MAX_INTERVAL = 1800            # upper limit of backed-off seconds while no games are live
@@ -0,0 +1,130 @@
+"""
+States shared among threads, processes or hosts
+
+A state is a JSON serializable dict identified by key,
+which is only read and written under an exclusive lock
+"""
+from contextlib import contextmanager
+import fcntl
+import json
+import os
+import threading
+from typing import ContextManager, Dict, Iterator
+
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+from swish_acquisition.conf import settings
+from swish_acquisition.models import SwishSharedState
+from swish_acquisition.session import independent_session, managed_session
+
+
+__all__ = ['get_shared_state', 'SharedState']
+
+
+class SharedState(object):
+
+    def locked(self, key: str) -> ContextManager[Dict]:
+        """
+        Usage:
+            with shared_state.locked('key') as state:
+                state['count'] = state.get('count', 0) + 1
+
+        Modification on the yielded dict would be persisted when exiting
+        """
+        raise NotImplementedError
+
+
+class MemorySharedState(SharedState):
+    """
+    Shared among threads of current process
+    """
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._states: Dict[str, Dict] = {}
+
+    @contextmanager
+    def locked(self, key: str) -> Iterator[Dict]:  # type: ignore[override]
+        with self._lock:
+            yield self._states.setdefault(key, {})
+
+
+class FileSharedState(SharedState):
+    """
+    Shared among processes of current host, based on file lock
+    """
+    def __init__(self, directory: str) -> None:
+        self._directory = directory
+
+    @contextmanager
+    def locked(self, key: str) -> Iterator[Dict]:  # type: ignore[override]
+        os.makedirs(self._directory, exist_ok=True)
+        path = os.path.join(self._directory, f'{key}.json')
+        with open(path, 'a+') as fp:
+            fcntl.flock(fp.fileno(), fcntl.LOCK_EX)
+            try:
+                fp.seek(0)
+                try:
+                    state = json.loads(fp.read())
+                except json.JSONDecodeError:
+                    # empty or broken when the last writer crashed
+                    state = {}
+                yield state
+                fp.seek(0)
+                fp.truncate()
+                json.dump(state, fp)
+                fp.flush()
+            finally:
+                fcntl.flock(fp.fileno(), fcntl.LOCK_UN)
+
+
+class PostgresSharedState(SharedState):
+    """
+    Shared among hosts, based on row lock of table 'swish_shared_state'
+    """
+    def __init__(self) -> None:
+        self._is_table_prepared = False
+
+    def _prepare_table(self) -> None:
+        if self._is_table_prepared:
+            return
+        with managed_session() as session:
+            SwishSharedState.__table__.create(session.bind, checkfirst=True)  # type: ignore[attr-defined]
+        self._is_table_prepared = True
+
+    @contextmanager
+    def locked(self, key: str) -> Iterator[Dict]:  # type: ignore[override]
+        self._prepare_table()
+        # row lock lasts until the end of the transaction,
+        # which shouldn't be committed by others in the same thread, e.g. rate limiter
+        with independent_session() as session:
+            session.execute(
+                insert(SwishSharedState).values(state_key=key).on_conflict_do_nothing()
+            )
+            record = session.execute(
+                select(SwishSharedState).where(SwishSharedState.state_key == key).with_for_update()
+            ).scalar_one()
+            state = json.loads(record.state_value)
+            yield state
+            record.state_value = json.dumps(state)
+
+
+_MEMORY_SHARED_STATE = MemorySharedState()
+_POSTGRES_SHARED_STATE = PostgresSharedState()
+
+
+def get_shared_state(backend: str) -> SharedState:
+    """
+    Args:
+        backend (str): one of
+            * 'memory', shared among threads of current process
+            * 'file', shared among processes of current host, located at settings.SHARED_STATE_DIRECTORY
+            * 'postgres', shared among hosts
+    """
+    if backend == 'memory':
+        return _MEMORY_SHARED_STATE
+    if backend == 'file':
+        return FileSharedState(settings.SHARED_STATE_DIRECTORY)
+    if backend == 'postgres':
+        return _POSTGRES_SHARED_STATE
+    raise ValueError(f'Unsupported shared state backend [{backend}]')
@@ -1,12 +1,20 @@
 """
 Celery tasks
 """
+import copy
 import datetime
 import logging
-import random
 import time
+from typing import Any, Dict, List, Optional
+import uuid
+from zoneinfo import ZoneInfo
 
+from celery import group, Task
+from minio import S3Error
+
+from swish_acquisition import export
 from swish_acquisition.celery_app import app
+from swish_acquisition.circuitbreaker import CircuitOpenError
 from swish_acquisition.collectors import (
     BoxscoreSummaryCollector,
     CommonPlayerInfoCollector,
@@ -14,47 +22,380 @@ from swish_acquisition.collectors import (
     ScoreboardCollector,
     TeamDetailsCollector
 )
+from swish_acquisition.collectors.base import EndpointCollectorProtocol, run_collectors
+from swish_acquisition.conf import settings
+from swish_acquisition.constants import GAME_STATUS_FINAL, GAME_STATUS_LIVE
+from swish_acquisition.endpoints import ScoreboardV3Endpoint
+from swish_acquisition.shared_state import get_shared_state
 
 
 logger = logging.getLogger(__name__)
 
 
-def request_interval() -> None:
-    time.sleep(random.uniform(2, 4))
+DATE_FORMAT = '%Y-%m-%d'
 
 
-@app.task
+def _parse_date(a_date: str) -> datetime.date:
+    return datetime.datetime.strptime(a_date, DATE_FORMAT).date()
+
+
+class EndpointTask(Task):
+    """
+    Task which requests remote endpoints, when the circuit is open,
+    it is deferred until the circuit breaker would probe again instead of backing off
+    """
+    def retry(self, *args: Any, exc: Optional[BaseException] = None, **options: Any) -> Any:
+        if not isinstance(exc, CircuitOpenError):
+            return super().retry(*args, exc=exc, **options)
+        options.update(countdown=exc.retry_after, eta=None, max_retries=settings.CIRCUIT_BREAKER_MAX_DEFERRALS)
+        try:
+            return super().retry(*args, exc=exc, **options)
+        finally:
+            # Celery keeps the overridden max retries on task, which shouldn't apply to the other failures
+            if hasattr(self, 'override_max_retries'):
+                del self.override_max_retries
+
+
+@app.task(base=EndpointTask, autoretry_for=(CircuitOpenError,))
 def scrape_daily_scoreboard(game_date: str, league_id: str):
-    a_date = datetime.datetime.strptime(game_date, '%Y-%m-%d').date()
+    a_date = _parse_date(game_date)
     collector = ScoreboardCollector(game_date=a_date, league_id=league_id)
-    collector.run()
+    collector.run(lazy=True)
 
 
-@app.task
+# subtasks of game series are retried independently with exponential backoff,
+# deferrals by the open circuit count into the retries as well
+SUBTASK_OPTIONS = {
+    'base': EndpointTask,
+    'autoretry_for': (Exception,),
+    'retry_backoff': True,
+    'retry_jitter': True,
+    'retry_kwargs': {'max_retries': settings.GAME_SERIES_MAX_RETRIES},
+    'acks_late': True
+}
+
+
+@app.task(**SUBTASK_OPTIONS)
 def scrape_single_game_series(game_date: str, game_id: str):
-    a_date = datetime.datetime.strptime(game_date, '%Y-%m-%d').date()
+    """
+    Collect Boxscore Summary first, then fan out the other parts of game series,
+    which are collected in parallel by subtasks across workers
+    """
+    a_date = _parse_date(game_date)
+    boxscore_summary = BoxscoreSummaryCollector(game_date=a_date, game_id=game_id)
+    boxscore_summary.run(lazy=True)
+
+    team_ids = [team_id for team_id in boxscore_summary.get_team_ids().values() if team_id]
+    player_ids = [
+        player_id
+        for player_ids in boxscore_summary.get_player_ids().values()
+        for player_id in (player_ids or [])
+    ]
+    chunk_size = settings.GAME_SERIES_PLAYER_CHUNK_SIZE
+    group(
+        *[scrape_team_details.s(game_date=game_date, team_id=team_id) for team_id in team_ids],
+        *[
+            scrape_common_player_infos.s(game_date=game_date, player_ids=player_ids[idx:idx + chunk_size])
+            for idx in range(0, len(player_ids), chunk_size)
+        ],
+        scrape_play_by_play.s(game_date=game_date, game_id=game_id)
+    ).apply_async()
+
+
+@app.task(**SUBTASK_OPTIONS)
+def scrape_team_details(game_date: str, team_id: int):
+    TeamDetailsCollector(game_date=_parse_date(game_date), team_id=team_id).run(lazy=True)
+
+
+@app.task(**SUBTASK_OPTIONS)
+def scrape_common_player_infos(game_date: str, player_ids: List[int]):
+    a_date = _parse_date(game_date)
+    run_collectors(
+        [CommonPlayerInfoCollector(game_date=a_date, player_id=player_id) for player_id in player_ids],
+        lazy=True
+    )
+
+
+@app.task(**SUBTASK_OPTIONS)
+def scrape_play_by_play(game_date: str, game_id: str):
+    PlayByPlayCollector(game_date=_parse_date(game_date), game_id=game_id).run(lazy=True)
+    if settings.PLAY_BY_PLAY_EXPORT_ENABLED:
+        export_play_by_play.delay(game_date=game_date, game_id=game_id)
+
+
+@app.task(autoretry_for=(S3Error,), retry_backoff=True, retry_jitter=True,
+          retry_kwargs={'max_retries': settings.GAME_SERIES_MAX_RETRIES}, acks_late=True)
+def export_play_by_play(game_date: str, game_id: str):
+    """
+    Export stored Play-by-Play of the game into Parquet, refer to swish_acquisition.export
+    """
+    export.export_play_by_play(_parse_date(game_date), game_id)
+
+
+@app.task(bind=True, **SUBTASK_OPTIONS)
+def poll_live_play_by_play(self, game_date: str, game_id: str, league_id: str = '00', polls: int = 0):
+    """
+    Collect Play-by-Play of an in-progress game incrementally,
+    refer to swish_acquisition.collectors.PlayByPlayCollector::merge_live_actions
+
+    The task reschedules itself every settings.LIVE_PLAY_BY_PLAY_POLL_INTERVAL seconds,
+    until the game status on scoreboard is final, whose Play-by-Play is collected in whole for the last time.
+    A game which never goes final is given up after settings.LIVE_PLAY_BY_PLAY_MAX_POLLS polls.
+    Each poll is retried as subtasks of game series, and the stored object stays partial until the final
+    collection, so that an interrupted polling is made up by scrape_play_by_play
+
+    Args:
+        polls (int): polls done by the former steps
+    """
+    a_date = _parse_date(game_date)
+    game_status = ScoreboardV3Endpoint(game_date=a_date, league_id=league_id).get_game_statuses().get(game_id)
+    collector = PlayByPlayCollector(game_date=a_date, game_id=game_id)
+
+    if game_status == GAME_STATUS_FINAL:
+        # actions may be amended after the buzzer, which are collected in whole and no longer partial
+        collector.run(overwritten=True)
+        logger.info(f'live play by play | {game_id} | final after {polls + 1} polls')
+        if settings.PLAY_BY_PLAY_EXPORT_ENABLED:
+            export_play_by_play.delay(game_date=game_date, game_id=game_id)
+        return
+    collector.merge_live_actions()
+    if polls + 1 >= settings.LIVE_PLAY_BY_PLAY_MAX_POLLS:
+        logger.warning(f'live play by play | {game_id} | give up after {polls + 1} polls, '
+                       f'whose status is {game_status}')
+        return
+    self.apply_async(
+        kwargs={'game_date': game_date, 'game_id': game_id, 'league_id': league_id, 'polls': polls + 1},
+        countdown=settings.LIVE_PLAY_BY_PLAY_POLL_INTERVAL
+    )
+
+
+def _get_today() -> datetime.date:
+    return datetime.datetime.now(ZoneInfo(settings.LIVE_SCOREBOARD_TIMEZONE)).date()
+
+
+def _get_watched_dates(games: Dict[str, Dict], today: datetime.date) -> List[str]:
+    """
+    Today, along with yesterday when its games haven't been final, e.g. games ending after midnight
+    """
+    yesterday = (today - datetime.timedelta(days=1)).strftime(DATE_FORMAT)
+    game_dates = {today.strftime(DATE_FORMAT)}
+    if any(game['game_date'] == yesterday and game['game_status'] != GAME_STATUS_FINAL for game in games.values()):
+        game_dates.add(yesterday)
+    return sorted(game_dates)
+
+
+@app.task
+def watch_live_scoreboard(league_id: Optional[str] = None):
+    """
+    Poll statuses of games on scoreboard, which is scheduled by Celery beat,
+    game series of each game is enqueued the moment its status turns final
+
+    Statuses are diffed against the last snapshot kept in shared state (settings.LIVE_SCOREBOARD_STATE_BACKEND),
+    so that each game is enqueued once among watchers. While no games are live,
+    polls are skipped with exponential backoff up to settings.LIVE_SCOREBOARD_MAX_INTERVAL seconds
+
+    Args:
+        league_id (str): default is settings.LIVE_SCOREBOARD_LEAGUE_ID
+    """
+    league_id = league_id or settings.LIVE_SCOREBOARD_LEAGUE_ID
+    shared_state = get_shared_state(settings.LIVE_SCOREBOARD_STATE_BACKEND)
+    state_key = f'live_scoreboard.{league_id}'
+    polled_time = time.time()
+    with shared_state.locked(state_key) as state:
+        if polled_time < state.get('next_poll_time', 0):
+            return
+        games = copy.deepcopy(state.get('games', {}))
+
+    # requests towards remote shouldn't hold the lock of shared state
+    today = _get_today()
+    watched_dates = _get_watched_dates(games, today)
+    statuses: Dict[str, Dict] = {}
+    try:
+        for game_date in watched_dates:
+            scoreboard = ScoreboardV3Endpoint(game_date=_parse_date(game_date), league_id=league_id)
+            for game_id, game_status in scoreboard.get_game_statuses().items():
+                statuses[game_id] = {'game_date': game_date, 'game_status': game_status}
+    except CircuitOpenError as e:
+        # the next tick of beat tries again
+        logger.warning(f'live scoreboard | {league_id} | poll is skipped, {e}')
+        return
+
+    with shared_state.locked(state_key) as state:
+        games = state.setdefault('games', {})
+        final_games = [
+            [game['game_date'], game_id] for game_id, game in statuses.items()
+            if game['game_status'] == GAME_STATUS_FINAL
+            and games.get(game_id, {}).get('game_status') != GAME_STATUS_FINAL
+        ]
+        games.update(statuses)
+        # final games of former dates are never watched again, neither are the games of dates
+        # which are no longer watched, e.g. postponed or suspended games which never go final
+        for game_id in [
+            game_id for game_id, game in games.items()
+            if game['game_date'] < watched_dates[0]
+            or (game['game_status'] == GAME_STATUS_FINAL and game['game_date'] < today.strftime(DATE_FORMAT))
+        ]:
+            del games[game_id]
+
+        if any(game['game_status'] == GAME_STATUS_LIVE for game in statuses.values()):
+            state['idle_polls'] = 0
+            state['next_poll_time'] = 0
+        else:
+            state['idle_polls'] = state.get('idle_polls', 0) + 1
+            interval = min(settings.LIVE_SCOREBOARD_POLL_INTERVAL * 2 ** state['idle_polls'],
+                           settings.LIVE_SCOREBOARD_MAX_INTERVAL)
+            # half a tick earlier, so that the tick around the due time isn't skipped by jitter of beat
+            state['next_poll_time'] = polled_time + interval - settings.LIVE_SCOREBOARD_POLL_INTERVAL / 2
+
+    for game_date, game_id in final_games:
+        scrape_single_game_series.delay(game_date=game_date, game_id=game_id)
+    logger.info(f'live scoreboard | {league_id} | {len(statuses)} games, {len(final_games)} turned final')
+
+
+def _is_game_series_collected(game_date: str, game_id: str) -> bool:
+    """
+    Whether every part of game series has been stored, which are collected by parallel subtasks
+    """
+    a_date = _parse_date(game_date)
+    # Play By Play is checked first, which is the most likely missing one of pending games
+    if not PlayByPlayCollector(game_date=a_date, game_id=game_id).is_collected():
+        return False
 
-    # 01. collect Boxscore Summary
     boxscore_summary = BoxscoreSummaryCollector(game_date=a_date, game_id=game_id)
-    boxscore_summary.run()
-
-    # 02. collect Team Details of game's both sides
-    for _, team_id in boxscore_summary.get_team_ids().items():
-        if not team_id:
-            continue
-        team_details = TeamDetailsCollector(game_date=a_date, team_id=team_id)
-        team_details.run()
-        request_interval()
-
-    # 03. collect Common Player Info of game's related players
-    for _, player_ids in boxscore_summary.get_player_ids().items():
-        if not player_ids:
-            continue
-        for player_id in player_ids:
-            common_player_info = CommonPlayerInfoCollector(game_date=a_date, player_id=player_id)
-            common_player_info.run()
-            request_interval()
-
-    # 04. collect Play By Play
-    play_by_play = PlayByPlayCollector(game_date=a_date, game_id=game_id)
-    play_by_play.run()
+    try:
+        boxscore_summary._set_data_dict(boxscore_summary.get_object_data(), trusted=True)
+    except S3Error:
+        return False
+    collectors: List[EndpointCollectorProtocol] = [
+        *[
+            TeamDetailsCollector(game_date=a_date, team_id=team_id)
+            for team_id in boxscore_summary.get_team_ids().values()
+            if team_id
+        ],
+        *[
+            CommonPlayerInfoCollector(game_date=a_date, player_id=player_id)
+            for player_ids in boxscore_summary.get_player_ids().values()
+            for player_id in (player_ids or [])
+        ]
+    ]
+    return all(collector.is_collected() for collector in collectors)
+
+
+def _get_uncollected_games(game_date: str, league_id: str) -> List[List[str]]:
+    scoreboard = ScoreboardCollector(game_date=_parse_date(game_date), league_id=league_id)
+    scoreboard.run(lazy=True)
+    return [
+        [game_date, game_id]
+        for game_id in scoreboard.get_game_ids()
+        if not _is_game_series_collected(game_date, game_id)
+    ]
+
+
+def _step_backfill(progress: Dict, start_date: str, end_date: str, league_id: str) -> bool:
+    """
+    Move the backfill progress forward by one step
+
+    Returns:
+        bool: whether the backfill finished
+    """
+    # 01. wait for enqueued games of previous window
+    pending_games = [
+        game for game in progress.get('pending_games', [])
+        if not _is_game_series_collected(*game)
+    ]
+    if pending_games:
+        if progress.get('polls', 0) < settings.BACKFILL_MAX_POLLS:
+            progress['pending_games'] = pending_games
+            progress['polls'] = progress.get('polls', 0) + 1
+            return False
+        logger.warning(f'backfill | {league_id} | {start_date} ~ {end_date} | '
+                       f'give up waiting for game series: {pending_games}')
+        progress['failed_games'] = progress.get('failed_games', []) + pending_games
+    progress['pending_games'] = []
+    progress['polls'] = 0
+
+    # 02. enqueue games of next window
+    cursor = _parse_date(progress.get('cursor', start_date))
+    if cursor > _parse_date(end_date):
+        logger.info(f'backfill | {league_id} | {start_date} ~ {end_date} | finished, '
+                    f'{progress.get("enqueued_count", 0)} enqueued, {len(progress.get("failed_games", []))} failed')
+        return True
+
+    window_end = min(cursor + datetime.timedelta(days=settings.BACKFILL_WINDOW_DAYS - 1), _parse_date(end_date))
+    games = []
+    a_date = cursor
+    while a_date <= window_end:
+        games.extend(_get_uncollected_games(a_date.strftime(DATE_FORMAT), league_id))
+        a_date += datetime.timedelta(days=1)
+    # published in bounded groups, each game is a task on its own queue which retries alone
+    for idx in range(0, len(games), settings.BACKFILL_CHUNK_SIZE):
+        group([
+            scrape_single_game_series.s(game_date=game_date, game_id=game_id)
+            for game_date, game_id in games[idx:idx + settings.BACKFILL_CHUNK_SIZE]
+        ]).apply_async()
+
+    progress['cursor'] = (window_end + datetime.timedelta(days=1)).strftime(DATE_FORMAT)
+    progress['pending_games'] = games
+    progress['enqueued_count'] = progress.get('enqueued_count', 0) + len(games)
+    logger.info(f'backfill | {league_id} | {start_date} ~ {end_date} | '
+                f'{len(games)} enqueued from {cursor} to {window_end}')
+    return False
+
+
+@app.task(bind=True, acks_late=True)
+def backfill_game_series(self, start_date: str, end_date: str, league_id: str,
+                         run_token: Optional[str] = None, step: int = 0):
+    """
+    Collect game series of all games between start_date and end_date (both inclusive)
+
+    Dates are handled window by window (settings.BACKFILL_WINDOW_DAYS), games in a window are
+    enqueued in groups, and the next window won't start until all of them are collected.
+    The task reschedules itself for each step, whose progress is kept in shared state
+    (settings.BACKFILL_STATE_BACKEND), so that it resumes from where it stopped
+    when being triggered again with the same arguments.
+    Games which have been collected are always skipped.
+
+    Args:
+        run_token (str): identifier of the chain of steps, which is given by rescheduling.
+            Triggering again starts a new chain, and the former one exits at its next step
+        step (int): sequence of the step in chain, a duplicated step (e.g. redelivered message) exits
+    """
+    shared_state = get_shared_state(settings.BACKFILL_STATE_BACKEND)
+    state_key = f'backfill.{league_id}.{start_date}.{end_date}'
+    with shared_state.locked(state_key) as progress:
+        if run_token is None:
+            run_token = uuid.uuid4().hex
+            progress['run_token'] = run_token
+            progress['step'] = step
+        elif progress.get('run_token') != run_token or progress.get('step') != step:
+            logger.info(f'backfill | {league_id} | {start_date} ~ {end_date} | '
+                        f'step {step} of chain {run_token} is superseded')
+            return
+        step_progress = copy.deepcopy(progress)
+
+    # requests towards remote shouldn't hold the lock of shared state
+    try:
+        is_finished = _step_backfill(step_progress, start_date, end_date, league_id)
+    except CircuitOpenError as e:
+        # the same step is tried again once the circuit would be probed, whose progress is untouched
+        logger.warning(f'backfill | {league_id} | {start_date} ~ {end_date} | step {step} is deferred, {e}')
+        self.apply_async(
+            kwargs={'start_date': start_date, 'end_date': end_date, 'league_id': league_id,
+                    'run_token': run_token, 'step': step},
+            countdown=e.retry_after
+        )
+        return
+    if not is_finished:
+        # rescheduled before the progress is saved, a crash in between leads to a redelivery of this step,
+        # which reschedules the same next step again, whose duplicate would be superseded
+        self.apply_async(
+            kwargs={'start_date': start_date, 'end_date': end_date, 'league_id': league_id,
+                    'run_token': run_token, 'step': step + 1},
+            countdown=settings.BACKFILL_POLL_INTERVAL
+        )
+
+    with shared_state.locked(state_key) as progress:
+        if progress.get('run_token') != run_token or progress.get('step') != step:
+            return
+        progress.update(step_progress)
+        progress['step'] = step + 1
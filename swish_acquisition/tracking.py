@@ -0,0 +1,279 @@
+"""
+Track lifecycles of Celery tasks into SwishPipeline and SwishTask
+
+A pipeline is the tree of tasks triggered by the same root task.
+Records are buffered in process and written in batch by a background thread,
+so that workers don't wait for database round trips
+"""
+import datetime
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from celery import states
+from celery.signals import (
+    before_task_publish,
+    task_postrun,
+    task_prerun,
+    worker_init,
+    worker_process_shutdown,
+    worker_shutdown
+)
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert
+
+from swish_acquisition.conf import settings
+from swish_acquisition.models import (
+    BaseModel,
+    IMPLICIT_COLUMN_NAMES,
+    prepare_models,
+    Status,
+    SwishPipeline,
+    SwishTask
+)
+from swish_acquisition.session import managed_session
+
+
+__all__ = ['get_task_duration_stats', 'TaskEventRecorder']
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_LEAGUE_ID = '00'
+TASK_COLUMNS = (
+    'pipeline_id', 'task_id', 'task_name', 'celery_task_id', 'parent_task_id',
+    'task_arguments', 'task_status', 'started_time', 'completed_time'
+)
+PIPELINE_COLUMNS = (
+    'pipeline_id', 'game_date', 'league_id', 'pipeline_status', 'started_time', 'completed_time'
+)
+# columns of a former run which are cleared once the task starts again, e.g. retried or redelivered
+RESTART_CLEARED_COLUMNS = ('completed_time',)
+
+
+def _merge_record(record: Dict, status_key: str, fields: Dict) -> None:
+    if fields.get(status_key) == Status.IN_PROGRESS.value:
+        for column in RESTART_CLEARED_COLUMNS:
+            record.pop(column, None)
+    for key, value in fields.items():
+        if value is None:
+            continue
+        # events may arrive out of order, 'PENDING' from publisher never overrides a later status
+        if key == status_key and value == Status.PENDING.value and record.get(status_key):
+            continue
+        record[key] = value
+
+
+def _get_upsert_statement(model: Type[BaseModel], primary_keys: Tuple[str, ...], status_key: str) -> Any:
+    table: Any = model.__table__  # type: ignore[attr-defined]
+    statement = insert(table)
+    excluded = statement.excluded
+    # 'updated_time' is maintained by trigger
+    updated_columns: Dict[str, Any] = {
+        column.name: func.coalesce(excluded[column.name], column)
+        for column in table.columns
+        if column.name not in primary_keys and column.name not in IMPLICIT_COLUMN_NAMES
+    }
+    updated_columns[status_key] = case(
+        (excluded[status_key] == Status.PENDING.value, table.c[status_key]),
+        else_=excluded[status_key]
+    )
+    for column_name in RESTART_CLEARED_COLUMNS:
+        updated_columns[column_name] = case(
+            (excluded[status_key] == Status.IN_PROGRESS.value, None),
+            else_=updated_columns[column_name]
+        )
+    return statement.on_conflict_do_update(index_elements=list(primary_keys), set_=updated_columns)
+
+
+class TaskEventRecorder(object):
+    """
+    Buffer of task and pipeline records, which are merged by their primary keys
+
+    The buffer is flushed when its size reaches batch_size, or every flush_interval seconds
+    """
+    def __init__(self, batch_size: int, flush_interval: float, auto_flush: bool = True) -> None:
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._auto_flush = auto_flush
+        self._lock = threading.Lock()
+        self._task_records: Dict[Tuple[str, str], Dict] = {}
+        self._pipeline_records: Dict[str, Dict] = {}
+        self._flush_event = threading.Event()
+        self._flusher_pid: Optional[int] = None
+
+    def record_task(self, pipeline_id: str, task_id: str, **fields: Any) -> None:
+        with self._lock:
+            record = self._task_records.setdefault(
+                (pipeline_id, task_id),
+                {'pipeline_id': pipeline_id, 'task_id': task_id, 'celery_task_id': task_id}
+            )
+            _merge_record(record, 'task_status', fields)
+            self._after_record()
+
+    def record_pipeline(self, pipeline_id: str, **fields: Any) -> None:
+        with self._lock:
+            record = self._pipeline_records.setdefault(pipeline_id, {'pipeline_id': pipeline_id})
+            _merge_record(record, 'pipeline_status', fields)
+            self._after_record()
+
+    def _after_record(self) -> None:
+        if not self._auto_flush:
+            return
+        self._ensure_flusher()
+        if len(self._task_records) + len(self._pipeline_records) >= self._batch_size:
+            self._flush_event.set()
+
+    def _ensure_flusher(self) -> None:
+        # flusher thread doesn't survive fork, which is started for each process
+        pid = os.getpid()
+        if self._flusher_pid == pid:
+            return
+        self._flusher_pid = pid
+        threading.Thread(target=self._run_flusher, name='task-event-flusher', daemon=True).start()
+
+    def _run_flusher(self) -> None:
+        while True:
+            self._flush_event.wait(self._flush_interval)
+            self._flush_event.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        with self._lock:
+            task_records, self._task_records = list(self._task_records.values()), {}
+            pipeline_records, self._pipeline_records = list(self._pipeline_records.values()), {}
+        if not task_records and not pipeline_records:
+            return
+
+        try:
+            with managed_session() as session:
+                if pipeline_records:
+                    session.execute(
+                        _get_upsert_statement(SwishPipeline, ('pipeline_id',), 'pipeline_status'),
+                        [{column: record.get(column) for column in PIPELINE_COLUMNS} for record in pipeline_records]
+                    )
+                if task_records:
+                    session.execute(
+                        _get_upsert_statement(SwishTask, ('pipeline_id', 'task_id'), 'task_status'),
+                        [{column: record.get(column) for column in TASK_COLUMNS} for record in task_records]
+                    )
+        except Exception:  # NOQA
+            # tracking should never break the tasks
+            logger.exception(f'failed to write {len(pipeline_records)} pipeline records '
+                             f'and {len(task_records)} task records')
+
+
+RECORDER = TaskEventRecorder(
+    batch_size=settings.TASK_TRACKING_BATCH_SIZE,
+    flush_interval=settings.TASK_TRACKING_FLUSH_INTERVAL
+)
+
+
+def _now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+def _record_task_event(task_name: str, task_id: str, root_id: Optional[str], parent_id: Optional[str],
+                       task_kwargs: Optional[Dict], status: Status, **fields: Any) -> None:
+    pipeline_id = root_id or task_id
+    task_kwargs = task_kwargs or {}
+    RECORDER.record_task(
+        pipeline_id, task_id,
+        task_name=task_name,
+        parent_task_id=parent_id,
+        task_arguments=json.dumps(task_kwargs, default=str),
+        task_status=status.value,
+        **fields
+    )
+    # pipeline follows its root task
+    if pipeline_id == task_id:
+        game_date = task_kwargs.get('game_date') or task_kwargs.get('start_date') or _now().date().isoformat()
+        RECORDER.record_pipeline(
+            pipeline_id,
+            game_date=game_date,
+            league_id=task_kwargs.get('league_id', DEFAULT_LEAGUE_ID),
+            pipeline_status=status.value,
+            **fields
+        )
+
+
+def _on_task_published(sender: Optional[str] = None, headers: Optional[Dict] = None,
+                       body: Any = None, **kwargs: Any) -> None:
+    if not settings.TASK_TRACKING_ENABLED or not headers:
+        return
+    # message body of protocol v2 is (args, kwargs, embed)
+    task_kwargs = body[1] if isinstance(body, (list, tuple)) and len(body) > 1 else {}
+    _record_task_event(sender or headers.get('task', ''), headers['id'], headers.get('root_id'),
+                       headers.get('parent_id'), task_kwargs, Status.PENDING)
+
+
+def _on_task_started(task_id: str, task: Any, kwargs: Optional[Dict] = None, **_: Any) -> None:
+    if not settings.TASK_TRACKING_ENABLED:
+        return
+    _record_task_event(task.name, task_id, task.request.root_id, task.request.parent_id,
+                       kwargs, Status.IN_PROGRESS, started_time=_now())
+
+
+def _on_task_finished(task_id: str, task: Any, kwargs: Optional[Dict] = None,
+                      state: Optional[str] = None, **_: Any) -> None:
+    if not settings.TASK_TRACKING_ENABLED:
+        return
+    # retried task is published again with the same identifier, which isn't finished yet
+    if state == states.RETRY:
+        return
+    status = Status.SUCCESS if state == Status.SUCCESS.value else Status.FAILURE
+    _record_task_event(task.name, task_id, task.request.root_id, task.request.parent_id,
+                       kwargs, status, completed_time=_now())
+
+
+def _on_worker_shutdown(**_: Any) -> None:
+    RECORDER.flush()
+
+
+TASK_SIGNAL_HANDLERS = (
+    (before_task_publish, _on_task_published),
+    (task_prerun, _on_task_started),
+    (task_postrun, _on_task_finished),
+    (worker_process_shutdown, _on_worker_shutdown),
+    (worker_shutdown, _on_worker_shutdown)
+)
+
+
+@worker_init.connect
+def _on_worker_init(**_: Any) -> None:
+    """
+    Tracking only starts within workers, which are inherited by their forked pool processes,
+    so that eager tasks or publishers elsewhere never touch the database
+    """
+    if not settings.TASK_TRACKING_ENABLED:
+        return
+    prepare_models()
+    for signal, handler in TASK_SIGNAL_HANDLERS:
+        signal.connect(handler, weak=False)
+
+
+def _get_task_duration_stats_statement(since: datetime.datetime) -> Any:
+    duration = func.extract('epoch', SwishTask.completed_time - SwishTask.started_time)
+    return select(
+        SwishTask.task_name,
+        func.count().label('task_count'),
+        func.count().filter(SwishTask.task_status == Status.FAILURE.value).label('failure_count'),
+        func.avg(duration).label('avg_duration'),
+        func.percentile_cont(0.5).within_group(duration).label('p50_duration'),
+        func.percentile_cont(0.95).within_group(duration).label('p95_duration'),
+        func.percentile_cont(0.99).within_group(duration).label('p99_duration')
+    ).where(
+        SwishTask.started_time >= since,
+        SwishTask.completed_time.is_not(None)
+    ).group_by(SwishTask.task_name)
+
+
+def get_task_duration_stats(since: datetime.datetime) -> List[Dict]:
+    """
+    Throughput, failure rate and duration percentiles of each task, whose tasks started since given time
+    """
+    with managed_session() as session:
+        return [dict(row._mapping) for row in session.execute(_get_task_duration_stats_statement(since))]
@@ -0,0 +1,221 @@
+"""
+HTTP transport towards remote endpoints
+
+Each worker process holds one connection-pooled client,
+so that requests towards the same host reuse TCP and TLS connections
+"""
+import hashlib
+from http import HTTPStatus
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Protocol, Tuple, Union
+from urllib.parse import urlparse
+
+import requests
+from requests import ConnectTimeout, ReadTimeout, Response
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from swish_acquisition.conf import settings
+
+
+__all__ = ['CassetteClient', 'CassetteNotFoundError', 'get_http_client', 'reset_http_client']
+
+
+logger = logging.getLogger(__name__)
+
+
+class HTTPClient(Protocol):
+
+    def get(self, url: str, **kwargs: Any) -> Response: ...
+
+
+class HTTP2Client(object):
+    """
+    HTTP/2 client based on 'httpx', which is an optional dependency
+    its interface and exceptions are aligned with 'requests.Session'
+    """
+    def __init__(self, pool_maxsize: int, keep_alive: bool) -> None:
+        import httpx  # NOQA
+
+        self._httpx = httpx
+        limits = httpx.Limits(
+            max_connections=pool_maxsize,
+            max_keepalive_connections=pool_maxsize if keep_alive else 0
+        )
+        self._client = httpx.Client(http2=True, limits=limits)
+
+    def get(self, url: str, **kwargs: Any) -> Response:
+        timeout = kwargs.pop('timeout', None)
+        try:
+            return self._client.get(url, timeout=self._get_timeout(timeout), **kwargs)  # type: ignore[no-any-return]
+        except self._httpx.ConnectTimeout as e:
+            raise ConnectTimeout(e)
+        except self._httpx.ReadTimeout as e:
+            raise ReadTimeout(e)
+        except self._httpx.ConnectError as e:
+            raise requests.ConnectionError(e)
+
+    def _get_timeout(self, timeout: Optional[Union[float, Tuple[float, float]]]) -> Any:
+        # 'requests' accepts a (connect, read) tuple while 'httpx' doesn't
+        if isinstance(timeout, tuple):
+            connect_timeout, read_timeout = timeout
+            return self._httpx.Timeout(read_timeout, connect=connect_timeout)
+        return timeout
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class CassetteNotFoundError(LookupError):
+    """
+    No cassette is recorded for the request in replay mode
+    """
+
+
+class CassetteClient(object):
+    """
+    Record responses of remote into cassettes, or replay them without touching remote
+
+    A cassette is a JSON file located at '{directory}/{endpoint}/{digest of params}.json'
+
+    Args:
+        directory (str): where cassettes are located
+        client (HTTPClient): which requests remote in record mode, None means replay mode
+        latency (float): seconds injected into each replayed response, None means the recorded latency
+    """
+    def __init__(self, directory: str, client: Optional[HTTPClient] = None,
+                 latency: Optional[float] = None) -> None:
+        self._directory = directory
+        self._client = client
+        self._latency = latency
+
+    def get_cassette_path(self, url: str, params: Optional[Dict] = None) -> str:
+        endpoint = urlparse(url).path.strip('/').replace('/', '.') or 'index'
+        digest = hashlib.sha1(json.dumps(params or {}, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+        return os.path.join(self._directory, endpoint, f'{digest}.json')
+
+    def get(self, url: str, **kwargs: Any) -> Response:
+        path = self.get_cassette_path(url, kwargs.get('params'))
+        if self._client is None:
+            return self._replay(path)
+
+        started_time = time.monotonic()
+        response = self._client.get(url, **kwargs)
+        # responses which would be retried are never recorded, neither is 304,
+        # whose cassette would take the place of the full response to the same params
+        if response.status_code not in settings.REQUEST_RETRY_STATUS_CODES and \
+                response.status_code != HTTPStatus.NOT_MODIFIED:
+            self.save(url, kwargs.get('params'), response.status_code, response.content,
+                      dict(response.headers), time.monotonic() - started_time)
+        return response
+
+    def save(self, url: str, params: Optional[Dict], status_code: int, content: bytes,
+             headers: Optional[Dict[str, str]] = None, latency: float = 0.) -> None:
+        """
+        Record a cassette, which can be built from fixtures as well
+        """
+        path = self.get_cassette_path(url, params)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as fp:
+            json.dump({
+                'url': url,
+                'params': params,
+                'status_code': status_code,
+                'headers': headers or {},
+                'content': content.decode('utf-8'),
+                'latency': latency
+            }, fp, default=str)
+
+    def _replay(self, path: str) -> Response:
+        try:
+            with open(path, 'r') as fp:
+                cassette = json.load(fp)
+        except FileNotFoundError:
+            raise CassetteNotFoundError(f'cassette \'{path}\' is not recorded')
+
+        latency = cassette.get('latency', 0.) if self._latency is None else self._latency
+        if latency > 0:
+            time.sleep(latency)
+        response = Response()
+        response.status_code = cassette['status_code']
+        response.headers = CaseInsensitiveDict(cassette['headers'])
+        response.url = cassette['url']
+        response._content = cassette['content'].encode('utf-8')
+        return response
+
+    def close(self) -> None:
+        if self._client is not None:
+            self._client.close()  # type: ignore[attr-defined]
+
+
+def _get_requests_client() -> requests.Session:
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=settings.HTTP_POOL_CONNECTIONS,
+        pool_maxsize=settings.HTTP_POOL_MAXSIZE
+    )
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    if not settings.HTTP_KEEP_ALIVE:
+        session.headers['Connection'] = 'close'
+    return session
+
+
+def _create_http_client() -> HTTPClient:
+    if settings.HTTP_CASSETTE_MODE == 'replay':
+        return CassetteClient(settings.HTTP_CASSETTE_DIRECTORY, latency=settings.HTTP_CASSETTE_LATENCY)
+    if settings.HTTP_CASSETTE_MODE == 'record':
+        return CassetteClient(settings.HTTP_CASSETTE_DIRECTORY, client=_create_remote_client())
+    if settings.HTTP_CASSETTE_MODE is not None:
+        raise ValueError(f'Unsupported cassette mode [{settings.HTTP_CASSETTE_MODE}]')
+    return _create_remote_client()
+
+
+def _create_remote_client() -> HTTPClient:
+    if settings.HTTP2:
+        try:
+            return HTTP2Client(settings.HTTP_POOL_MAXSIZE, settings.HTTP_KEEP_ALIVE)
+        except ImportError:
+            logger.warning('\'httpx[http2]\' is not installed, fall back to HTTP/1.1')
+    return _get_requests_client()  # type: ignore[no-any-return]
+
+
+_HTTP_CLIENT: Optional[HTTPClient] = None
+_HTTP_CLIENT_PID: Optional[int] = None
+_HTTP_CLIENT_LOCK = threading.Lock()
+
+
+def get_http_client() -> HTTPClient:
+    """
+    Get the HTTP client of current process
+
+    Pooled connections can't be shared with forked child processes (e.g. Celery prefork workers),
+    so a new client would be created once the process identifier changes
+    """
+    global _HTTP_CLIENT, _HTTP_CLIENT_PID
+
+    pid = os.getpid()
+    if _HTTP_CLIENT is None or _HTTP_CLIENT_PID != pid:
+        with _HTTP_CLIENT_LOCK:
+            if _HTTP_CLIENT is None or _HTTP_CLIENT_PID != pid:
+                _HTTP_CLIENT = _create_http_client()
+                _HTTP_CLIENT_PID = pid
+    return _HTTP_CLIENT
+
+
+def reset_http_client() -> None:
+    """
+    Close pooled connections, the client would be re-created when it is used next time
+    """
+    global _HTTP_CLIENT, _HTTP_CLIENT_PID
+
+    with _HTTP_CLIENT_LOCK:
+        client, client_pid = _HTTP_CLIENT, _HTTP_CLIENT_PID
+        _HTTP_CLIENT = _HTTP_CLIENT_PID = None
+    # connections inherited from parent process should not be closed by child process
+    if client is not None and client_pid == os.getpid():
+        client.close()  # type: ignore[attr-defined]
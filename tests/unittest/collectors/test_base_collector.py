@@ -0,0 +1,53 @@
+"""
+Unittest cases for basis components of collectors
+"""
+import threading
+import time
+from unittest import TestCase
+
+from swish_acquisition.collectors.base import EndpointCollectorMixIn, run_collectors
+
+
+class MockCollector(EndpointCollectorMixIn):
+
+    lock = threading.Lock()
+    running_count = 0
+    max_running_count = 0
+
+    def __init__(self, error: bool = False) -> None:
+        self.error = error
+        self.has_run = False
+
+    def run(self, overwritten: bool = False, lazy: bool = False) -> None:  # type: ignore[override]
+        cls = self.__class__
+        with cls.lock:
+            cls.running_count += 1
+            cls.max_running_count = max(cls.max_running_count, cls.running_count)
+        time.sleep(0.01)
+        with cls.lock:
+            cls.running_count -= 1
+        self.has_run = True
+        if self.error:
+            raise ValueError('mock error')
+
+
+class RunCollectorsTestCases(TestCase):
+
+    def setUp(self) -> None:
+        MockCollector.running_count = 0
+        MockCollector.max_running_count = 0
+
+    def test_run_collectors(self):
+        collectors = [MockCollector() for _ in range(10)]
+        run_collectors(collectors, concurrency=3)
+
+        self.assertTrue(all(collector.has_run for collector in collectors))
+        self.assertLessEqual(MockCollector.max_running_count, 3)
+
+    def test_run_collectors_with_error(self):
+        collectors = [MockCollector(), MockCollector(error=True), MockCollector()]
+        with self.assertRaises(ValueError):
+            run_collectors(collectors, concurrency=1)
+
+        # failure of one collector doesn't cancel the others
+        self.assertTrue(all(collector.has_run for collector in collectors))
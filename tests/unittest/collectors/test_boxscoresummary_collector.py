@@ -60,7 +60,7 @@ class BoxscoreSummaryCollectorTestCases(TestCase):
         )
         collector.run()
 
-        mock_upload_object.assert_called_once_with(BOXSCORE_SUMMARY_V3_DATA)
+        mock_upload_object.assert_called_once_with(BOXSCORE_SUMMARY_V3_DATA, {})
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
     @patch('swish_acquisition.s3.get_s3_object_data')
@@ -83,8 +83,53 @@ class BoxscoreSummaryCollectorTestCases(TestCase):
         self.assertEqual(collector._data_dict, BOXSCORE_SUMMARY_V3_DATA)
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.is_s3_object_existed')
+    @patch('swish_acquisition.endpoints.BoxScoreSummaryV3Endpoint._send_api_request')
+    def test_run_lazily_with_local_object(self, mock_request, mock_is_object_existed,
+                                          mock_get_object, mock_upload_object):
+        mock_is_object_existed.return_value = True
+        mock_get_object.return_value = BOXSCORE_SUMMARY_V3_DATA
+
+        collector = BoxscoreSummaryCollector(
+            game_date=self.sample_date,
+            game_id=self.game_id
+        )
+        collector.run(lazy=True)
+
+        mock_get_object.assert_not_called()
+
+        # stored data is downloaded when it is asked for
+        self.assertDictEqual(collector.get_team_ids(), {'away': 1610612738, 'home': 1610612747})
+        self.assertEqual(len(collector.get_player_ids()['away']), 15)
+        mock_get_object.assert_called_once()
+        mock_request.assert_not_called()
+        mock_upload_object.assert_not_called()
+
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.is_s3_object_existed')
+    @patch('swish_acquisition.endpoints.BoxScoreSummaryV3Endpoint._send_api_request')
+    def test_run_lazily_without_local_object(self, mock_request, mock_is_object_existed, mock_upload_object):
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(BOXSCORE_SUMMARY_V3_DATA).encode('utf-8')
+        )
+        mock_is_object_existed.return_value = False
+        mock_upload_object.return_value = None
+
+        collector = BoxscoreSummaryCollector(
+            game_date=self.sample_date,
+            game_id=self.game_id
+        )
+        collector.run(lazy=True)
+
+        mock_upload_object.assert_called_once_with(BOXSCORE_SUMMARY_V3_DATA, {})
+
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
     @patch('swish_acquisition.endpoints.BoxScoreSummaryV3Endpoint._send_api_request')
-    def test_run_when_overwritten(self, mock_request, mock_upload_object):
+    def test_run_when_overwritten(self, mock_request, mock_get_object_stat, mock_upload_object):
+        mock_get_object_stat.return_value = None
         mock_request.return_value = get_mocked_response(
             HTTPStatus.OK.value,
             json.dumps(BOXSCORE_SUMMARY_V3_DATA).encode('utf-8')
@@ -97,4 +142,4 @@ class BoxscoreSummaryCollectorTestCases(TestCase):
         )
         collector.run(overwritten=True)
 
-        mock_upload_object.assert_called_once_with(BOXSCORE_SUMMARY_V3_DATA)
+        mock_upload_object.assert_called_once_with(BOXSCORE_SUMMARY_V3_DATA, {})
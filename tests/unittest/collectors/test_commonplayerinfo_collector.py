@@ -11,6 +11,8 @@ from urllib3.response import BaseHTTPResponse
 from minio import S3Error
 
 from swish_acquisition.collectors import CommonPlayerInfoCollector
+from swish_acquisition.conf import settings
+from swish_acquisition.s3 import StoredObjectStat
 from tests.utils import get_mocked_response
 
 
@@ -18,6 +20,11 @@ with open('tests/data/endpoints/commonplayerinfo/893.json', 'r') as fp:
     COMMON_PLAYER_INFO_DATA = json.load(fp)
 
 
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+@patch.object(settings, 'KNOWN_ENTITY_BACKEND', None)
 class CommonPlayerInfoCollectorTestCases(TestCase):
 
     def setUp(self):
@@ -25,7 +32,7 @@ class CommonPlayerInfoCollectorTestCases(TestCase):
         self.player_id = 893
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
-    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.get_s3_object_data_and_stat')
     @patch('swish_acquisition.endpoints.CommonPlayerInfoEndpoint._send_api_request')
     def test_run(self, mock_request,
                  mock_get_object, mock_upload_object):
@@ -57,10 +64,10 @@ class CommonPlayerInfoCollectorTestCases(TestCase):
         )
         collector.run()
 
-        mock_upload_object.assert_called_once_with(COMMON_PLAYER_INFO_DATA)
+        mock_upload_object.assert_called_once_with(COMMON_PLAYER_INFO_DATA, {})
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
-    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.get_s3_object_data_and_stat')
     @patch('swish_acquisition.endpoints.CommonPlayerInfoEndpoint._send_api_request')
     def test_run_with_local_object(self, mock_request,
                                    mock_get_object, mock_upload_object):
@@ -68,7 +75,7 @@ class CommonPlayerInfoCollectorTestCases(TestCase):
             HTTPStatus.OK.value,
             json.dumps(COMMON_PLAYER_INFO_DATA).encode('utf-8')
         )
-        mock_get_object.return_value = COMMON_PLAYER_INFO_DATA
+        mock_get_object.return_value = (COMMON_PLAYER_INFO_DATA, StoredObjectStat(last_modified=_now()))
         mock_upload_object.return_value = None
 
         collector = CommonPlayerInfoCollector(
@@ -80,8 +87,10 @@ class CommonPlayerInfoCollectorTestCases(TestCase):
         self.assertEqual(collector._data_dict, COMMON_PLAYER_INFO_DATA)
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
     @patch('swish_acquisition.endpoints.CommonPlayerInfoEndpoint._send_api_request')
-    def test_run_when_overwritten(self, mock_request, mock_upload_object):
+    def test_run_when_overwritten(self, mock_request, mock_get_object_stat, mock_upload_object):
+        mock_get_object_stat.return_value = None
         mock_request.return_value = get_mocked_response(
             HTTPStatus.OK.value,
             json.dumps(COMMON_PLAYER_INFO_DATA).encode('utf-8')
@@ -94,4 +103,14 @@ class CommonPlayerInfoCollectorTestCases(TestCase):
         )
         collector.run(overwritten=True)
 
-        mock_upload_object.assert_called_once_with(COMMON_PLAYER_INFO_DATA)
+        mock_upload_object.assert_called_once_with(COMMON_PLAYER_INFO_DATA, {})
+
+    def test_refresh_interval_by_season(self):
+        collector = CommonPlayerInfoCollector(game_date=self.sample_date, player_id=self.player_id)
+        with patch('swish_acquisition.collectors.commonplayerinfo.datetime') as mock_datetime:
+            mock_datetime.timezone = datetime.timezone
+            mock_datetime.datetime.now.return_value = datetime.datetime(2024, 1, 15)
+            self.assertEqual(collector.get_refresh_interval(), CommonPlayerInfoCollector.REFRESH_INTERVAL)
+            mock_datetime.datetime.now.return_value = datetime.datetime(2024, 8, 15)
+            self.assertEqual(collector.get_refresh_interval(),
+                             CommonPlayerInfoCollector.OFF_SEASON_REFRESH_INTERVAL)
@@ -1,6 +1,7 @@
 """
 Unittest cases for Play-by-play data collection
 """
+import copy
 import datetime
 from http import HTTPStatus
 import json
@@ -11,6 +12,8 @@ from urllib3.response import BaseHTTPResponse
 from minio import S3Error
 
 from swish_acquisition.collectors import PlayByPlayCollector
+from swish_acquisition.collectors.playbyplay import LIVE_END_PERIOD
+from swish_acquisition.s3 import StoredObjectStat
 from tests.utils import get_mocked_response
 
 
@@ -25,7 +28,7 @@ class PlayByPlayCollectorTestCases(TestCase):
         self.game_id = '0040900407'
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
-    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.get_s3_object_data_and_stat')
     @patch('swish_acquisition.endpoints.PlayByPlayV3Endpoint._send_api_request')
     def test_run(self, mock_request,
                  mock_get_object, mock_upload_object):
@@ -60,10 +63,10 @@ class PlayByPlayCollectorTestCases(TestCase):
         )
         collector.run()
 
-        mock_upload_object.assert_called_once_with(PLAYBYPLAY_V3_DATA)
+        mock_upload_object.assert_called_once_with(PLAYBYPLAY_V3_DATA, {})
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
-    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.get_s3_object_data_and_stat')
     @patch('swish_acquisition.endpoints.PlayByPlayV3Endpoint._send_api_request')
     def test_run_with_local_object(self, mock_request,
                                    mock_get_object, mock_upload_object):
@@ -71,7 +74,7 @@ class PlayByPlayCollectorTestCases(TestCase):
             HTTPStatus.OK.value,
             json.dumps(PLAYBYPLAY_V3_DATA).encode('utf-8')
         )
-        mock_get_object.return_value = PLAYBYPLAY_V3_DATA
+        mock_get_object.return_value = (PLAYBYPLAY_V3_DATA, StoredObjectStat(last_modified=None))
         mock_upload_object.return_value = None
 
         collector = PlayByPlayCollector(
@@ -81,10 +84,45 @@ class PlayByPlayCollectorTestCases(TestCase):
         collector.run()
 
         self.assertEqual(collector._data_dict, PLAYBYPLAY_V3_DATA)
+        mock_request.assert_not_called()
+
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_data_and_stat')
+    @patch('swish_acquisition.endpoints.PlayByPlayV3Endpoint._send_api_request')
+    def test_run_with_partial_object(self, mock_request, mock_get_object, mock_upload_object):
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(PLAYBYPLAY_V3_DATA).encode('utf-8')
+        )
+        mock_get_object.return_value = (
+            self._get_partial_data(2),
+            StoredObjectStat(last_modified=None, metadata={'partial': 'true'})
+        )
+
+        collector = PlayByPlayCollector(game_date=self.sample_date, game_id=self.game_id)
+        collector.run()
+
+        # stored while the game was live, which is collected in whole and no longer partial
+        mock_request.assert_called_once()
+        mock_upload_object.assert_called_once_with(PLAYBYPLAY_V3_DATA, {})
+        self.assertEqual(collector._data_dict, PLAYBYPLAY_V3_DATA)
+
+    @patch('swish_acquisition.s3.get_s3_object_stat')
+    def test_is_collected(self, mock_get_object_stat):
+        collector = PlayByPlayCollector(game_date=self.sample_date, game_id=self.game_id)
+
+        mock_get_object_stat.return_value = None
+        self.assertFalse(collector.is_collected())
+        mock_get_object_stat.return_value = StoredObjectStat(last_modified=None, metadata={'partial': 'true'})
+        self.assertFalse(collector.is_collected())
+        mock_get_object_stat.return_value = StoredObjectStat(last_modified=None)
+        self.assertTrue(collector.is_collected())
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
     @patch('swish_acquisition.endpoints.PlayByPlayV3Endpoint._send_api_request')
-    def test_run_when_overwritten(self, mock_request, mock_upload_object):
+    def test_run_when_overwritten(self, mock_request, mock_get_object_stat, mock_upload_object):
+        mock_get_object_stat.return_value = None
         mock_request.return_value = get_mocked_response(
             HTTPStatus.OK.value,
             json.dumps(PLAYBYPLAY_V3_DATA).encode('utf-8')
@@ -97,4 +135,80 @@ class PlayByPlayCollectorTestCases(TestCase):
         )
         collector.run(overwritten=True)
 
-        mock_upload_object.assert_called_once_with(PLAYBYPLAY_V3_DATA)
+        mock_upload_object.assert_called_once_with(PLAYBYPLAY_V3_DATA, {})
+
+    def _get_partial_data(self, period):
+        data = copy.deepcopy(PLAYBYPLAY_V3_DATA)
+        data['game']['actions'] = [action for action in data['game']['actions'] if action['period'] <= period]
+        return data
+
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.endpoints.PlayByPlayV3Endpoint._send_api_request')
+    def test_merge_live_actions(self, mock_request, mock_get_object, mock_upload_object):
+        stored_data = self._get_partial_data(2)
+        stored_count = len(stored_data['game']['actions'])
+        mock_get_object.return_value = stored_data
+        # periods since the latest stored one are responded
+        delta_data = copy.deepcopy(PLAYBYPLAY_V3_DATA)
+        delta_data['game']['actions'] = [
+            action for action in delta_data['game']['actions'] if action['period'] >= 2
+        ]
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(delta_data).encode('utf-8')
+        )
+
+        collector = PlayByPlayCollector(game_date=self.sample_date, game_id=self.game_id)
+        merged_count = collector.merge_live_actions()
+
+        self.assertEqual(merged_count, len(PLAYBYPLAY_V3_DATA['game']['actions']) - stored_count)
+        self.assertEqual(mock_request.call_args.kwargs['params']['StartPeriod'], 2)
+        self.assertEqual(mock_request.call_args.kwargs['params']['EndPeriod'], LIVE_END_PERIOD)
+        mock_upload_object.assert_called_once_with(PLAYBYPLAY_V3_DATA, partial=True)
+        self.assertEqual(collector._data_dict, PLAYBYPLAY_V3_DATA)
+
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.endpoints.PlayByPlayV3Endpoint._send_api_request')
+    def test_merge_live_actions_without_new_actions(self, mock_request, mock_get_object, mock_upload_object):
+        mock_get_object.return_value = PLAYBYPLAY_V3_DATA
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(self._get_partial_data(4)).encode('utf-8')
+        )
+
+        collector = PlayByPlayCollector(game_date=self.sample_date, game_id=self.game_id)
+
+        self.assertEqual(collector.merge_live_actions(), 0)
+        mock_upload_object.assert_not_called()
+
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.endpoints.PlayByPlayV3Endpoint._send_api_request')
+    def test_merge_live_actions_without_stored_object(self, mock_request, mock_get_object, mock_upload_object):
+        mock_get_object.side_effect = S3Error(
+            code='NoSuchKey',
+            message='The specified key does not exist.',
+            resource='/playbyplay/2010/06/17/0040900407.json',
+            request_id='MOCKREQUESTID',
+            host_id='mockhostid',
+            response=BaseHTTPResponse(
+                status=HTTPStatus.NOT_FOUND.value,
+                version=1,
+                reason=None,
+                decode_content=False,
+                request_url=None
+            )
+        )
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(PLAYBYPLAY_V3_DATA).encode('utf-8')
+        )
+
+        collector = PlayByPlayCollector(game_date=self.sample_date, game_id=self.game_id)
+
+        self.assertEqual(collector.merge_live_actions(), len(PLAYBYPLAY_V3_DATA['game']['actions']))
+        # the whole game is requested
+        self.assertEqual(mock_request.call_args.kwargs['params']['StartPeriod'], 0)
+        mock_upload_object.assert_called_once_with(PLAYBYPLAY_V3_DATA, partial=True)
@@ -56,7 +56,7 @@ class ScoreboardCollectorTestCases(TestCase):
         collector = ScoreboardCollector(game_date=self.sample_date, league_id=self.league_id)
         collector.run()
 
-        mock_upload_object.assert_called_once_with(SCOREBOARD_V3_DATA)
+        mock_upload_object.assert_called_once_with(SCOREBOARD_V3_DATA, {})
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
     @patch('swish_acquisition.s3.get_s3_object_data')
@@ -76,8 +76,10 @@ class ScoreboardCollectorTestCases(TestCase):
         self.assertEqual(collector._data_dict, SCOREBOARD_V3_DATA)
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
     @patch('swish_acquisition.endpoints.ScoreboardV3Endpoint._send_api_request')
-    def test_run_when_overwritten(self, mock_request, mock_upload_object):
+    def test_run_when_overwritten(self, mock_request, mock_get_object_stat, mock_upload_object):
+        mock_get_object_stat.return_value = None
         mock_request.return_value = get_mocked_response(
             HTTPStatus.OK.value,
             json.dumps(SCOREBOARD_V3_DATA).encode('utf-8')
@@ -87,4 +89,4 @@ class ScoreboardCollectorTestCases(TestCase):
         collector = ScoreboardCollector(game_date=self.sample_date, league_id=self.league_id)
         collector.run(overwritten=True)
 
-        mock_upload_object.assert_called_once_with(SCOREBOARD_V3_DATA)
+        mock_upload_object.assert_called_once_with(SCOREBOARD_V3_DATA, {})
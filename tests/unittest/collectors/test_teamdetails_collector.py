@@ -11,6 +11,10 @@ from urllib3.response import BaseHTTPResponse
 from minio import S3Error
 
 from swish_acquisition.collectors import TeamDetailsCollector
+from swish_acquisition.conf import settings
+from swish_acquisition.entity_index import KnownEntityIndex
+from swish_acquisition.s3 import StoredObjectStat
+from swish_acquisition.shared_state import MemorySharedState
 from tests.utils import get_mocked_response
 
 
@@ -18,6 +22,11 @@ with open('tests/data/endpoints/teamdetails/1610612741.json', 'r') as fp:
     TEAM_DETAILS_DATA = json.load(fp)
 
 
+def _now():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+@patch.object(settings, 'KNOWN_ENTITY_BACKEND', None)
 class TeamDetailsCollectorTestCases(TestCase):
 
     def setUp(self):
@@ -25,7 +34,7 @@ class TeamDetailsCollectorTestCases(TestCase):
         self.team_id = '1610612741'
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
-    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.get_s3_object_data_and_stat')
     @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
     def test_run(self, mock_request,
                  mock_get_object, mock_upload_object):
@@ -54,10 +63,10 @@ class TeamDetailsCollectorTestCases(TestCase):
         collector = TeamDetailsCollector(game_date=self.sample_date, team_id=self.team_id)
         collector.run()
 
-        mock_upload_object.assert_called_once_with(TEAM_DETAILS_DATA)
+        mock_upload_object.assert_called_once_with(TEAM_DETAILS_DATA, {})
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
-    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.get_s3_object_data_and_stat')
     @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
     def test_run_with_local_object(self, mock_request,
                                    mock_get_object, mock_upload_object):
@@ -65,7 +74,7 @@ class TeamDetailsCollectorTestCases(TestCase):
             HTTPStatus.OK.value,
             json.dumps(TEAM_DETAILS_DATA).encode('utf-8')
         )
-        mock_get_object.return_value = TEAM_DETAILS_DATA
+        mock_get_object.return_value = (TEAM_DETAILS_DATA, StoredObjectStat(last_modified=_now()))
         mock_upload_object.return_value = None
 
         collector = TeamDetailsCollector(game_date=self.sample_date, team_id=self.team_id)
@@ -74,8 +83,10 @@ class TeamDetailsCollectorTestCases(TestCase):
         self.assertEqual(collector._data_dict, TEAM_DETAILS_DATA)
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
     @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
-    def test_run_when_overwritten(self, mock_request, mock_upload_object):
+    def test_run_when_overwritten(self, mock_request, mock_get_object_stat, mock_upload_object):
+        mock_get_object_stat.return_value = None
         mock_request.return_value = get_mocked_response(
             HTTPStatus.OK.value,
             json.dumps(TEAM_DETAILS_DATA).encode('utf-8')
@@ -85,4 +96,121 @@ class TeamDetailsCollectorTestCases(TestCase):
         collector = TeamDetailsCollector(game_date=self.sample_date, team_id=self.team_id)
         collector.run(overwritten=True)
 
-        mock_upload_object.assert_called_once_with(TEAM_DETAILS_DATA)
+        mock_upload_object.assert_called_once_with(TEAM_DETAILS_DATA, {})
+
+    @patch('swish_acquisition.collectors.base.get_known_entity_index')
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
+    @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
+    def test_run_lazily_with_known_entity_index(self, mock_request, mock_get_object_stat,
+                                                mock_upload_object, mock_get_known_entity_index):
+        mock_get_known_entity_index.return_value = KnownEntityIndex(
+            name='teamdetails', ttl=TeamDetailsCollector.REFRESH_INTERVAL, shared_state=MemorySharedState()
+        )
+        mock_get_object_stat.return_value = StoredObjectStat(last_modified=_now())
+
+        # 01. the stored object is checked at the first time, then it is known
+        TeamDetailsCollector(game_date=self.sample_date, team_id=self.team_id).run(lazy=True)
+        self.assertEqual(mock_get_object_stat.call_count, 1)
+
+        # 02. known entity skips the check
+        TeamDetailsCollector(game_date=self.sample_date, team_id=self.team_id).run(lazy=True)
+        self.assertEqual(mock_get_object_stat.call_count, 1)
+        mock_get_known_entity_index.assert_called_with('teamdetails', TeamDetailsCollector.REFRESH_INTERVAL)
+        mock_request.assert_not_called()
+        mock_upload_object.assert_not_called()
+
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
+    @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
+    def test_run_lazily_with_refresh_policy(self, mock_request, mock_get_object_stat,
+                                            mock_get_object, mock_upload_object):
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(TEAM_DETAILS_DATA).encode('utf-8')
+        )
+        mock_get_object.return_value = TEAM_DETAILS_DATA
+        refresh_interval = datetime.timedelta(seconds=TeamDetailsCollector.REFRESH_INTERVAL)
+
+        # 01. fresh object is used
+        mock_get_object_stat.return_value = StoredObjectStat(
+            last_modified=_now() - refresh_interval + datetime.timedelta(hours=1)
+        )
+        collector = TeamDetailsCollector(game_date=self.sample_date, team_id=self.team_id)
+        collector.run(lazy=True)
+        self.assertDictEqual(collector.get_dict(), TEAM_DETAILS_DATA)
+        mock_request.assert_not_called()
+        mock_upload_object.assert_not_called()
+
+        # 02. stale object is collected again
+        mock_get_object_stat.return_value = StoredObjectStat(last_modified=_now() - refresh_interval)
+        TeamDetailsCollector(game_date=self.sample_date, team_id=self.team_id).run(lazy=True)
+        self.assertEqual(mock_request.call_count, 1)
+        mock_upload_object.assert_called_once_with(TEAM_DETAILS_DATA, {})
+
+        # 03. missing object is collected
+        mock_get_object_stat.return_value = None
+        TeamDetailsCollector(game_date=self.sample_date, team_id=self.team_id).run(lazy=True)
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_upload_object.call_count, 2)
+
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_data_and_stat')
+    @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
+    def test_run_with_stale_local_object(self, mock_request, mock_get_object, mock_upload_object):
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(TEAM_DETAILS_DATA).encode('utf-8')
+        )
+        mock_get_object.return_value = (
+            {},
+            StoredObjectStat(last_modified=_now() - datetime.timedelta(days=8))
+        )
+
+        collector = TeamDetailsCollector(game_date=self.sample_date, team_id=self.team_id)
+        collector.run()
+
+        # the object is downloaded along with its metadata at once
+        mock_get_object.assert_called_once_with('teamdetails', f'/{self.team_id}.json')
+        mock_upload_object.assert_called_once_with(TEAM_DETAILS_DATA, {})
+        self.assertDictEqual(collector.get_dict(), TEAM_DETAILS_DATA)
+
+    @patch('swish_acquisition.s3.S3MixIn.renew_object')
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
+    @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
+    def test_run_conditionally(self, mock_request, mock_get_object_stat, mock_get_object,
+                               mock_upload_object, mock_renew_object):
+        stale_stat = StoredObjectStat(
+            last_modified=_now() - datetime.timedelta(days=8),
+            metadata={'upstream-etag': '"abc"'}
+        )
+        mock_get_object_stat.return_value = stale_stat
+        mock_get_object.return_value = TEAM_DETAILS_DATA
+
+        # 01. not modified, the stored copy is kept and renewed
+        mock_request.return_value = get_mocked_response(HTTPStatus.NOT_MODIFIED.value, b'')
+        collector = TeamDetailsCollector(game_date=self.sample_date, team_id=self.team_id)
+        collector.run(lazy=True)
+        self.assertEqual(mock_request.call_args.kwargs['headers']['if-none-match'], '"abc"')
+        mock_renew_object.assert_called_once_with(stale_stat)
+        mock_upload_object.assert_not_called()
+        self.assertDictEqual(collector.get_dict(), TEAM_DETAILS_DATA)
+
+        # 02. modified, along with its new validators
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(TEAM_DETAILS_DATA).encode('utf-8'),
+            headers={'ETag': '"def"'}
+        )
+        TeamDetailsCollector(game_date=self.sample_date, team_id=self.team_id).run(overwritten=True)
+        self.assertEqual(mock_request.call_args.kwargs['headers']['if-none-match'], '"abc"')
+        mock_upload_object.assert_called_once_with(TEAM_DETAILS_DATA, {'etag': '"def"'})
+
+        # 03. disabled
+        with patch.object(settings, 'CONDITIONAL_REQUEST_ENABLED', False):
+            TeamDetailsCollector(game_date=self.sample_date, team_id=self.team_id).run(overwritten=True)
+        self.assertNotIn('if-none-match', mock_request.call_args.kwargs['headers'])
+        self.assertEqual(mock_renew_object.call_count, 1)
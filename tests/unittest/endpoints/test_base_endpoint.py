@@ -0,0 +1,84 @@
+"""
+Unittest cases for basis components of endpoints
+"""
+import datetime
+from email.utils import format_datetime
+from http import HTTPStatus
+import json
+from unittest import TestCase
+from unittest.mock import patch
+
+from requests import ReadTimeout
+
+from swish_acquisition.conf import settings
+from swish_acquisition.endpoints import TeamDetailsEndpoint
+from swish_acquisition.endpoints.base import EndpointRequestError, get_retry_delay
+from tests.utils import get_mocked_response
+
+
+with open('tests/data/endpoints/teamdetails/1610612741.json', 'r') as fp:
+    TEAM_DETAILS_DATA = json.load(fp)
+
+
+@patch.object(settings, 'REQUEST_MAX_RETRIES', 2)
+@patch('swish_acquisition.endpoints.base.time.sleep')
+@patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
+class EndpointRequestRetryTestCases(TestCase):
+
+    def setUp(self):
+        self.endpoint = TeamDetailsEndpoint(game_date=datetime.date(2022, 5, 29), team_id=1610612741)
+        self.ok_response = get_mocked_response(HTTPStatus.OK.value, json.dumps(TEAM_DETAILS_DATA).encode('utf-8'))
+
+    def test_retried_until_succeeded(self, mock_request, mock_sleep):
+        mock_request.side_effect = [
+            ReadTimeout('read timed out'),
+            get_mocked_response(HTTPStatus.TOO_MANY_REQUESTS.value, b'', headers={'Retry-After': '7'}),
+            self.ok_response
+        ]
+        self.assertDictEqual(self.endpoint.get_dict(), TEAM_DETAILS_DATA)
+        self.assertEqual(mock_request.call_count, 3)
+        # 'Retry-After' is honored
+        self.assertEqual(mock_sleep.call_args_list[1].args, (7.,))
+
+    def test_retries_exhausted(self, mock_request, mock_sleep):
+        mock_request.return_value = get_mocked_response(HTTPStatus.SERVICE_UNAVAILABLE.value, b'')
+        with self.assertRaises(EndpointRequestError) as cm:
+            self.endpoint.get_dict()
+        self.assertEqual(cm.exception.status_code, HTTPStatus.SERVICE_UNAVAILABLE.value)
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(mock_sleep.call_count, 2)
+        # nothing is cached as the data
+        self.assertFalse(self.endpoint._is_data_loaded)
+
+    def test_not_retried_status_code(self, mock_request, mock_sleep):
+        mock_request.return_value = get_mocked_response(HTTPStatus.NOT_FOUND.value, b'')
+        with self.assertRaises(EndpointRequestError) as cm:
+            self.endpoint.request()
+        self.assertEqual(cm.exception.status_code, HTTPStatus.NOT_FOUND.value)
+        self.assertEqual(mock_request.call_count, 1)
+        mock_sleep.assert_not_called()
+
+    def test_empty_response(self, mock_request, mock_sleep):
+        mock_request.return_value = get_mocked_response(HTTPStatus.OK.value, b'{}')
+        with self.assertRaises(EndpointRequestError):
+            self.endpoint.get_dict()
+        self.assertFalse(self.endpoint._is_data_loaded)
+
+
+@patch.object(settings, 'REQUEST_RETRY_BACKOFF_FACTOR', 1)
+@patch.object(settings, 'REQUEST_RETRY_BACKOFF_MAX', 30)
+class RetryDelayTestCases(TestCase):
+
+    def test_exponential_backoff_with_jitter(self):
+        for attempt, upper_limit in ((1, 1), (3, 4), (10, 30)):
+            for _ in range(20):
+                self.assertTrue(0 <= get_retry_delay(attempt) <= upper_limit)
+
+    def test_retry_after(self):
+        response = get_mocked_response(HTTPStatus.TOO_MANY_REQUESTS.value, b'', headers={'Retry-After': '120'})
+        self.assertEqual(get_retry_delay(1, response), 30)
+
+        retry_time = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=10)
+        response = get_mocked_response(HTTPStatus.TOO_MANY_REQUESTS.value, b'',
+                                       headers={'Retry-After': format_datetime(retry_time, usegmt=True)})
+        self.assertTrue(8 <= get_retry_delay(1, response) <= 10)
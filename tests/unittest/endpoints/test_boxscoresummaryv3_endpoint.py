@@ -12,7 +12,9 @@ from tests.utils import (
     get_mocked_response
 )
 
+from swish_acquisition.endpoints.base import EndpointRequestError
 from swish_acquisition.endpoints.boxscoresummaryv3 import BoxScoreSummaryV3Endpoint
+from swish_acquisition.scheme.endpoints import BoxScoreSummaryV3, BoxScoreSummaryV3Ids
 
 
 with open('tests/data/endpoints/boxscoresummaryv3/0040900407.json', 'r') as fp:
@@ -58,26 +60,85 @@ class BoxScoreSummaryV3EndpointTestCases(TestCase):
 
         self.assertEqual(dm.boxScoreSummary.gameId, self.sample_game_id)
 
+    @patch('swish_acquisition.endpoints.base.construct_model')
+    def test_get_stored_data(self, mock_construct_model):
+        # pydantic validates nested models faster than they are constructed in Python
+        endpoint = BoxScoreSummaryV3Endpoint(game_date=self.sample_date, game_id=self.sample_game_id)
+        endpoint._set_data_loader(lambda: BOXSCORE_SUMMARY_V3_DATA)
+        self.assertEqual(endpoint.get_data().boxScoreSummary.gameId, self.sample_game_id)
+        mock_construct_model.assert_not_called()
+
     @patch('swish_acquisition.endpoints.BoxScoreSummaryV3Endpoint._send_api_request')
-    def test_request_failed(self, mock_request):
-        mock_request.return_value = get_mocked_error_response()
+    def test_get_data_memoized(self, mock_request):
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(BOXSCORE_SUMMARY_V3_DATA).encode('utf-8')
+        )
         params = {
             'game_date': self.sample_date,
             'game_id': self.sample_game_id
         }
         endpoint = BoxScoreSummaryV3Endpoint(**params)
-        response = endpoint.request()
+        with patch.object(BoxScoreSummaryV3, 'model_validate', wraps=BoxScoreSummaryV3.model_validate) as mock_validate:
+            dm = endpoint.get_data()
+            endpoint.get_data()
 
-        self.assertIsNone(response)
+            mock_validate.assert_called_once()
+
+            # cache is invalidated when data dict is replaced
+            self.assertIsNot(endpoint.get_data(overwritten=True), dm)
+            self.assertEqual(mock_validate.call_count, 2)
+
+            endpoint._set_data_dict(BOXSCORE_SUMMARY_V3_DATA)
+            endpoint.get_data()
+            self.assertEqual(mock_validate.call_count, 3)
 
     @patch('swish_acquisition.endpoints.BoxScoreSummaryV3Endpoint._send_api_request')
-    def test_get_data_with_failed_request(self, mock_request):
+    def test_get_ids_by_projection(self, mock_request):
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(BOXSCORE_SUMMARY_V3_DATA).encode('utf-8')
+        )
+        endpoint = BoxScoreSummaryV3Endpoint(game_date=self.sample_date, game_id=self.sample_game_id)
+        with patch.object(BoxScoreSummaryV3, 'model_validate') as mock_validate, \
+                patch.object(BoxScoreSummaryV3Ids, 'model_validate',
+                             wraps=BoxScoreSummaryV3Ids.model_validate) as mock_validate_ids:
+            self.assertDictEqual(endpoint.get_team_ids(), {'away': 1610612738, 'home': 1610612747})
+            player_ids = endpoint.get_player_ids()
+            # the whole document is never validated, and the projection is parsed once
+            mock_validate.assert_not_called()
+            mock_validate_ids.assert_called_once()
+
+            endpoint._set_data_dict(BOXSCORE_SUMMARY_V3_DATA)
+            endpoint.get_team_ids()
+            self.assertEqual(mock_validate_ids.call_count, 2)
+
+        dm = endpoint.get_data()
+        self.assertListEqual(player_ids['home'], sorted(
+            [player.personId for player in dm.boxScoreSummary.homeTeam.players] +
+            [player.personId for player in dm.boxScoreSummary.homeTeam.inactives]
+        ))
+
+    @patch('swish_acquisition.endpoints.base.time.sleep')
+    @patch('swish_acquisition.endpoints.BoxScoreSummaryV3Endpoint._send_api_request')
+    def test_request_failed(self, mock_request, mock_sleep):
         mock_request.return_value = get_mocked_error_response()
         params = {
             'game_date': self.sample_date,
             'game_id': self.sample_game_id
         }
         endpoint = BoxScoreSummaryV3Endpoint(**params)
-        dm = endpoint.get_data()
+        with self.assertRaises(EndpointRequestError):
+            endpoint.request()
 
-        self.assertIsNone(dm)
+    @patch('swish_acquisition.endpoints.base.time.sleep')
+    @patch('swish_acquisition.endpoints.BoxScoreSummaryV3Endpoint._send_api_request')
+    def test_get_data_with_failed_request(self, mock_request, mock_sleep):
+        mock_request.return_value = get_mocked_error_response()
+        params = {
+            'game_date': self.sample_date,
+            'game_id': self.sample_game_id
+        }
+        endpoint = BoxScoreSummaryV3Endpoint(**params)
+        with self.assertRaises(EndpointRequestError):
+            endpoint.get_data()
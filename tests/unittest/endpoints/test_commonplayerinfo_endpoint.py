@@ -12,6 +12,7 @@ from tests.utils import (
     get_mocked_response
 )
 
+from swish_acquisition.endpoints.base import EndpointRequestError
 from swish_acquisition.endpoints.commonplayerinfo import CommonPlayerInfoEndpoint
 
 
@@ -56,18 +57,18 @@ class CommonPlayerInfoEndpointTestCases(TestCase):
         common_player_info, *_ = common_player_info_result_set.rowSet
         self.assertEqual(common_player_info.PERSON_ID, self.sample_player_id)
 
+    @patch('swish_acquisition.endpoints.base.time.sleep')
     @patch('swish_acquisition.endpoints.CommonPlayerInfoEndpoint._send_api_request')
-    def test_request_failed(self, mock_request):
+    def test_request_failed(self, mock_request, mock_sleep):
         mock_request.return_value = get_mocked_error_response()
         endpoint = CommonPlayerInfoEndpoint(**self.sample_params)
-        response = endpoint.request()
-
-        self.assertIsNone(response)
+        with self.assertRaises(EndpointRequestError):
+            endpoint.request()
 
+    @patch('swish_acquisition.endpoints.base.time.sleep')
     @patch('swish_acquisition.endpoints.CommonPlayerInfoEndpoint._send_api_request')
-    def test_get_data_with_failed_request(self, mock_request):
+    def test_get_data_with_failed_request(self, mock_request, mock_sleep):
         mock_request.return_value = get_mocked_error_response()
         endpoint = CommonPlayerInfoEndpoint(**self.sample_params)
-        dm = endpoint.get_data()
-
-        self.assertIsNone(dm)
+        with self.assertRaises(EndpointRequestError):
+            endpoint.get_data()
@@ -12,6 +12,7 @@ from tests.utils import (
     get_mocked_response
 )
 
+from swish_acquisition.endpoints.base import EndpointRequestError
 from swish_acquisition.endpoints.playbyplayv3 import PlayByPlayV3Endpoint
 
 
@@ -58,26 +59,38 @@ class PlayByPlayV3EndpointTestCases(TestCase):
 
         self.assertEqual(dm.game.gameId, self.sample_game_id)
 
+    @patch('swish_acquisition.endpoints.base.time.sleep')
     @patch('swish_acquisition.endpoints.PlayByPlayV3Endpoint._send_api_request')
-    def test_request_failed(self, mock_request):
+    def test_request_failed(self, mock_request, mock_sleep):
         mock_request.return_value = get_mocked_error_response()
         params = {
             'game_date': self.sample_date,
             'game_id': self.sample_game_id
         }
         endpoint = PlayByPlayV3Endpoint(**params)
-        response = endpoint.request()
-
-        self.assertIsNone(response)
+        with self.assertRaises(EndpointRequestError):
+            endpoint.request()
 
+    @patch('swish_acquisition.endpoints.base.time.sleep')
     @patch('swish_acquisition.endpoints.PlayByPlayV3Endpoint._send_api_request')
-    def test_get_data_with_failed_request(self, mock_request):
+    def test_get_data_with_failed_request(self, mock_request, mock_sleep):
         mock_request.return_value = get_mocked_error_response()
         params = {
             'game_date': self.sample_date,
             'game_id': self.sample_game_id
         }
         endpoint = PlayByPlayV3Endpoint(**params)
-        dm = endpoint.get_data()
+        with self.assertRaises(EndpointRequestError):
+            endpoint.get_data()
+
+    @patch('swish_acquisition.endpoints.PlayByPlayV3Endpoint._send_api_request')
+    def test_get_columns(self, mock_request):
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(PLAYBYPLAY_V3_DATA).encode('utf-8')
+        )
+        endpoint = PlayByPlayV3Endpoint(game_date=self.sample_date, game_id=self.sample_game_id)
+        columns = endpoint.get_columns()
 
-        self.assertIsNone(dm)
+        self.assertEqual(len(columns), len(PLAYBYPLAY_V3_DATA['game']['actions']))
+        self.assertListEqual(list(columns), endpoint.get_data().game.actions)
@@ -12,6 +12,7 @@ from tests.utils import (
     get_mocked_response
 )
 
+from swish_acquisition.endpoints.base import EndpointRequestError
 from swish_acquisition.endpoints.scoreboardv3 import ScoreboardV3Endpoint
 
 
@@ -60,25 +61,40 @@ class ScoreboardV3EndpointTestCases(TestCase):
         self.assertEqual(dm.scoreboard.leagueId, '00')
 
     @patch('swish_acquisition.endpoints.ScoreboardV3Endpoint._send_api_request')
-    def test_request_failed(self, mock_request):
-        mock_request.return_value = get_mocked_error_response()
+    def test_get_game_ids(self, mock_request):
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(SCOREBOARD_V3_DATA).encode('utf-8')
+        )
         params = {
             'game_date': self.sample_date,
             'league_id': self.league_id
         }
         endpoint = ScoreboardV3Endpoint(**params)
-        response = endpoint.request()
 
-        self.assertIsNone(response)
+        self.assertListEqual(endpoint.get_game_ids(), ['0042100307'])
+        self.assertDictEqual(endpoint.get_game_statuses(), {'0042100307': 3})
 
+    @patch('swish_acquisition.endpoints.base.time.sleep')
     @patch('swish_acquisition.endpoints.ScoreboardV3Endpoint._send_api_request')
-    def test_get_data_with_failed_request(self, mock_request):
+    def test_request_failed(self, mock_request, mock_sleep):
         mock_request.return_value = get_mocked_error_response()
         params = {
             'game_date': self.sample_date,
             'league_id': self.league_id
         }
         endpoint = ScoreboardV3Endpoint(**params)
-        dm = endpoint.get_data()
+        with self.assertRaises(EndpointRequestError):
+            endpoint.request()
 
-        self.assertIsNone(dm)
+    @patch('swish_acquisition.endpoints.base.time.sleep')
+    @patch('swish_acquisition.endpoints.ScoreboardV3Endpoint._send_api_request')
+    def test_get_data_with_failed_request(self, mock_request, mock_sleep):
+        mock_request.return_value = get_mocked_error_response()
+        params = {
+            'game_date': self.sample_date,
+            'league_id': self.league_id
+        }
+        endpoint = ScoreboardV3Endpoint(**params)
+        with self.assertRaises(EndpointRequestError):
+            endpoint.get_data()
@@ -12,6 +12,8 @@ from tests.utils import (
     get_mocked_response
 )
 
+from swish_acquisition.conf import settings
+from swish_acquisition.endpoints.base import EndpointRequestError
 from swish_acquisition.endpoints.teamdetails import TeamDetailsEndpoint
 
 
@@ -60,26 +62,81 @@ class TeamDetailsEndpointTestCases(TestCase):
         team_background, *_ = team_background_result_set.rowSet
         self.assertEqual(team_background.TEAM_ID, self.sample_team_id)
 
+    @patch('swish_acquisition.endpoints.base.construct_model')
     @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
-    def test_request_failed(self, mock_request):
+    def test_get_trusted_data(self, mock_request, mock_construct_model):
+        endpoint = TeamDetailsEndpoint(game_date=self.sample_date, team_id=self.sample_team_id)
+
+        # 01. data from our own bucket is constructed without validation
+        endpoint._set_data_loader(lambda: TEAM_DETAILS_DATA)
+        self.assertIs(endpoint.get_data(), mock_construct_model.return_value)
+        mock_construct_model.assert_called_once_with(endpoint.DATA_MODEL, TEAM_DETAILS_DATA)
+        mock_request.assert_not_called()
+
+        # 02. trusted load is disabled
+        endpoint._set_data_dict(TEAM_DETAILS_DATA, trusted=True)
+        with patch.object(settings, 'TRUSTED_LOAD_ENABLED', False):
+            self.assertIsInstance(endpoint.get_data(), endpoint.DATA_MODEL)
+        self.assertEqual(mock_construct_model.call_count, 1)
+
+        # 03. fresh upstream payload is always validated
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(TEAM_DETAILS_DATA).encode('utf-8')
+        )
+        self.assertIsInstance(endpoint.get_data(overwritten=True), endpoint.DATA_MODEL)
+        self.assertEqual(mock_construct_model.call_count, 1)
+
+    @patch('swish_acquisition.endpoints.base.time.sleep')
+    @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
+    def test_request_failed(self, mock_request, mock_sleep):
         mock_request.return_value = get_mocked_error_response()
         params = {
             'game_date': self.sample_date,
             'team_id': self.sample_team_id
         }
         endpoint = TeamDetailsEndpoint(**params)
-        response = endpoint.request()
-
-        self.assertIsNone(response)
+        with self.assertRaises(EndpointRequestError):
+            endpoint.request()
 
+    @patch('swish_acquisition.endpoints.base.time.sleep')
     @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
-    def test_get_data_with_failed_request(self, mock_request):
+    def test_get_data_with_failed_request(self, mock_request, mock_sleep):
         mock_request.return_value = get_mocked_error_response()
         params = {
             'game_date': self.sample_date,
             'team_id': self.sample_team_id
         }
         endpoint = TeamDetailsEndpoint(**params)
-        dm = endpoint.get_data()
+        with self.assertRaises(EndpointRequestError):
+            endpoint.get_data()
 
-        self.assertIsNone(dm)
+    @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
+    def test_get_modified_dict(self, mock_request):
+        validators = {'etag': '"abc"', 'last-modified': 'Mon, 25 Dec 2023 08:00:00 GMT'}
+        endpoint = TeamDetailsEndpoint(game_date=self.sample_date, team_id=self.sample_team_id)
+
+        # 01. not modified
+        mock_request.return_value = get_mocked_response(HTTPStatus.NOT_MODIFIED.value, b'')
+        self.assertIsNone(endpoint.get_modified_dict(validators))
+        headers = mock_request.call_args.kwargs['headers']
+        self.assertEqual(headers['if-none-match'], '"abc"')
+        self.assertEqual(headers['if-modified-since'], 'Mon, 25 Dec 2023 08:00:00 GMT')
+
+        # 02. modified, whose validators are kept along with the data
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(TEAM_DETAILS_DATA).encode('utf-8'),
+            headers={'ETag': '"def"', 'Content-Type': 'application/json'}
+        )
+        self.assertDictEqual(endpoint.get_modified_dict(validators), TEAM_DETAILS_DATA)
+        self.assertDictEqual(endpoint.get_validators(), {'etag': '"def"'})
+
+    @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
+    def test_not_modified_without_validators(self, mock_request):
+        # 304 is unexpected for unconditional request
+        mock_request.return_value = get_mocked_response(HTTPStatus.NOT_MODIFIED.value, b'')
+        endpoint = TeamDetailsEndpoint(game_date=self.sample_date, team_id=self.sample_team_id)
+        with self.assertRaises(EndpointRequestError):
+            endpoint.request()
+        self.assertNotIn('if-none-match', mock_request.call_args.kwargs['headers'])
@@ -0,0 +1,95 @@
+"""
+Unittest cases for constructing schemes from trusted data
+"""
+from concurrent.futures import ThreadPoolExecutor
+import datetime
+import json
+import threading
+from typing import Union
+from unittest import TestCase
+from unittest.mock import patch
+
+from pydantic import BaseModel, ValidationError
+
+from swish_acquisition.scheme.endpoints import (
+    BoxScoreSummaryV3,
+    CommonPlayerInfo,
+    PlayByPlayV3,
+    ScoreboardV3,
+    TeamDetails
+)
+from swish_acquisition.scheme.trusted import _get_converter, construct_model
+
+
+FIXTURES = (
+    (BoxScoreSummaryV3, 'tests/data/endpoints/boxscoresummaryv3/0040900407.json'),
+    (CommonPlayerInfo, 'tests/data/endpoints/commonplayerinfo/893.json'),
+    (PlayByPlayV3, 'tests/data/endpoints/playbyplayv3/0040900407.json'),
+    (ScoreboardV3, 'tests/data/endpoints/scoreboardv3/2022-05-29.json'),
+    (TeamDetails, 'tests/data/endpoints/teamdetails/1610612741.json')
+)
+
+
+class ConstructModelTestCases(TestCase):
+
+    def test_same_as_validated(self):
+        for model, path in FIXTURES:
+            with open(path, 'r') as fp:
+                data = json.load(fp)
+            with self.subTest(model=model.__name__):
+                constructed, validated = construct_model(model, data), model.model_validate(data)
+                self.assertEqual(constructed, validated)
+                self.assertEqual(constructed.model_dump(), validated.model_dump())
+
+    def test_parsed_values(self):
+        with open('tests/data/endpoints/commonplayerinfo/893.json', 'r') as fp:
+            data = json.load(fp)
+        common_player_info = construct_model(CommonPlayerInfo, data)
+        row, *_ = common_player_info.resultSets[0].rowSet
+        self.assertIsInstance(row.BIRTHDATE, datetime.datetime)
+
+    def test_union_member_same_as_validated(self):
+        with open('tests/data/endpoints/teamdetails/1610612741.json', 'r') as fp:
+            data = json.load(fp)
+        validated_types = [type(result_set) for result_set in TeamDetails.model_validate(data).resultSets]
+        # the first construction learns members from validation, and the second one reuses them
+        for _ in range(2):
+            team_details = construct_model(TeamDetails, data)
+            self.assertListEqual([type(result_set) for result_set in team_details.resultSets], validated_types)
+
+    def test_concurrent_construction(self):
+        with open('tests/data/endpoints/commonplayerinfo/893.json', 'r') as fp:
+            data = json.load(fp)
+        validated = CommonPlayerInfo.model_validate(data)
+        # converters are resolved from scratch by the concurrent callers
+        _get_converter.cache_clear()
+        barrier = threading.Barrier(8)
+
+        def _construct():
+            barrier.wait()
+            return construct_model(CommonPlayerInfo, data)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(lambda _: _construct(), range(8)))
+        for result in results:
+            self.assertEqual(result, validated)
+
+    def test_union(self):
+
+        class Foo(BaseModel):
+            foo: int
+
+        class Bar(BaseModel):
+            bar: int
+
+        class FooOrBar(BaseModel):
+            item: Union[Foo, Bar]
+
+        self.assertEqual(construct_model(FooOrBar, {'item': {'foo': 1}}).item, Foo(foo=1))
+        # member of the same shape is constructed without validation
+        with patch.object(Foo, 'model_construct', wraps=Foo.model_construct) as mock_construct:
+            self.assertEqual(construct_model(FooOrBar, {'item': {'foo': 2}}).item, Foo(foo=2))
+        mock_construct.assert_called_once_with(foo=2)
+        self.assertEqual(construct_model(FooOrBar, {'item': {'bar': 1}}).item, Bar(bar=1))
+        with self.assertRaises(ValidationError):
+            construct_model(FooOrBar, {'item': {'baz': 1}})
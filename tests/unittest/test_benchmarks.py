@@ -0,0 +1,54 @@
+"""
+Unittest cases for the benchmark suite
+"""
+import datetime
+from unittest import TestCase
+
+from minio import S3Error
+
+from benchmarks.stand_ins import InMemoryS3Client
+from benchmarks.suite import compare_results, run_suite, stand_in_environment
+from swish_acquisition.collectors import TeamDetailsCollector
+from swish_acquisition.s3 import get_s3_object_stat
+
+
+class StandInTestCases(TestCase):
+
+    def test_collector_against_stand_ins(self):
+        with stand_in_environment() as (server, s3_client):
+            collector = TeamDetailsCollector(game_date=datetime.date(2023, 12, 25), team_id=1610612741)
+            collector.run()
+            self.assertEqual(server.request_count, 1)
+            self.assertEqual(len(s3_client), 1)
+            stat = get_s3_object_stat('teamdetails', collector.object_path)
+            self.assertIn('etag', stat.get_upstream_validators())
+
+            # stored object carries the validator, which the stand-in replies as not modified
+            collector.run(overwritten=True)
+            self.assertEqual(server.request_count, 2)
+            self.assertEqual(collector.get_dict()['resultSets'], collector.get_object_data()['resultSets'])
+
+    def test_object_not_found(self):
+        with self.assertRaises(S3Error):
+            InMemoryS3Client().get_object('teamdetails', '/1610612741.json')
+
+
+class SuiteTestCases(TestCase):
+
+    def test_run_suite(self):
+        result = run_suite(iterations=1, validation_seconds=0)
+        results = result['results']
+        self.assertEqual(set(results['collectors'].keys()), {
+            'BoxscoreSummaryCollector', 'CommonPlayerInfoCollector', 'PlayByPlayCollector',
+            'ScoreboardCollector', 'TeamDetailsCollector'
+        })
+        self.assertGreater(results['game_series']['cold']['requests'], 1)
+        self.assertGreater(results['schemes']['PlayByPlayV3']['docs_per_second'], 0)
+
+    def test_compare_results(self):
+        baseline = {'results': {'schemes': {'TeamDetails': {'docs_per_second': 100}}, 'max_rss': 0}}
+        current = {'results': {'schemes': {'TeamDetails': {'docs_per_second': 150}}, 'max_rss': 10}}
+        self.assertListEqual(compare_results(baseline, current), [
+            'max_rss: 0 -> 10 (n/a)',
+            'schemes.TeamDetails.docs_per_second: 100 -> 150 (+50.0%)'
+        ])
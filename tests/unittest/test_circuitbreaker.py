@@ -0,0 +1,129 @@
+"""
+Unittest cases for circuit breaker
+"""
+from http import HTTPStatus
+import tempfile
+from unittest import TestCase
+from unittest.mock import patch
+
+from requests import ConnectTimeout
+
+from swish_acquisition.circuitbreaker import CircuitBreaker, CircuitOpenError, get_circuit_breaker
+from swish_acquisition.conf import settings
+from swish_acquisition.endpoints import TeamDetailsEndpoint
+from swish_acquisition.shared_state import get_shared_state, MemorySharedState
+from tests.utils import get_mocked_response
+
+
+class CircuitBreakerTestCases(TestCase):
+
+    def setUp(self) -> None:
+        self.shared_state = MemorySharedState()
+        self.circuit_breaker = CircuitBreaker('test', failure_threshold=3, recovery_timeout=60,
+                                              shared_state=self.shared_state)
+
+    @patch('swish_acquisition.circuitbreaker.time.time')
+    def test_open_after_consecutive_failures(self, mock_time):
+        mock_time.return_value = 1000.0
+        for _ in range(2):
+            self.circuit_breaker.before_request()
+            self.circuit_breaker.record_failure()
+        # success resets the failures
+        self.circuit_breaker.record_success()
+        for _ in range(3):
+            self.circuit_breaker.before_request()
+            self.circuit_breaker.record_failure()
+
+        mock_time.return_value = 1010.0
+        with self.assertRaises(CircuitOpenError) as cm:
+            self.circuit_breaker.before_request()
+        self.assertAlmostEqual(cm.exception.retry_after, 50)
+
+        # shared by holders
+        another_circuit_breaker = CircuitBreaker('test', failure_threshold=3, recovery_timeout=60,
+                                                 shared_state=self.shared_state)
+        with self.assertRaises(CircuitOpenError):
+            another_circuit_breaker.before_request()
+
+    @patch('swish_acquisition.circuitbreaker.time.time')
+    def test_half_open(self, mock_time):
+        mock_time.return_value = 1000.0
+        for _ in range(3):
+            self.circuit_breaker.record_failure()
+
+        # 01. a single probe passes, failed probe opens the circuit again
+        mock_time.return_value = 1060.0
+        self.circuit_breaker.before_request()
+        with self.assertRaises(CircuitOpenError):
+            self.circuit_breaker.before_request()
+        self.circuit_breaker.record_failure()
+        mock_time.return_value = 1100.0
+        with self.assertRaises(CircuitOpenError):
+            self.circuit_breaker.before_request()
+
+        # 02. succeeded probe closes the circuit
+        mock_time.return_value = 1120.0
+        self.circuit_breaker.before_request()
+        self.circuit_breaker.record_success()
+        for _ in range(3):
+            self.circuit_breaker.before_request()
+
+    @patch('swish_acquisition.circuitbreaker.time.time')
+    def test_abandoned_probe(self, mock_time):
+        mock_time.return_value = 1000.0
+        for _ in range(3):
+            self.circuit_breaker.record_failure()
+        mock_time.return_value = 1060.0
+        self.circuit_breaker.before_request()
+
+        # the probe never reports, another one is allowed after recovery timeout
+        mock_time.return_value = 1120.0
+        self.circuit_breaker.before_request()
+
+    def test_disabled(self):
+        circuit_breaker = CircuitBreaker('test', failure_threshold=0, recovery_timeout=60,
+                                         shared_state=self.shared_state)
+        for _ in range(10):
+            circuit_breaker.record_failure()
+        circuit_breaker.before_request()
+
+
+@patch('swish_acquisition.endpoints.base.get_rate_limiter')
+@patch('swish_acquisition.endpoints.base.get_http_client')
+class EndpointCircuitBreakerTestCases(TestCase):
+
+    def setUp(self) -> None:
+        # settings are patched for the cleanups as well, which never touch the real state directory
+        temporary_directory = tempfile.TemporaryDirectory()
+        self.addCleanup(temporary_directory.cleanup)
+        for patcher in (
+            patch.object(settings, 'CIRCUIT_BREAKER_BACKEND', 'memory'),
+            patch.object(settings, 'CIRCUIT_BREAKER_FAILURE_THRESHOLD', 2),
+            patch.object(settings, 'SHARED_STATE_DIRECTORY', temporary_directory.name)
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self._clear_circuit_state()
+        self.addCleanup(self._clear_circuit_state)
+
+    def _clear_circuit_state(self) -> None:
+        circuit_breaker = get_circuit_breaker(TeamDetailsEndpoint.ENDPOINT)
+        with get_shared_state('memory').locked(circuit_breaker.state_key) as state:
+            state.clear()
+
+    def test_fail_fast(self, mock_get_http_client, mock_get_rate_limiter):
+        mock_get = mock_get_http_client.return_value.get
+        mock_get.side_effect = [
+            ConnectTimeout('connect timed out'),
+            get_mocked_response(HTTPStatus.SERVICE_UNAVAILABLE.value, b'')
+        ]
+        url = 'https://stats.nba.com/stats/teamdetails'
+        with self.assertRaises(ConnectTimeout):
+            TeamDetailsEndpoint._send_api_request(url=url)
+        TeamDetailsEndpoint._send_api_request(url=url)
+
+        # neither a token nor a connection is taken
+        with self.assertRaises(CircuitOpenError):
+            TeamDetailsEndpoint._send_api_request(url=url)
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(mock_get_rate_limiter.return_value.acquire.call_count, 2)
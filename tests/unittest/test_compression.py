@@ -0,0 +1,54 @@
+"""
+Unittest cases for compression of stored raw data
+"""
+import importlib.util
+from unittest import skipUnless, TestCase
+
+from swish_acquisition.compression import (
+    decompress,
+    get_storage_codec,
+    GzipCodec,
+    IdentityCodec
+)
+
+
+with open('tests/data/endpoints/playbyplayv3/0040900407.json', 'rb') as fp:
+    PLAYBYPLAY_V3_CONTENT = fp.read()
+
+
+IS_ZSTANDARD_INSTALLED = importlib.util.find_spec('zstandard') is not None
+
+
+class StorageCodecTestCases(TestCase):
+
+    def test_identity(self):
+        codec = get_storage_codec('identity')
+        self.assertIsInstance(codec, IdentityCodec)
+        self.assertIsNone(codec.content_encoding)
+        self.assertEqual(codec.compress(PLAYBYPLAY_V3_CONTENT), PLAYBYPLAY_V3_CONTENT)
+
+    def test_gzip(self):
+        codec = get_storage_codec('gzip')
+        self.assertIsInstance(codec, GzipCodec)
+        self.assertEqual(codec.content_encoding, 'gzip')
+
+        content = codec.compress(PLAYBYPLAY_V3_CONTENT)
+        self.assertLess(len(content), len(PLAYBYPLAY_V3_CONTENT))
+        self.assertEqual(codec.compress(PLAYBYPLAY_V3_CONTENT), content)
+        self.assertEqual(decompress(content), PLAYBYPLAY_V3_CONTENT)
+
+    @skipUnless(IS_ZSTANDARD_INSTALLED, 'zstandard is not installed')
+    def test_zstd(self):
+        codec = get_storage_codec('zstd')
+        self.assertEqual(codec.content_encoding, 'zstd')
+
+        content = codec.compress(PLAYBYPLAY_V3_CONTENT)
+        self.assertLess(len(content), len(PLAYBYPLAY_V3_CONTENT))
+        self.assertEqual(decompress(content), PLAYBYPLAY_V3_CONTENT)
+
+    def test_decompress_uncompressed_content(self):
+        self.assertEqual(decompress(PLAYBYPLAY_V3_CONTENT), PLAYBYPLAY_V3_CONTENT)
+
+    def test_unsupported_codec(self):
+        with self.assertRaises(ValueError):
+            get_storage_codec('brotli')
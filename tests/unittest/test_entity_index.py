@@ -0,0 +1,73 @@
+"""
+Unittest cases for index of stored entities
+"""
+from unittest import TestCase
+from unittest.mock import patch
+
+from swish_acquisition.conf import settings
+from swish_acquisition.entity_index import (
+    get_known_entity_index,
+    KnownEntityIndex,
+    reset_known_entity_indexes
+)
+from swish_acquisition.shared_state import MemorySharedState
+
+
+class KnownEntityIndexTestCases(TestCase):
+
+    def setUp(self):
+        self.shared_state = MemorySharedState()
+
+    def test_known_entity(self):
+        index = KnownEntityIndex(name='teamdetails', ttl=60, shared_state=self.shared_state)
+        self.assertFalse(index.is_known('/1610612741.json'))
+        index.add('/1610612741.json')
+        self.assertTrue(index.is_known('/1610612741.json'))
+
+    def test_loaded_from_shared_state(self):
+        KnownEntityIndex(name='teamdetails', ttl=60, shared_state=self.shared_state).add('/1610612741.json')
+
+        # e.g. index of another process
+        index = KnownEntityIndex(name='teamdetails', ttl=60, shared_state=self.shared_state)
+        self.assertTrue(index.is_known('/1610612741.json'))
+
+    @patch('swish_acquisition.entity_index.time.time')
+    def test_expired_entity(self, mock_time):
+        index = KnownEntityIndex(name='teamdetails', ttl=60, shared_state=self.shared_state)
+        mock_time.return_value = 1000
+        index.add('/1610612741.json')
+        mock_time.return_value = 1059
+        self.assertTrue(index.is_known('/1610612741.json'))
+        mock_time.return_value = 1060
+        self.assertFalse(index.is_known('/1610612741.json'))
+
+        # expired ones are evicted from shared state when adding
+        index.add('/1610612742.json')
+        with self.shared_state.locked(index.state_key) as state:
+            self.assertListEqual(list(state.keys()), ['/1610612742.json'])
+
+    def test_never_expired(self):
+        index = KnownEntityIndex(name='teamdetails', ttl=0, shared_state=self.shared_state)
+        with patch('swish_acquisition.entity_index.time.time', return_value=0):
+            index.add('/1610612741.json')
+        self.assertTrue(index.is_known('/1610612741.json'))
+
+    def test_lru_in_process(self):
+        index = KnownEntityIndex(name='teamdetails', ttl=60, shared_state=self.shared_state, maxsize=2)
+        for team_id in range(3):
+            index.add(f'/{team_id}.json')
+        self.assertListEqual(list(index._cache.keys()), ['/1.json', '/2.json'])
+        # evicted one is still known by shared state
+        self.assertTrue(index.is_known('/0.json'))
+
+    def test_get_known_entity_index(self):
+        reset_known_entity_indexes()
+        with patch.object(settings, 'KNOWN_ENTITY_BACKEND', None):
+            self.assertIsNone(get_known_entity_index('teamdetails'))
+        with patch.object(settings, 'KNOWN_ENTITY_BACKEND', 'memory'):
+            index = get_known_entity_index('teamdetails')
+            self.assertIs(index, get_known_entity_index('teamdetails'))
+            self.assertIsNot(index, get_known_entity_index('commonplayerinfo'))
+            # ttl of the latter call isn't ignored
+            self.assertEqual(get_known_entity_index('teamdetails', ttl=60).ttl, 60)
+        reset_known_entity_indexes()
@@ -0,0 +1,61 @@
+"""
+Unittest cases for columnar export of stored raw data
+"""
+import datetime
+import importlib.util
+import io
+import json
+from unittest import skipUnless, TestCase
+from unittest.mock import patch
+
+from swish_acquisition.conf import settings
+from swish_acquisition.export import export_play_by_play, get_play_by_play_table, get_season
+
+
+with open('tests/data/endpoints/playbyplayv3/0040900407.json', 'r') as fp:
+    PLAYBYPLAY_V3_DATA = json.load(fp)
+
+
+IS_PYARROW_INSTALLED = importlib.util.find_spec('pyarrow') is not None
+
+
+class SeasonTestCases(TestCase):
+
+    def test_get_season(self):
+        self.assertEqual(get_season('0040900407'), 2009)
+        self.assertEqual(get_season('0022300001'), 2023)
+        self.assertEqual(get_season('0029600001'), 1996)
+
+
+@skipUnless(IS_PYARROW_INSTALLED, 'pyarrow is not installed')
+class PlayByPlayExportTestCases(TestCase):
+
+    def test_get_play_by_play_table(self):
+        import pyarrow  # NOQA
+
+        table = get_play_by_play_table(PLAYBYPLAY_V3_DATA)
+        actions = PLAYBYPLAY_V3_DATA['game']['actions']
+        self.assertEqual(table.num_rows, len(actions))
+        self.assertEqual(table.column('gameId')[0].as_py(), '0040900407')
+        self.assertListEqual(table.column('actionNumber').to_pylist(),
+                             [action['actionNumber'] for action in actions])
+        for name in ('actionType', 'subType', 'teamTricode'):
+            self.assertTrue(pyarrow.types.is_dictionary(table.schema.field(name).type))
+            self.assertListEqual(table.column(name).to_pylist(), [action[name] for action in actions])
+
+    @patch('swish_acquisition.s3.S3_CLIENT')
+    @patch('swish_acquisition.collectors.PlayByPlayCollector.get_object_data')
+    def test_export_play_by_play(self, mock_get_object_data, mock_client):
+        import pyarrow.parquet  # NOQA
+
+        mock_get_object_data.return_value = PLAYBYPLAY_V3_DATA
+        object_name = export_play_by_play(datetime.date(2010, 6, 17), '0040900407')
+        self.assertEqual(object_name, '/season=2009/game_date=2010-06-17/0040900407.parquet')
+
+        bucket_name, put_object_name, data, data_length = mock_client.put_object.call_args.args
+        self.assertEqual(bucket_name, settings.PLAY_BY_PLAY_EXPORT_BUCKET)
+        self.assertEqual(put_object_name, object_name)
+        content = data.read()
+        self.assertEqual(len(content), data_length)
+        table = pyarrow.parquet.read_table(io.BytesIO(content))
+        self.assertTrue(table.equals(get_play_by_play_table(PLAYBYPLAY_V3_DATA)))
@@ -0,0 +1,98 @@
+"""
+Unittest cases for latency tracking
+"""
+from http import HTTPStatus
+from unittest import TestCase
+from unittest.mock import patch
+
+from requests import ReadTimeout
+
+from swish_acquisition.conf import settings
+from swish_acquisition.endpoints import ScoreboardV3Endpoint
+from swish_acquisition.latency import get_latency_tracker, LatencyTracker, reset_latency_trackers
+from tests.utils import get_mocked_response
+
+
+class LatencyTrackerTestCases(TestCase):
+
+    def test_percentile(self):
+        tracker = LatencyTracker('test', window_size=100)
+        self.assertIsNone(tracker.percentile(99))
+        for latency in range(1, 101):
+            tracker.record(latency / 100)
+        self.assertEqual(tracker.percentile(50), 0.5)
+        self.assertEqual(tracker.percentile(99), 0.99)
+        self.assertEqual(tracker.percentile(100), 1.)
+
+    def test_rolling_window(self):
+        tracker = LatencyTracker('test', window_size=3)
+        for latency in (10., 0.1, 0.2, 0.3):
+            tracker.record(latency)
+        # the earliest one is rolled out
+        self.assertEqual(len(tracker), 3)
+        self.assertEqual(tracker.percentile(100), 0.3)
+
+    def test_get_timeout(self):
+        tracker = LatencyTracker('test', window_size=100)
+        for _ in range(9):
+            tracker.record(0.2)
+        self.assertIsNone(tracker.get_timeout(multiplier=3, min_samples=10, bounds=(1, 30)))
+
+        tracker.record(0.5)
+        self.assertEqual(tracker.get_timeout(multiplier=3, min_samples=10, bounds=(1, 30)), 1.5)
+        # bounded
+        self.assertEqual(tracker.get_timeout(multiplier=3, min_samples=10, bounds=(2, 30)), 2)
+        self.assertEqual(tracker.get_timeout(multiplier=100, min_samples=10, bounds=(1, 30)), 30)
+
+
+@patch.object(settings, 'ADAPTIVE_TIMEOUT_MIN_SAMPLES', 5)
+@patch.object(settings, 'ADAPTIVE_TIMEOUT_MULTIPLIER', 3)
+@patch.object(settings, 'ADAPTIVE_TIMEOUT_MIN', 1)
+@patch.object(settings, 'ADAPTIVE_TIMEOUT_MAX', 30)
+@patch.object(settings, 'ADAPTIVE_CONNECT_TIMEOUT', 3.05)
+class EndpointTimeoutTestCases(TestCase):
+
+    def setUp(self) -> None:
+        reset_latency_trackers()
+
+    def tearDown(self) -> None:
+        reset_latency_trackers()
+
+    def test_get_timeout(self):
+        tracker = get_latency_tracker(ScoreboardV3Endpoint.ENDPOINT, settings.LATENCY_WINDOW_SIZE)
+        with patch.object(settings, 'REQUEST_TIMEOUT_MODE', 'adaptive'):
+            # 01. not enough latencies
+            self.assertEqual(ScoreboardV3Endpoint.get_timeout(), ScoreboardV3Endpoint.TIMEOUT)
+
+            # 02. fast endpoint
+            for _ in range(5):
+                tracker.record(0.5)
+            self.assertEqual(ScoreboardV3Endpoint.get_timeout(), (1.5, 1.5))
+
+            # 03. slow endpoint, whose connect timeout is bounded
+            for _ in range(5):
+                tracker.record(4)
+            self.assertEqual(ScoreboardV3Endpoint.get_timeout(), (3.05, 12))
+
+        with patch.object(settings, 'REQUEST_TIMEOUT_MODE', 'fixed'):
+            self.assertEqual(ScoreboardV3Endpoint.get_timeout(), ScoreboardV3Endpoint.TIMEOUT)
+
+    @patch('swish_acquisition.endpoints.base.time.monotonic')
+    @patch('swish_acquisition.endpoints.base.get_circuit_breaker')
+    @patch('swish_acquisition.endpoints.base.get_rate_limiter')
+    @patch('swish_acquisition.endpoints.base.get_http_client')
+    def test_latency_recorded(self, mock_get_http_client, mock_get_rate_limiter, mock_get_circuit_breaker,
+                              mock_monotonic):
+        mock_get = mock_get_http_client.return_value.get
+        mock_get.side_effect = [get_mocked_response(HTTPStatus.OK.value, b'{}'), ReadTimeout('read timed out')]
+        mock_monotonic.side_effect = [100., 100.3, 200., 205.]
+        url = 'https://stats.nba.com/stats/scoreboardv3'
+
+        ScoreboardV3Endpoint._send_api_request(url=url, timeout=5)
+        with self.assertRaises(ReadTimeout):
+            ScoreboardV3Endpoint._send_api_request(url=url, timeout=5)
+
+        tracker = get_latency_tracker(ScoreboardV3Endpoint.ENDPOINT, settings.LATENCY_WINDOW_SIZE)
+        self.assertEqual(len(tracker), 2)
+        self.assertAlmostEqual(tracker.percentile(0), 0.3)
+        self.assertAlmostEqual(tracker.percentile(100), 5.)
@@ -0,0 +1,145 @@
+"""
+Unittest cases for compact in-memory representation of Play-by-Play actions
+"""
+import copy
+import json
+import sys
+from unittest import TestCase
+
+from swish_acquisition.playbyplay import (
+    get_period_offset,
+    parse_clock,
+    PlayByPlayColumns,
+    PlayByPlayTimeline
+)
+from swish_acquisition.scheme.endpoints import PlayByPlayV3
+
+
+with open('tests/data/endpoints/playbyplayv3/0040900407.json', 'r') as fp:
+    PLAYBYPLAY_V3_DATA = json.load(fp)
+
+
+class PlayByPlayColumnsTestCases(TestCase):
+
+    def setUp(self):
+        self.actions = PlayByPlayV3.model_validate(PLAYBYPLAY_V3_DATA).game.actions
+
+    def test_rows(self):
+        columns = PlayByPlayColumns.from_dicts([PLAYBYPLAY_V3_DATA])
+
+        self.assertEqual(len(columns), len(self.actions))
+        self.assertListEqual(list(columns), self.actions)
+        self.assertEqual(columns[-1], self.actions[-1])
+        self.assertEqual(columns.get_game_id(0), '0040900407')
+        with self.assertRaises(IndexError):
+            columns.get_row(len(self.actions))
+
+    def test_columns(self):
+        columns = PlayByPlayColumns.from_dicts([PLAYBYPLAY_V3_DATA])
+
+        self.assertEqual(columns.get_column('actionNumber').typecode, 'i')
+        self.assertListEqual(list(columns.get_column('actionNumber')), [item.actionNumber for item in self.actions])
+        self.assertListEqual(columns.get_column('teamTricode'), [item.teamTricode for item in self.actions])
+        self.assertListEqual(columns.get_column('description'), [item.description for item in self.actions])
+
+        codes, categories = columns.get_codes('teamTricode')
+        self.assertEqual(len(codes), len(self.actions))
+        self.assertListEqual(sorted(categories), sorted({item.teamTricode for item in self.actions}))
+
+    def test_batch_of_games(self):
+        other_data = copy.deepcopy(PLAYBYPLAY_V3_DATA)
+        other_data['game']['gameId'] = '0040900406'
+        for action in other_data['game']['actions']:
+            # absent fields take their defaults
+            action.pop('shotResult', None)
+        columns = PlayByPlayColumns.from_dicts([PLAYBYPLAY_V3_DATA, other_data])
+
+        self.assertEqual(len(columns), len(self.actions) * 2)
+        self.assertListEqual(columns.game_ids, ['0040900407', '0040900406'])
+        self.assertEqual(columns.get_game_id(len(self.actions)), '0040900406')
+        self.assertEqual(columns[len(self.actions)].shotResult, '')
+        # dictionaries are shared among games
+        self.assertEqual(len(columns.get_codes('actionType')[1]), len({item.actionType for item in self.actions}))
+        # strings of dictionaries are interned
+        _, categories = columns.get_codes('playerName')
+        self.assertTrue(all(sys.intern(value) is value for value in categories))
+
+    def test_nbytes(self):
+        columns = PlayByPlayColumns.from_dicts([PLAYBYPLAY_V3_DATA])
+        actions_nbytes = sum(
+            sys.getsizeof(item.__dict__) + sum(sys.getsizeof(value) for value in item.__dict__.values())
+            for item in self.actions
+        )
+
+        self.assertEqual(columns.get_nbytes('actionNumber'), len(self.actions) * 4)
+        self.assertLess(columns.get_nbytes(), actions_nbytes / 2)
+
+
+class ClockTestCases(TestCase):
+
+    def test_parse_clock(self):
+        self.assertEqual(parse_clock('PT12M00.00S'), 720.)
+        self.assertEqual(parse_clock('PT11M46.00S'), 706.)
+        self.assertEqual(parse_clock('PT00M03.90S'), 3.9)
+        with self.assertRaises(ValueError):
+            parse_clock('11:46')
+
+    def test_get_period_offset(self):
+        self.assertEqual(get_period_offset(1), 0)
+        self.assertEqual(get_period_offset(4), 2160)
+        self.assertEqual(get_period_offset(5), 2880)
+        self.assertEqual(get_period_offset(6), 3180)
+
+
+class PlayByPlayTimelineTestCases(TestCase):
+
+    def setUp(self):
+        self.columns = PlayByPlayColumns.from_dicts([PLAYBYPLAY_V3_DATA])
+        self.timeline = PlayByPlayTimeline(self.columns)
+
+    def test_game_time(self):
+        actions = list(self.columns)
+        for index, action in enumerate(actions):
+            self.assertEqual(self.timeline.elapsed[index], 720 - parse_clock(action.clock))
+            self.assertEqual(self.timeline.period_offset[index], get_period_offset(action.period))
+            self.assertEqual(self.timeline.game_elapsed[index],
+                             self.timeline.period_offset[index] + self.timeline.elapsed[index])
+        self.assertEqual(self.timeline.game_elapsed[-1], 2880.)
+
+    def test_running_score(self):
+        score_home = score_away = 0
+        for index, action in enumerate(self.columns):
+            score_home = int(action.scoreHome) if action.scoreHome else score_home
+            score_away = int(action.scoreAway) if action.scoreAway else score_away
+            self.assertEqual(self.timeline.score_home[index], score_home)
+            self.assertEqual(self.timeline.score_away[index], score_away)
+        self.assertEqual((self.timeline.score_home[-1], self.timeline.score_away[-1]), (83, 79))
+
+    def test_select(self):
+        positions = self.timeline.select(4, start=600.)
+        expected = [
+            index for index, action in enumerate(self.columns)
+            if action.period == 4 and parse_clock(action.clock) <= 120
+        ]
+
+        self.assertListEqual(sorted(positions), expected)
+        elapsed = [self.timeline.elapsed[position] for position in positions]
+        self.assertListEqual(elapsed, sorted(elapsed))
+        self.assertListEqual(self.timeline.select(4, start=600., game_id='0040900407'), positions)
+        self.assertListEqual(self.timeline.select(4, game_id='0040900406'), [])
+        self.assertListEqual(self.timeline.select(5), [])
+
+    def test_batch_of_games(self):
+        other_data = copy.deepcopy(PLAYBYPLAY_V3_DATA)
+        other_data['game']['gameId'] = '0040900406'
+        columns = PlayByPlayColumns.from_dicts([PLAYBYPLAY_V3_DATA, other_data])
+        timeline = PlayByPlayTimeline(columns)
+        size = len(self.columns)
+
+        # running scores restart from the beginning of each game
+        self.assertEqual(timeline.score_home[size], 0)
+        self.assertEqual(timeline.score_home[-1], 83)
+        positions = timeline.select(4, start=600.)
+        self.assertEqual(len(positions), len(self.timeline.select(4, start=600.)) * 2)
+        self.assertListEqual(timeline.select(4, start=600., game_id='0040900406'),
+                             [position + size for position in self.timeline.select(4, start=600.)])
@@ -0,0 +1,84 @@
+"""
+Unittest cases for rate limiter
+"""
+from unittest import TestCase
+from unittest.mock import patch
+
+from swish_acquisition.conf import settings
+from swish_acquisition.endpoints import TeamDetailsEndpoint
+from swish_acquisition.ratelimit import get_rate_limiter, TokenBucket
+from swish_acquisition.shared_state import MemorySharedState
+
+
+class TokenBucketTestCases(TestCase):
+
+    def setUp(self) -> None:
+        self.shared_state = MemorySharedState()
+
+    @patch('swish_acquisition.ratelimit.time.time')
+    def test_burst(self, mock_time):
+        mock_time.return_value = 1000.0
+        bucket = TokenBucket('test', rate=2, burst=3, shared_state=self.shared_state)
+
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+        # the later one queues behind the former one
+        self.assertAlmostEqual(bucket.reserve(), 1.0)
+
+    @patch('swish_acquisition.ratelimit.time.time')
+    def test_refill(self, mock_time):
+        mock_time.return_value = 1000.0
+        bucket = TokenBucket('test', rate=2, burst=3, shared_state=self.shared_state)
+        for _ in range(3):
+            bucket.reserve()
+
+        mock_time.return_value = 1001.0
+        self.assertEqual([bucket.reserve() for _ in range(2)], [0, 0])
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+
+        # refilled tokens never exceed the burst
+        mock_time.return_value = 2000.0
+        self.assertEqual([bucket.reserve() for _ in range(3)], [0, 0, 0])
+        self.assertAlmostEqual(bucket.reserve(), 0.5)
+
+    def test_shared_by_holders(self):
+        bucket = TokenBucket('test', rate=1, burst=1, shared_state=self.shared_state)
+        another_bucket = TokenBucket('test', rate=1, burst=1, shared_state=self.shared_state)
+
+        self.assertEqual(bucket.reserve(), 0)
+        self.assertGreater(another_bucket.reserve(), 0)
+
+    def test_no_limit(self):
+        bucket = TokenBucket('test', rate=0, burst=1, shared_state=self.shared_state)
+        self.assertEqual([bucket.reserve() for _ in range(10)], [0] * 10)
+
+    @patch('swish_acquisition.ratelimit.time.sleep')
+    def test_acquire(self, mock_sleep):
+        bucket = TokenBucket('test', rate=1, burst=1, shared_state=self.shared_state)
+        bucket.acquire()
+        mock_sleep.assert_not_called()
+
+        bucket.acquire()
+        mock_sleep.assert_called_once()
+
+    def test_get_rate_limiter(self):
+        with patch.object(settings, 'RATE_LIMIT_BACKEND', 'memory'), \
+                patch.object(settings, 'RATE_LIMIT_RATE', 10.0), \
+                patch.object(settings, 'RATE_LIMIT_BURST', 20):
+            bucket = get_rate_limiter()
+        self.assertEqual(bucket.rate, 10.0)
+        self.assertEqual(bucket.burst, 20)
+        self.assertIsInstance(bucket._shared_state, MemorySharedState)
+
+
+class EndpointRateLimitTestCases(TestCase):
+
+    @patch('swish_acquisition.endpoints.base.get_circuit_breaker')
+    @patch('swish_acquisition.endpoints.base.get_http_client')
+    @patch('swish_acquisition.endpoints.base.get_rate_limiter')
+    def test_acquire_before_request(self, mock_get_rate_limiter, mock_get_http_client, mock_get_circuit_breaker):
+        mock_get_http_client.return_value.get.return_value.status_code = 200
+        TeamDetailsEndpoint._send_api_request(url='https://stats.nba.com/stats/mock')
+
+        mock_get_rate_limiter.return_value.acquire.assert_called_once_with()
+        mock_get_http_client.return_value.get.assert_called_once_with(url='https://stats.nba.com/stats/mock')
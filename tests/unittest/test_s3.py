@@ -0,0 +1,136 @@
+"""
+Unittest cases for S3 interaction
+"""
+import datetime
+from http import HTTPStatus
+import json
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+from urllib3.response import BaseHTTPResponse
+
+from minio import S3Error
+
+from swish_acquisition.compression import get_storage_codec
+from swish_acquisition.conf import settings
+from swish_acquisition.s3 import (
+    get_s3_object_data,
+    get_s3_object_data_and_stat,
+    get_s3_object_stat,
+    S3MixIn,
+    StoredObjectStat
+)
+
+
+with open('tests/data/endpoints/teamdetails/1610612741.json', 'r') as fp:
+    TEAM_DETAILS_DATA = json.load(fp)
+
+
+class MockCollector(S3MixIn):
+
+    BUCKET_NAME = 'teamdetails'
+    OBJECT_NAME_PATTERN = '/{team_id}.json'
+
+    def get_object_path_kwargs(self):
+        return {'team_id': 1610612741}
+
+
+class S3MixInTestCases(TestCase):
+
+    @patch('swish_acquisition.s3.S3_CLIENT')
+    def test_upload_compressed(self, mock_client):
+        with patch.object(settings, 'S3_STORAGE_CODEC', 'gzip'):
+            MockCollector().upload_to_s3(TEAM_DETAILS_DATA)
+
+        (bucket_name, object_name, b_data, data_length), kwargs = mock_client.put_object.call_args
+        content = b_data.read()
+        self.assertEqual((bucket_name, object_name), ('teamdetails', '/1610612741.json'))
+        self.assertEqual(data_length, len(content))
+        self.assertDictEqual(kwargs['metadata'], {'Content-Encoding': 'gzip'})
+        self.assertDictEqual(json.loads(get_storage_codec('gzip').decompress(content)), TEAM_DETAILS_DATA)
+
+    @patch('swish_acquisition.s3.S3_CLIENT')
+    def test_upload_by_collector_codec(self, mock_client):
+        collector = MockCollector()
+        collector.STORAGE_CODEC = 'identity'
+        with patch.object(settings, 'S3_STORAGE_CODEC', 'gzip'):
+            collector.upload_to_s3(TEAM_DETAILS_DATA)
+
+        (_, _, b_data, _), kwargs = mock_client.put_object.call_args
+        self.assertIsNone(kwargs['metadata'])
+        self.assertDictEqual(json.loads(b_data.read()), TEAM_DETAILS_DATA)
+
+    @patch('swish_acquisition.s3.S3_CLIENT')
+    def test_upload_empty_data(self, mock_client):
+        with self.assertRaises(ValueError):
+            MockCollector().upload_to_s3({})
+        mock_client.put_object.assert_not_called()
+
+    @patch('swish_acquisition.s3.S3_CLIENT')
+    def test_upload_with_upstream_validators(self, mock_client):
+        with patch.object(settings, 'S3_STORAGE_CODEC', 'gzip'):
+            MockCollector().upload_to_s3(TEAM_DETAILS_DATA, {'etag': '"abc"'})
+
+        _, kwargs = mock_client.put_object.call_args
+        self.assertDictEqual(kwargs['metadata'], {'upstream-etag': '"abc"', 'Content-Encoding': 'gzip'})
+
+    @patch('swish_acquisition.s3.S3_CLIENT')
+    def test_renew_object(self, mock_client):
+        stat = StoredObjectStat(last_modified=None, metadata={'upstream-etag': '"abc"'}, content_encoding='gzip')
+        MockCollector().renew_object(stat)
+
+        (bucket_name, object_name, source), kwargs = mock_client.copy_object.call_args
+        self.assertEqual((bucket_name, object_name), ('teamdetails', '/1610612741.json'))
+        self.assertEqual((source.bucket_name, source.object_name), ('teamdetails', '/1610612741.json'))
+        self.assertEqual(kwargs['metadata_directive'], 'REPLACE')
+        # content is kept as it is, so are its headers
+        self.assertDictEqual(kwargs['metadata'], {
+            'x-amz-meta-upstream-etag': '"abc"',
+            'Content-Type': 'application/json',
+            'Content-Encoding': 'gzip'
+        })
+
+    @patch('swish_acquisition.s3.S3_CLIENT')
+    def test_get_object_data(self, mock_client):
+        content = json.dumps(TEAM_DETAILS_DATA).encode('utf-8')
+        for stored_content in (content, get_storage_codec('gzip').compress(content)):
+            mock_client.get_object.return_value = MagicMock(data=stored_content)
+            self.assertDictEqual(get_s3_object_data('teamdetails', '/1610612741.json'), TEAM_DETAILS_DATA)
+
+    @patch('swish_acquisition.s3.S3_CLIENT')
+    def test_get_object_data_and_stat(self, mock_client):
+        mock_client.get_object.return_value = MagicMock(
+            data=json.dumps(TEAM_DETAILS_DATA).encode('utf-8'),
+            headers={
+                'Last-Modified': 'Mon, 25 Dec 2023 08:00:00 GMT',
+                'Content-Encoding': 'gzip',
+                'X-Amz-Meta-Upstream-ETag': '"abc"'
+            }
+        )
+        data, stat = get_s3_object_data_and_stat('teamdetails', '/1610612741.json')
+        self.assertDictEqual(data, TEAM_DETAILS_DATA)
+        self.assertEqual(stat.last_modified, datetime.datetime(2023, 12, 25, 8, tzinfo=datetime.timezone.utc))
+        self.assertDictEqual(stat.metadata, {'upstream-etag': '"abc"'})
+        self.assertDictEqual(stat.get_upstream_validators(), {'etag': '"abc"'})
+        self.assertEqual(stat.content_encoding, 'gzip')
+
+    @patch('swish_acquisition.s3.S3_CLIENT')
+    def test_get_object_stat(self, mock_client):
+        last_modified = datetime.datetime(2023, 12, 25, 8, tzinfo=datetime.timezone.utc)
+        mock_client.stat_object.return_value = MagicMock(last_modified=last_modified, metadata={})
+        self.assertEqual(get_s3_object_stat('teamdetails', '/1610612741.json').last_modified, last_modified)
+
+        mock_client.stat_object.side_effect = S3Error(
+            code='NoSuchKey',
+            message='The specified key does not exist.',
+            resource='/teamdetails/1610612741.json',
+            request_id='MOCKREQUESTID',
+            host_id='mockhostid',
+            response=BaseHTTPResponse(
+                status=HTTPStatus.NOT_FOUND.value,
+                version=1,
+                reason=None,
+                decode_content=False,
+                request_url=None
+            )
+        )
+        self.assertIsNone(get_s3_object_stat('teamdetails', '/1610612741.json'))
@@ -0,0 +1,80 @@
+"""
+Unittest cases for JSON serialization
+"""
+import importlib.util
+import json
+from unittest import skipUnless, TestCase
+from unittest.mock import patch
+
+from swish_acquisition import serialization
+from swish_acquisition.conf import settings
+from swish_acquisition.serialization import (
+    get_json_backend,
+    ORJSONBackend,
+    StdlibJSONBackend
+)
+
+
+with open('tests/data/endpoints/playbyplayv3/0040900407.json', 'rb') as fp:
+    PLAYBYPLAY_V3_CONTENT = fp.read()
+
+
+IS_ORJSON_INSTALLED = importlib.util.find_spec('orjson') is not None
+
+
+class JSONBackendTestCasesMixIn(object):
+
+    backend_name: str
+
+    def setUp(self) -> None:
+        self.backend = get_json_backend(self.backend_name)
+
+    def test_loads_bytes(self):
+        self.assertDictEqual(self.backend.loads(PLAYBYPLAY_V3_CONTENT), json.loads(PLAYBYPLAY_V3_CONTENT))
+
+    def test_loads_memoryview(self):
+        self.assertDictEqual(self.backend.loads(memoryview(PLAYBYPLAY_V3_CONTENT)),
+                             json.loads(PLAYBYPLAY_V3_CONTENT))
+
+    def test_dumps(self):
+        data = {'name': 'Metta World Peace', 'personId': 1897, 'jerseyNum': '37'}
+        content = self.backend.dumps(data)
+        self.assertIsInstance(content, bytes)
+        self.assertDictEqual(json.loads(content), data)
+
+
+class StdlibJSONBackendTestCases(JSONBackendTestCasesMixIn, TestCase):
+
+    backend_name = 'json'
+
+
+@skipUnless(IS_ORJSON_INSTALLED, 'orjson is not installed')
+class ORJSONBackendTestCases(JSONBackendTestCasesMixIn, TestCase):
+
+    backend_name = 'orjson'
+
+
+class GetJSONBackendTestCases(TestCase):
+
+    def test_auto_backend(self):
+        backend = get_json_backend('auto')
+        expected_cls = ORJSONBackend if IS_ORJSON_INSTALLED else StdlibJSONBackend
+        self.assertIsInstance(backend, expected_cls)
+
+    @patch('swish_acquisition.serialization.ORJSONBackend', side_effect=ImportError)
+    def test_auto_backend_fall_back(self, _):
+        get_json_backend.cache_clear()
+        try:
+            self.assertIsInstance(get_json_backend('auto'), StdlibJSONBackend)
+        finally:
+            get_json_backend.cache_clear()
+
+    def test_unsupported_backend(self):
+        with self.assertRaises(ValueError):
+            get_json_backend('simplejson')
+
+    def test_backend_by_settings(self):
+        with patch.object(settings, 'JSON_BACKEND', 'json'), \
+                patch.object(StdlibJSONBackend, 'loads', return_value={}) as mock_loads:
+            serialization.loads(b'{}')
+        mock_loads.assert_called_once_with(b'{}')
@@ -0,0 +1,77 @@
+"""
+Unittest cases for states shared among threads and processes
+"""
+import json
+from multiprocessing import Process
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+from swish_acquisition.conf import settings
+from swish_acquisition.shared_state import (
+    FileSharedState,
+    get_shared_state,
+    MemorySharedState,
+    PostgresSharedState
+)
+
+
+def _increase_count(directory: str, times: int) -> None:
+    shared_state = FileSharedState(directory)
+    for _ in range(times):
+        with shared_state.locked('counter') as state:
+            state['count'] = state.get('count', 0) + 1
+
+
+class SharedStateTestCases(TestCase):
+
+    def test_memory_shared_state(self):
+        shared_state = MemorySharedState()
+        with shared_state.locked('counter') as state:
+            state['count'] = 1
+        with shared_state.locked('counter') as state:
+            self.assertEqual(state['count'], 1)
+
+    def test_file_shared_state_among_processes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            processes = [Process(target=_increase_count, args=(directory, 50)) for _ in range(4)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+
+            with FileSharedState(directory).locked('counter') as state:
+                self.assertEqual(state['count'], 200)
+
+    def test_file_shared_state_with_broken_content(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(f'{directory}/counter.json', 'w') as fp:
+                fp.write('{"count": ')
+            with FileSharedState(directory).locked('counter') as state:
+                self.assertDictEqual(state, {})
+
+    @patch('swish_acquisition.shared_state.independent_session')
+    @patch.object(PostgresSharedState, '_prepare_table')
+    def test_postgres_shared_state(self, mock_prepare_table, mock_independent_session):
+        session = mock_independent_session.return_value.__enter__.return_value
+        record = MagicMock(state_value='{"count": 1}')
+        session.execute.return_value.scalar_one.return_value = record
+
+        with PostgresSharedState().locked('counter') as state:
+            state['count'] += 1
+
+        # the row lock is held by its own session, rather than the one shared by thread
+        mock_independent_session.assert_called_once_with()
+        self.assertEqual(json.loads(record.state_value), {'count': 2})
+
+    def test_get_shared_state(self):
+        self.assertIsInstance(get_shared_state('memory'), MemorySharedState)
+        self.assertIsInstance(get_shared_state('postgres'), PostgresSharedState)
+        with patch.object(settings, 'SHARED_STATE_DIRECTORY', '/tmp/mock-directory'):
+            shared_state = get_shared_state('file')
+        self.assertIsInstance(shared_state, FileSharedState)
+        self.assertEqual(shared_state._directory, '/tmp/mock-directory')
+
+    def test_get_unsupported_shared_state(self):
+        with self.assertRaises(ValueError):
+            get_shared_state('redis')
@@ -1,21 +1,32 @@
 """
 Celery tasks unittest cases
 """
+import copy
 import datetime
 from http import HTTPStatus
 import json
-from typing import Any
 from unittest import TestCase
 from unittest.mock import patch
-from urllib3.response import BaseHTTPResponse
 
-from minio import S3Error
+from celery.exceptions import Retry
 
 from swish_acquisition.celery_app import app
-from swish_acquisition.endpoints.base import DATE_FORMAT_V3
+from swish_acquisition.circuitbreaker import CircuitOpenError
+from swish_acquisition.collectors import BoxscoreSummaryCollector
+from swish_acquisition.conf import settings
+from swish_acquisition.endpoints.base import DATE_FORMAT_V3, EndpointRequestError
+from swish_acquisition.s3 import StoredObjectStat
+from swish_acquisition.shared_state import get_shared_state
 from swish_acquisition.tasks import (
+    _is_game_series_collected,
+    backfill_game_series,
+    poll_live_play_by_play,
+    scrape_common_player_infos,
     scrape_daily_scoreboard,
-    scrape_single_game_series
+    scrape_play_by_play,
+    scrape_single_game_series,
+    scrape_team_details,
+    watch_live_scoreboard
 )
 from tests.utils import get_mocked_response
 
@@ -37,39 +48,26 @@ class TasksTestCases(TestCase):
     def setUp(self) -> None:
         self.origin_task_always_eager = app.conf.task_always_eager
         app.conf.task_always_eager = True
+        # every case collects entities from scratch
+        self.known_entity_backend_patcher = patch.object(settings, 'KNOWN_ENTITY_BACKEND', None)
+        self.known_entity_backend_patcher.start()
 
     def tearDown(self) -> None:
         app.conf.task_always_eager = self.origin_task_always_eager
+        self.known_entity_backend_patcher.stop()
 
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
-    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.is_s3_object_existed')
     @patch('swish_acquisition.endpoints.ScoreboardV3Endpoint._send_api_request')
     def test_scrape_daily_scoreboard(self, mock_request,
-                                     mock_get_object, mock_upload_object):
+                                     mock_is_object_existed, mock_upload_object):
         sample_game_date = datetime.date(2022, 5, 29)
         sample_league_id = '00'
         mock_request.return_value = get_mocked_response(
             HTTPStatus.OK.value,
             json.dumps(SCOREBOARD_V3_DATA).encode('utf-8')
         )
-        mock_get_object.side_effect = S3Error(
-            code='NoSuchKey',
-            message='The specified key does not exist.',
-            resource='/scoreboard/{year:04d}/{month:02d}/{day:02d}.json'.format(
-                year=sample_game_date.year,
-                month=sample_game_date.month,
-                day=sample_game_date.day
-            ),
-            request_id='MOCKREQUESTID',
-            host_id='mockhostid',
-            response=BaseHTTPResponse(
-                status=HTTPStatus.BAD_REQUEST.value,
-                version=1,
-                reason=None,
-                decode_content=False,
-                request_url=None
-            )
-        )
+        mock_is_object_existed.return_value = False
         mock_upload_object.return_value = None
 
         scrape_daily_scoreboard.delay(
@@ -77,11 +75,11 @@ class TasksTestCases(TestCase):
             league_id=sample_league_id
         )
 
-        mock_upload_object.assert_called_once_with(SCOREBOARD_V3_DATA)
+        mock_upload_object.assert_called_once_with(SCOREBOARD_V3_DATA, {})
 
-    @patch('swish_acquisition.tasks.request_interval')
     @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
-    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
+    @patch('swish_acquisition.s3.is_s3_object_existed')
     @patch('swish_acquisition.endpoints.PlayByPlayV3Endpoint._send_api_request')
     @patch('swish_acquisition.endpoints.CommonPlayerInfoEndpoint._send_api_request')
     @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
@@ -90,15 +88,11 @@ class TasksTestCases(TestCase):
                                        mock_teamdetails_request,
                                        mock_commonplayerinfo_request,
                                        mock_playbyplay_request,
-                                       mock_get_object, mock_upload_object,
-                                       mock_request_interval):
+                                       mock_is_object_existed, mock_get_object_stat,
+                                       mock_upload_object):
         sample_game_date = datetime.date(2022, 5, 29)
         sample_game_id = '0040900407'
 
-        def _get_side_effect_generator(ret: Any, count: int):
-            for _ in range(count):
-                yield ret
-
         game_count = 1
         team_count = 2
         away_player_count = 15
@@ -107,59 +101,460 @@ class TasksTestCases(TestCase):
                                away_player_count + home_player_count +
                                game_count)
 
+        # mocks are shared by concurrent collectors,
+        # so side effects are stateless rather than generators
         mock_boxscore_summary_request.return_value = get_mocked_response(
             HTTPStatus.OK.value,
             json.dumps(BOXSCORE_SUMMARY_V3_DATA).encode('utf-8')
         )
         # would be called for each team
-        mock_teamdetails_request.side_effect = _get_side_effect_generator(
-            get_mocked_response(
-                HTTPStatus.OK.value,
-                json.dumps(TEAM_DETAILS_DATA).encode('utf-8')
-            ),
-            team_count
+        mock_teamdetails_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(TEAM_DETAILS_DATA).encode('utf-8')
         )
         # would be called for every active & inactive players from each team
-        mock_commonplayerinfo_request.side_effect = _get_side_effect_generator(
-            get_mocked_response(
-                HTTPStatus.OK.value,
-                json.dumps(COMMON_PLAYER_INFO_DATA).encode('utf-8')
-            ),
-            away_player_count + home_player_count
+        mock_commonplayerinfo_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(COMMON_PLAYER_INFO_DATA).encode('utf-8')
         )
         mock_playbyplay_request.return_value = get_mocked_response(
             HTTPStatus.OK.value,
             json.dumps(PLAYBYPLAY_V3_DATA).encode('utf-8')
         )
 
-        mock_get_object.side_effect = _get_side_effect_generator(
-            S3Error(
-                code='NoSuchKey',
-                message='The specified key does not exist.',
-                resource='mock_resource.json',
-                request_id='MOCKREQUESTID',
-                host_id='mockhostid',
-                response=BaseHTTPResponse(
-                    status=HTTPStatus.BAD_REQUEST.value,
-                    version=1,
-                    reason=None,
-                    decode_content=False,
-                    request_url=None
-                )
-            ),
-            expected_call_count
-        )
-        mock_upload_object.side_effect = _get_side_effect_generator(
-            None, expected_call_count
+        mock_is_object_existed.return_value = False
+        # teams and players are under refresh policy, which are checked by stat
+        mock_get_object_stat.return_value = None
+        mock_upload_object.return_value = None
+
+        scrape_single_game_series.delay(
+            game_date=sample_game_date.strftime(DATE_FORMAT_V3),
+            game_id=sample_game_id
         )
-        # would be called after each commonplayerinfo & teamdetals request
-        mock_request_interval.side_effect = _get_side_effect_generator(
-            None, team_count + away_player_count + home_player_count
+
+        self.assertEqual(mock_teamdetails_request.call_count, team_count)
+        self.assertEqual(mock_commonplayerinfo_request.call_count, away_player_count + home_player_count)
+        self.assertEqual(mock_upload_object.call_count, expected_call_count)
+
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
+    @patch('swish_acquisition.s3.is_s3_object_existed')
+    @patch('swish_acquisition.endpoints.PlayByPlayV3Endpoint._send_api_request')
+    @patch('swish_acquisition.endpoints.CommonPlayerInfoEndpoint._send_api_request')
+    @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
+    @patch('swish_acquisition.endpoints.BoxScoreSummaryV3Endpoint._send_api_request')
+    def test_scrape_single_game_series_with_stored_objects(self, mock_boxscore_summary_request,
+                                                           mock_teamdetails_request,
+                                                           mock_commonplayerinfo_request,
+                                                           mock_playbyplay_request,
+                                                           mock_is_object_existed, mock_get_object_stat,
+                                                           mock_get_object, mock_upload_object):
+        sample_game_date = datetime.date(2022, 5, 29)
+        sample_game_id = '0040900407'
+
+        mock_is_object_existed.return_value = True
+        mock_get_object_stat.return_value = StoredObjectStat(
+            last_modified=datetime.datetime.now(datetime.timezone.utc)
         )
+        mock_get_object.return_value = BOXSCORE_SUMMARY_V3_DATA
 
         scrape_single_game_series.delay(
             game_date=sample_game_date.strftime(DATE_FORMAT_V3),
             game_id=sample_game_id
         )
 
-        self.assertEqual(mock_upload_object.call_count, expected_call_count)
+        # only Boxscore Summary is downloaded, which provides team and player identifiers
+        mock_get_object.assert_called_once_with(
+            'boxscoresummary', f'/2022/05/29/{sample_game_id}.json'
+        )
+        for mock_request in (mock_boxscore_summary_request, mock_teamdetails_request,
+                             mock_commonplayerinfo_request, mock_playbyplay_request):
+            mock_request.assert_not_called()
+        mock_upload_object.assert_not_called()
+
+    @patch.object(settings, 'GAME_SERIES_PLAYER_CHUNK_SIZE', 8)
+    @patch('swish_acquisition.tasks.group')
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.is_s3_object_existed')
+    @patch('swish_acquisition.endpoints.BoxScoreSummaryV3Endpoint._send_api_request')
+    def test_scrape_single_game_series_fan_out(self, mock_boxscore_summary_request,
+                                               mock_is_object_existed, mock_upload_object, mock_group):
+        mock_boxscore_summary_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(BOXSCORE_SUMMARY_V3_DATA).encode('utf-8')
+        )
+        mock_is_object_existed.return_value = False
+        mock_upload_object.return_value = None
+
+        scrape_single_game_series.delay(game_date='2022-05-29', game_id='0040900407')
+
+        signatures = mock_group.call_args.args
+        task_names = [signature.task for signature in signatures]
+        self.assertEqual(task_names.count(scrape_team_details.name), 2)
+        # 28 players are split into chunks of 8
+        player_chunks = [signature.kwargs['player_ids'] for signature in signatures
+                         if signature.task == scrape_common_player_infos.name]
+        self.assertListEqual([len(player_ids) for player_ids in player_chunks], [8, 8, 8, 4])
+        self.assertEqual(task_names.count(scrape_play_by_play.name), 1)
+        mock_group.return_value.apply_async.assert_called_once_with()
+
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
+    @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
+    def test_subtask_retried(self, mock_request, mock_get_object_stat, mock_upload_object):
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(TEAM_DETAILS_DATA).encode('utf-8')
+        )
+        mock_get_object_stat.side_effect = [ConnectionError('S3 is unavailable'), None]
+        mock_upload_object.return_value = None
+
+        scrape_team_details.delay(game_date='2022-05-29', team_id=1610612741)
+
+        self.assertEqual(mock_get_object_stat.call_count, 2)
+        mock_upload_object.assert_called_once_with(TEAM_DETAILS_DATA, {})
+
+    @patch('swish_acquisition.export.export_play_by_play')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
+    def test_play_by_play_exported(self, mock_get_object_stat, mock_export_play_by_play):
+        mock_get_object_stat.return_value = StoredObjectStat(last_modified=None)
+
+        scrape_play_by_play.delay(game_date='2022-05-29', game_id='0042100307')
+        mock_export_play_by_play.assert_not_called()
+
+        with patch.object(settings, 'PLAY_BY_PLAY_EXPORT_ENABLED', True):
+            scrape_play_by_play.delay(game_date='2022-05-29', game_id='0042100307')
+        mock_export_play_by_play.assert_called_once_with(datetime.date(2022, 5, 29), '0042100307')
+
+    @patch('swish_acquisition.tasks.Task.retry')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
+    @patch('swish_acquisition.endpoints.TeamDetailsEndpoint._send_api_request')
+    def test_subtask_deferred_by_open_circuit(self, mock_request, mock_get_object_stat, mock_retry):
+        mock_get_object_stat.return_value = None
+        mock_request.side_effect = CircuitOpenError('teamdetails', 42.0)
+        mock_retry.side_effect = Retry()
+
+        scrape_team_details.delay(game_date='2022-05-29', team_id=1610612741)
+
+        # deferred until the circuit would be probed, rather than backing off
+        self.assertEqual(mock_retry.call_args.kwargs['countdown'], 42.0)
+        self.assertEqual(mock_retry.call_args.kwargs['max_retries'], settings.CIRCUIT_BREAKER_MAX_DEFERRALS)
+        self.assertFalse(hasattr(scrape_team_details, 'override_max_retries'))
+
+
+class LivePlayByPlayTestCases(TestCase):
+
+    def setUp(self) -> None:
+        self.origin_task_always_eager = app.conf.task_always_eager
+        app.conf.task_always_eager = True
+        self.game_date = '2022-05-29'
+        self.game_id = '0042100307'
+
+    def tearDown(self) -> None:
+        app.conf.task_always_eager = self.origin_task_always_eager
+
+    def _mock_scoreboard(self, mock_request, game_status):
+        data = copy.deepcopy(SCOREBOARD_V3_DATA)
+        data['scoreboard']['games'][0]['gameStatus'] = game_status
+        mock_request.return_value = get_mocked_response(HTTPStatus.OK.value, json.dumps(data).encode('utf-8'))
+
+    @patch.object(poll_live_play_by_play, 'apply_async')
+    @patch('swish_acquisition.collectors.PlayByPlayCollector.run')
+    @patch('swish_acquisition.collectors.PlayByPlayCollector.merge_live_actions')
+    @patch('swish_acquisition.endpoints.ScoreboardV3Endpoint._send_api_request')
+    def test_poll_live_play_by_play(self, mock_request, mock_merge_live_actions, mock_run, mock_apply_async):
+        # 01. rescheduled while the game is in progress
+        self._mock_scoreboard(mock_request, 2)
+        poll_live_play_by_play(game_date=self.game_date, game_id=self.game_id, league_id='00')
+        mock_merge_live_actions.assert_called_once_with()
+        mock_apply_async.assert_called_once_with(
+            kwargs={'game_date': self.game_date, 'game_id': self.game_id, 'league_id': '00', 'polls': 1},
+            countdown=settings.LIVE_PLAY_BY_PLAY_POLL_INTERVAL
+        )
+        mock_run.assert_not_called()
+
+        # 02. collected in whole and stopped once the game is final
+        self._mock_scoreboard(mock_request, 3)
+        with patch('swish_acquisition.export.export_play_by_play') as mock_export_play_by_play, \
+                patch.object(settings, 'PLAY_BY_PLAY_EXPORT_ENABLED', True):
+            poll_live_play_by_play(game_date=self.game_date, game_id=self.game_id, league_id='00', polls=1)
+        self.assertEqual(mock_merge_live_actions.call_count, 1)
+        mock_run.assert_called_once_with(overwritten=True)
+        self.assertEqual(mock_apply_async.call_count, 1)
+        mock_export_play_by_play.assert_called_once_with(datetime.date(2022, 5, 29), self.game_id)
+
+    @patch.object(settings, 'LIVE_PLAY_BY_PLAY_MAX_POLLS', 2)
+    @patch.object(poll_live_play_by_play, 'apply_async')
+    @patch('swish_acquisition.collectors.PlayByPlayCollector.merge_live_actions')
+    @patch('swish_acquisition.endpoints.ScoreboardV3Endpoint._send_api_request')
+    def test_poll_live_play_by_play_given_up(self, mock_request, mock_merge_live_actions, mock_apply_async):
+        self._mock_scoreboard(mock_request, 2)
+        poll_live_play_by_play(game_date=self.game_date, game_id=self.game_id, league_id='00', polls=1)
+
+        mock_merge_live_actions.assert_called_once_with()
+        mock_apply_async.assert_not_called()
+
+    @patch('swish_acquisition.tasks.Task.retry')
+    @patch.object(poll_live_play_by_play, 'apply_async')
+    @patch('swish_acquisition.collectors.PlayByPlayCollector.merge_live_actions')
+    @patch('swish_acquisition.endpoints.ScoreboardV3Endpoint._send_api_request')
+    def test_poll_live_play_by_play_retried(self, mock_request, mock_merge_live_actions, mock_apply_async,
+                                            mock_retry):
+        self._mock_scoreboard(mock_request, 2)
+        mock_merge_live_actions.side_effect = EndpointRequestError('playbyplayv3 | status code 500', 500)
+        mock_retry.side_effect = Retry()
+
+        poll_live_play_by_play.apply(kwargs={'game_date': self.game_date, 'game_id': self.game_id})
+
+        # retried as other subtasks, rather than leaving the partial object behind
+        self.assertIsInstance(mock_retry.call_args.kwargs['exc'], EndpointRequestError)
+        mock_apply_async.assert_not_called()
+
+
+@patch.object(settings, 'LIVE_SCOREBOARD_STATE_BACKEND', 'memory')
+@patch.object(settings, 'LIVE_SCOREBOARD_POLL_INTERVAL', 60)
+@patch.object(settings, 'LIVE_SCOREBOARD_MAX_INTERVAL', 300)
+@patch('swish_acquisition.tasks._get_today', return_value=datetime.date(2022, 5, 29))
+class LiveScoreboardTestCases(TestCase):
+
+    def setUp(self) -> None:
+        self.game_id = '0042100307'
+        self.state_key = 'live_scoreboard.00'
+        with get_shared_state('memory').locked(self.state_key) as state:
+            state.clear()
+
+    def _mock_scoreboard(self, mock_request, game_status):
+        data = copy.deepcopy(SCOREBOARD_V3_DATA)
+        data['scoreboard']['games'][0]['gameStatus'] = game_status
+        mock_request.return_value = get_mocked_response(HTTPStatus.OK.value, json.dumps(data).encode('utf-8'))
+
+    @patch('swish_acquisition.tasks.time.time')
+    @patch.object(scrape_single_game_series, 'delay')
+    @patch('swish_acquisition.endpoints.ScoreboardV3Endpoint._send_api_request')
+    def test_watch_live_scoreboard(self, mock_request, mock_delay, mock_time, mock_get_today):
+        mock_time.return_value = 1000.
+
+        # 01. polled on every tick while the game is live
+        self._mock_scoreboard(mock_request, 2)
+        watch_live_scoreboard()
+        watch_live_scoreboard()
+        self.assertEqual(mock_request.call_count, 2)
+        mock_delay.assert_not_called()
+
+        # 02. game series is enqueued once the game turns final
+        self._mock_scoreboard(mock_request, 3)
+        watch_live_scoreboard()
+        mock_delay.assert_called_once_with(game_date='2022-05-29', game_id=self.game_id)
+
+        # 03. polls are backed off while no games are live, and the final game isn't enqueued again
+        watch_live_scoreboard()
+        self.assertEqual(mock_request.call_count, 3)
+        mock_time.return_value = 1000. + 2 * 60 - 30
+        watch_live_scoreboard()
+        self.assertEqual(mock_request.call_count, 4)
+        mock_time.return_value += 4 * 60 - 30 - 1
+        watch_live_scoreboard()
+        self.assertEqual(mock_request.call_count, 4)
+        mock_time.return_value += 1
+        watch_live_scoreboard()
+        self.assertEqual(mock_request.call_count, 5)
+        self.assertEqual(mock_delay.call_count, 1)
+
+        with get_shared_state('memory').locked(self.state_key) as state:
+            self.assertEqual(state['idle_polls'], 3)
+            # backoff is limited
+            self.assertEqual(state['next_poll_time'], mock_time.return_value + 300 - 30)
+
+    @patch.object(scrape_single_game_series, 'delay')
+    @patch('swish_acquisition.endpoints.ScoreboardV3Endpoint._send_api_request')
+    def test_watch_live_scoreboard_across_midnight(self, mock_request, mock_delay, mock_get_today):
+        # the game of yesterday is still live after midnight
+        with get_shared_state('memory').locked(self.state_key) as state:
+            state['games'] = {self.game_id: {'game_date': '2022-05-28', 'game_status': 2}}
+        yesterday_data = copy.deepcopy(SCOREBOARD_V3_DATA)
+        today_data = copy.deepcopy(SCOREBOARD_V3_DATA)
+        today_data['scoreboard']['games'] = []
+        mock_request.side_effect = [
+            get_mocked_response(HTTPStatus.OK.value, json.dumps(data).encode('utf-8'))
+            for data in (yesterday_data, today_data)
+        ]
+
+        watch_live_scoreboard()
+
+        game_dates = [call.kwargs['params']['GameDate'] for call in mock_request.call_args_list]
+        self.assertListEqual(game_dates, ['2022-05-28', '2022-05-29'])
+        mock_delay.assert_called_once_with(game_date='2022-05-28', game_id=self.game_id)
+        # final game of yesterday is never watched again
+        with get_shared_state('memory').locked(self.state_key) as state:
+            self.assertDictEqual(state['games'], {})
+
+    @patch.object(scrape_single_game_series, 'delay')
+    @patch('swish_acquisition.endpoints.ScoreboardV3Endpoint._send_api_request')
+    def test_watch_live_scoreboard_without_final(self, mock_request, mock_delay, mock_get_today):
+        # the game was postponed two days ago, which never goes final
+        postponed_game_id = '0042100306'
+        with get_shared_state('memory').locked(self.state_key) as state:
+            state['games'] = {postponed_game_id: {'game_date': '2022-05-27', 'game_status': 1}}
+        self._mock_scoreboard(mock_request, 1)
+
+        watch_live_scoreboard()
+
+        game_dates = [call.kwargs['params']['GameDate'] for call in mock_request.call_args_list]
+        self.assertListEqual(game_dates, ['2022-05-29'])
+        mock_delay.assert_not_called()
+        with get_shared_state('memory').locked(self.state_key) as state:
+            self.assertListEqual(list(state['games']), [self.game_id])
+
+
+class BackfillTestCases(TestCase):
+
+    def setUp(self) -> None:
+        self.collected_objects = set()
+        self.object_metadata = {}
+        self.league_id = '00'
+        self.start_date = '2022-05-29'
+        self.end_date = '2022-05-30'
+        self.game_id = '0042100307'
+        self.state_key = f'backfill.{self.league_id}.{self.start_date}.{self.end_date}'
+        with get_shared_state('memory').locked(self.state_key) as progress:
+            progress.clear()
+
+    def _is_object_existed(self, bucket_name: str, object_name: str) -> bool:
+        return (bucket_name, object_name) in self.collected_objects
+
+    def _get_object_stat(self, bucket_name: str, object_name: str):
+        if (bucket_name, object_name) not in self.collected_objects:
+            return None
+        return StoredObjectStat(last_modified=None, metadata=self.object_metadata.get((bucket_name, object_name), {}))
+
+    def _backfill(self):
+        backfill_game_series(start_date=self.start_date, end_date=self.end_date, league_id=self.league_id)
+
+    @patch.object(settings, 'BACKFILL_STATE_BACKEND', 'memory')
+    @patch.object(settings, 'BACKFILL_WINDOW_DAYS', 1)
+    @patch.object(settings, 'BACKFILL_MAX_POLLS', 1)
+    @patch.object(backfill_game_series, 'apply_async')
+    @patch('swish_acquisition.tasks._is_game_series_collected')
+    @patch('swish_acquisition.tasks.group')
+    @patch('swish_acquisition.s3.S3MixIn.upload_to_s3')
+    @patch('swish_acquisition.s3.is_s3_object_existed')
+    @patch('swish_acquisition.endpoints.ScoreboardV3Endpoint._send_api_request')
+    def test_backfill_game_series(self, mock_request, mock_is_object_existed, mock_upload_object,
+                                  mock_group, mock_is_game_series_collected, mock_apply_async):
+        mock_request.return_value = get_mocked_response(
+            HTTPStatus.OK.value,
+            json.dumps(SCOREBOARD_V3_DATA).encode('utf-8')
+        )
+        mock_is_object_existed.side_effect = self._is_object_existed
+        mock_upload_object.return_value = None
+        collected_games = set()
+        mock_is_game_series_collected.side_effect = lambda *game: game in collected_games
+
+        def _get_enqueued_games():
+            signatures = mock_group.call_args.args[0]
+            return [[signature.kwargs['game_date'], signature.kwargs['game_id']] for signature in signatures]
+
+        # 01. games of the 1st window are enqueued
+        self._backfill()
+        self.assertEqual(mock_group.call_count, 1)
+        self.assertListEqual(_get_enqueued_games(), [['2022-05-29', self.game_id]])
+        mock_group.return_value.apply_async.assert_called_once_with()
+        self.assertEqual(mock_apply_async.call_count, 1)
+
+        # 02. waiting for uncollected games
+        self._backfill()
+        self.assertEqual(mock_group.call_count, 1)
+        self.assertEqual(mock_apply_async.call_count, 2)
+
+        # 03. games of the 2nd window are enqueued after the 1st window is collected
+        collected_games.add(('2022-05-29', self.game_id))
+        self._backfill()
+        self.assertListEqual(_get_enqueued_games(), [['2022-05-30', self.game_id]])
+        self.assertEqual(mock_apply_async.call_count, 3)
+
+        # 04. give up waiting after max polls, then finished
+        self._backfill()
+        self._backfill()
+        self.assertEqual(mock_group.call_count, 2)
+        self.assertEqual(mock_apply_async.call_count, 4)
+
+        with get_shared_state('memory').locked(self.state_key) as progress:
+            self.assertEqual(progress['enqueued_count'], 2)
+            self.assertListEqual(progress['failed_games'], [['2022-05-30', self.game_id]])
+
+    @patch.object(settings, 'BACKFILL_STATE_BACKEND', 'memory')
+    @patch.object(backfill_game_series, 'apply_async')
+    @patch('swish_acquisition.tasks._step_backfill')
+    def test_backfill_chain_superseded(self, mock_step_backfill, mock_apply_async):
+        mock_step_backfill.return_value = False
+
+        # 01. the 1st chain is rescheduled with its token and next step
+        self._backfill()
+        first_chain_kwargs = mock_apply_async.call_args.kwargs['kwargs']
+        self.assertEqual(first_chain_kwargs['step'], 1)
+
+        # 02. redelivered step is a duplicate
+        backfill_game_series(**{**first_chain_kwargs, 'step': 0})
+        self.assertEqual(mock_step_backfill.call_count, 1)
+
+        # 03. triggered again, which takes over the 1st chain
+        self._backfill()
+        self.assertEqual(mock_step_backfill.call_count, 2)
+        backfill_game_series(**first_chain_kwargs)
+        self.assertEqual(mock_step_backfill.call_count, 2)
+        self.assertEqual(mock_apply_async.call_count, 2)
+
+        # 04. the 2nd chain goes on
+        backfill_game_series(**mock_apply_async.call_args.kwargs['kwargs'])
+        self.assertEqual(mock_step_backfill.call_count, 3)
+
+    @patch.object(settings, 'BACKFILL_STATE_BACKEND', 'memory')
+    @patch.object(backfill_game_series, 'apply_async')
+    @patch('swish_acquisition.tasks._step_backfill')
+    def test_backfill_deferred_by_open_circuit(self, mock_step_backfill, mock_apply_async):
+        mock_step_backfill.side_effect = CircuitOpenError('scoreboardv3', 30.0)
+
+        # the same step is rescheduled, which is still valid
+        self._backfill()
+        deferred_kwargs = mock_apply_async.call_args.kwargs['kwargs']
+        self.assertEqual(deferred_kwargs['step'], 0)
+        self.assertEqual(mock_apply_async.call_args.kwargs['countdown'], 30.0)
+
+        mock_step_backfill.side_effect = None
+        mock_step_backfill.return_value = False
+        backfill_game_series(**deferred_kwargs)
+        self.assertEqual(mock_step_backfill.call_count, 2)
+        self.assertEqual(mock_apply_async.call_args.kwargs['kwargs']['step'], 1)
+
+    @patch.object(settings, 'KNOWN_ENTITY_BACKEND', None)
+    @patch('swish_acquisition.s3.get_s3_object_data')
+    @patch('swish_acquisition.s3.get_s3_object_stat')
+    @patch('swish_acquisition.s3.is_s3_object_existed')
+    def test_is_game_series_collected(self, mock_is_object_existed, mock_get_object_stat, mock_get_object):
+        game_date, game_id = '2022-05-29', '0040900407'
+        mock_is_object_existed.side_effect = self._is_object_existed
+        mock_get_object_stat.side_effect = self._get_object_stat
+        mock_get_object.return_value = BOXSCORE_SUMMARY_V3_DATA
+        play_by_play_object = ('playbyplay', f'/2022/05/29/{game_id}.json')
+
+        # 01. Play By Play is missing, or partially stored while the game was live
+        self.assertFalse(_is_game_series_collected(game_date, game_id))
+        self.collected_objects.add(play_by_play_object)
+        self.object_metadata[play_by_play_object] = {'partial': 'true'}
+        self.assertFalse(_is_game_series_collected(game_date, game_id))
+        mock_get_object.assert_not_called()
+
+        # 02. teams and players are still being collected
+        self.object_metadata.pop(play_by_play_object)
+        self.assertFalse(_is_game_series_collected(game_date, game_id))
+
+        # 03. every part is collected
+        boxscore_summary = BoxscoreSummaryCollector(game_date=datetime.date(2022, 5, 29), game_id=game_id)
+        boxscore_summary._set_data_dict(BOXSCORE_SUMMARY_V3_DATA)
+        self.collected_objects.update(('teamdetails', f'/{team_id}.json')
+                                      for team_id in boxscore_summary.get_team_ids().values())
+        self.collected_objects.update(('commonplayerinfo', f'/{player_id}.json')
+                                      for player_ids in boxscore_summary.get_player_ids().values()
+                                      for player_id in player_ids)
+        self.assertTrue(_is_game_series_collected(game_date, game_id))
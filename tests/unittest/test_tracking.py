@@ -0,0 +1,212 @@
+"""
+Unittest cases for tracking lifecycles of Celery tasks
+"""
+import datetime
+import json
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+import weakref
+
+from sqlalchemy.dialects import postgresql
+
+from swish_acquisition.conf import settings
+from swish_acquisition.models import Status
+from swish_acquisition.tracking import (
+    _on_task_finished,
+    _on_task_published,
+    _on_task_started,
+    _on_worker_init,
+    get_task_duration_stats,
+    TASK_SIGNAL_HANDLERS,
+    TaskEventRecorder
+)
+
+
+def _get_receivers(signal):
+    # receivers connected with weak=False are kept as they are
+    return [receiver() if isinstance(receiver, weakref.ReferenceType) else receiver
+            for _, receiver in signal.receivers]
+
+
+def _get_mocked_task(name, root_id, parent_id):
+    task = MagicMock()
+    task.name = name
+    task.request.root_id = root_id
+    task.request.parent_id = parent_id
+    return task
+
+
+class TaskEventRecorderTestCases(TestCase):
+
+    def setUp(self):
+        self.recorder = TaskEventRecorder(batch_size=100, flush_interval=5, auto_flush=False)
+
+    def test_merge_task_records(self):
+        started_time = datetime.datetime(2023, 12, 25, tzinfo=datetime.timezone.utc)
+        completed_time = started_time + datetime.timedelta(seconds=3)
+        self.recorder.record_task('pipeline', 'task', task_status=Status.PENDING.value)
+        self.recorder.record_task('pipeline', 'task', task_status=Status.IN_PROGRESS.value,
+                                  started_time=started_time)
+        self.recorder.record_task('pipeline', 'task', task_status=Status.SUCCESS.value,
+                                  completed_time=completed_time)
+
+        self.assertEqual(len(self.recorder._task_records), 1)
+        record = self.recorder._task_records[('pipeline', 'task')]
+        self.assertEqual(record['celery_task_id'], 'task')
+        self.assertEqual(record['task_status'], Status.SUCCESS.value)
+        self.assertEqual(record['started_time'], started_time)
+        self.assertEqual(record['completed_time'], completed_time)
+
+    def test_pending_not_override_later_status(self):
+        # publisher's event arrives after the task started
+        self.recorder.record_task('pipeline', 'task', task_status=Status.IN_PROGRESS.value)
+        self.recorder.record_task('pipeline', 'task', task_status=Status.PENDING.value)
+        self.assertEqual(self.recorder._task_records[('pipeline', 'task')]['task_status'],
+                         Status.IN_PROGRESS.value)
+
+    def test_completed_time_cleared_when_restarted(self):
+        started_time = datetime.datetime(2023, 12, 25, tzinfo=datetime.timezone.utc)
+        self.recorder.record_task('pipeline', 'task', task_status=Status.FAILURE.value,
+                                  completed_time=started_time + datetime.timedelta(seconds=3))
+        self.recorder.record_task('pipeline', 'task', task_status=Status.IN_PROGRESS.value,
+                                  started_time=started_time + datetime.timedelta(seconds=10))
+        self.assertNotIn('completed_time', self.recorder._task_records[('pipeline', 'task')])
+
+    @patch('swish_acquisition.tracking.managed_session')
+    def test_completed_time_cleared_in_database(self, mocked_managed_session):
+        session = mocked_managed_session.return_value.__enter__.return_value
+        self.recorder.record_task('pipeline', 'task', task_status=Status.IN_PROGRESS.value)
+        self.recorder.flush()
+
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        self.assertIn('completed_time = CASE WHEN (excluded.task_status = ', sql)
+
+    @patch('swish_acquisition.tracking.managed_session')
+    def test_flush(self, mocked_managed_session):
+        session = mocked_managed_session.return_value.__enter__.return_value
+        self.recorder.record_pipeline('pipeline', game_date='2023-12-25', league_id='00',
+                                      pipeline_status=Status.IN_PROGRESS.value)
+        self.recorder.record_task('pipeline', 'task', task_status=Status.IN_PROGRESS.value)
+        self.recorder.record_task('pipeline', 'child', task_status=Status.PENDING.value)
+
+        self.recorder.flush()
+        self.assertEqual(session.execute.call_count, 2)
+        pipeline_records = session.execute.call_args_list[0].args[1]
+        self.assertEqual(len(pipeline_records), 1)
+        task_records = session.execute.call_args_list[1].args[1]
+        self.assertEqual(len(task_records), 2)
+        # every record has the same columns for batch insert
+        self.assertEqual(set(task_records[0].keys()), set(task_records[1].keys()))
+        self.assertFalse(self.recorder._task_records)
+        self.assertFalse(self.recorder._pipeline_records)
+
+        # nothing to write
+        self.recorder.flush()
+        self.assertEqual(session.execute.call_count, 2)
+
+    @patch('swish_acquisition.tracking.managed_session')
+    def test_flush_failed(self, mocked_managed_session):
+        mocked_managed_session.side_effect = Exception('database is unavailable')
+        self.recorder.record_task('pipeline', 'task', task_status=Status.IN_PROGRESS.value)
+        with self.assertLogs('swish_acquisition.tracking', level='ERROR'):
+            self.recorder.flush()
+
+
+@patch.object(settings, 'TASK_TRACKING_ENABLED', True)
+@patch('swish_acquisition.tracking.RECORDER')
+class TaskSignalTestCases(TestCase):
+
+    def test_root_task_lifecycle(self, mocked_recorder):
+        task = _get_mocked_task('swish_acquisition.tasks.scrape_daily_scoreboard', None, None)
+        task_kwargs = {'game_date': '2023-12-25', 'league_id': '00'}
+        _on_task_started(task_id='root', task=task, kwargs=task_kwargs)
+        _on_task_finished(task_id='root', task=task, kwargs=task_kwargs, state='SUCCESS')
+
+        started_call, finished_call = mocked_recorder.record_task.call_args_list
+        self.assertEqual(started_call.args, ('root', 'root'))
+        self.assertEqual(started_call.kwargs['task_status'], Status.IN_PROGRESS.value)
+        self.assertIn('started_time', started_call.kwargs)
+        self.assertEqual(json.loads(started_call.kwargs['task_arguments']), task_kwargs)
+        self.assertEqual(finished_call.kwargs['task_status'], Status.SUCCESS.value)
+        self.assertIn('completed_time', finished_call.kwargs)
+
+        started_call, finished_call = mocked_recorder.record_pipeline.call_args_list
+        self.assertEqual(started_call.args, ('root',))
+        self.assertEqual(started_call.kwargs['game_date'], '2023-12-25')
+        self.assertEqual(started_call.kwargs['pipeline_status'], Status.IN_PROGRESS.value)
+        self.assertEqual(finished_call.kwargs['pipeline_status'], Status.SUCCESS.value)
+
+    def test_child_task_failed(self, mocked_recorder):
+        task = _get_mocked_task('swish_acquisition.tasks.scrape_single_game_series', 'root', 'parent')
+        _on_task_finished(task_id='child', task=task, kwargs={}, state='FAILURE')
+
+        call = mocked_recorder.record_task.call_args
+        self.assertEqual(call.args, ('root', 'child'))
+        self.assertEqual(call.kwargs['parent_task_id'], 'parent')
+        self.assertEqual(call.kwargs['task_status'], Status.FAILURE.value)
+        # only root task updates the pipeline
+        mocked_recorder.record_pipeline.assert_not_called()
+
+    def test_task_retried(self, mocked_recorder):
+        task = _get_mocked_task('swish_acquisition.tasks.scrape_team_details', 'root', 'parent')
+        _on_task_finished(task_id='child', task=task, kwargs={}, state='RETRY')
+
+        # still in progress until it runs again
+        mocked_recorder.record_task.assert_not_called()
+
+    def test_task_published(self, mocked_recorder):
+        _on_task_published(
+            sender='swish_acquisition.tasks.scrape_single_game_series',
+            headers={'id': 'child', 'root_id': 'root', 'parent_id': 'root'},
+            body=((), {'game_date': '2023-12-25', 'game_id': '0022300001'}, {})
+        )
+        call = mocked_recorder.record_task.call_args
+        self.assertEqual(call.args, ('root', 'child'))
+        self.assertEqual(call.kwargs['task_status'], Status.PENDING.value)
+
+    def test_tracking_disabled(self, mocked_recorder):
+        task = _get_mocked_task('swish_acquisition.tasks.scrape_daily_scoreboard', None, None)
+        with patch.object(settings, 'TASK_TRACKING_ENABLED', False):
+            _on_task_started(task_id='root', task=task, kwargs={})
+        mocked_recorder.record_task.assert_not_called()
+
+
+class TrackingSetupTestCases(TestCase):
+
+    def test_not_connected_until_worker_init(self):
+        for signal, handler in TASK_SIGNAL_HANDLERS:
+            self.assertNotIn(handler, _get_receivers(signal))
+
+    @patch.object(settings, 'TASK_TRACKING_ENABLED', True)
+    @patch('swish_acquisition.tracking.prepare_models')
+    def test_connected_by_worker_init(self, mock_prepare_models):
+        _on_worker_init()
+        for signal, handler in TASK_SIGNAL_HANDLERS:
+            self.addCleanup(signal.disconnect, handler)
+        mock_prepare_models.assert_called_once_with()
+        for signal, handler in TASK_SIGNAL_HANDLERS:
+            self.assertIn(handler, _get_receivers(signal))
+
+    @patch.object(settings, 'TASK_TRACKING_ENABLED', False)
+    @patch('swish_acquisition.tracking.prepare_models')
+    def test_worker_init_when_disabled(self, mock_prepare_models):
+        _on_worker_init()
+        mock_prepare_models.assert_not_called()
+
+
+class TaskDurationStatsTestCases(TestCase):
+
+    @patch('swish_acquisition.tracking.managed_session')
+    def test_get_task_duration_stats(self, mocked_managed_session):
+        session = mocked_managed_session.return_value.__enter__.return_value
+        row = MagicMock()
+        row._mapping = {'task_name': 'swish_acquisition.tasks.scrape_play_by_play', 'task_count': 3}
+        session.execute.return_value = [row]
+
+        since = datetime.datetime(2023, 12, 25, tzinfo=datetime.timezone.utc)
+        self.assertListEqual(get_task_duration_stats(since), [row._mapping])
+
+        sql = str(session.execute.call_args.args[0].compile(dialect=postgresql.dialect()))
+        self.assertIn('percentile_cont(%(percentile_cont_1)s) WITHIN GROUP', sql)
+        self.assertIn('count(*) FILTER (WHERE swish_task.task_status = %(task_status_1)s)', sql)
+        self.assertIn('GROUP BY swish_task.task_name', sql)
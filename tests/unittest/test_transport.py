@@ -0,0 +1,153 @@
+"""
+Unittest cases for HTTP transport
+"""
+import datetime
+import json
+import os
+import tempfile
+from unittest import TestCase
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from swish_acquisition.conf import settings
+from swish_acquisition.endpoints import TeamDetailsEndpoint
+from swish_acquisition.transport import (
+    CassetteClient,
+    CassetteNotFoundError,
+    get_http_client,
+    reset_http_client
+)
+from tests.utils import get_mocked_response
+
+
+class HTTPTransportTestCases(TestCase):
+
+    def setUp(self) -> None:
+        reset_http_client()
+
+    def tearDown(self) -> None:
+        reset_http_client()
+
+    def test_client_reused_in_same_process(self):
+        client = get_http_client()
+        self.assertIsInstance(client, requests.Session)
+        self.assertIs(get_http_client(), client)
+
+    def test_client_recreated_in_forked_process(self):
+        client = get_http_client()
+        with patch('swish_acquisition.transport.os.getpid', return_value=-1):
+            self.assertIsNot(get_http_client(), client)
+
+    def test_connection_pool_size(self):
+        with patch.object(settings, 'HTTP_POOL_MAXSIZE', 32):
+            client = get_http_client()
+        adapter = client.get_adapter('https://stats.nba.com/stats/')  # type: ignore[attr-defined]
+        self.assertEqual(adapter._pool_maxsize, 32)
+
+    def test_keep_alive_disabled(self):
+        with patch.object(settings, 'HTTP_KEEP_ALIVE', False):
+            client = get_http_client()
+        self.assertEqual(client.headers['Connection'], 'close')  # type: ignore[attr-defined]
+
+    def test_fall_back_when_http2_unavailable(self):
+        with patch.object(settings, 'HTTP2', True), \
+                patch('swish_acquisition.transport.HTTP2Client', side_effect=ImportError):
+            client = get_http_client()
+        self.assertIsInstance(client, requests.Session)
+
+
+class CassetteClientTestCases(TestCase):
+
+    URL = 'https://stats.nba.com/stats/teamdetails'
+    PARAMS = {'TeamID': '1610612737'}
+
+    def setUp(self) -> None:
+        reset_http_client()
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+
+    def tearDown(self) -> None:
+        reset_http_client()
+
+    def test_record_and_replay(self):
+        remote_client = MagicMock()
+        remote_client.get.return_value = get_mocked_response(200, b'{"team": 1}', {'ETag': '"v1"'})
+        recorder = CassetteClient(self.directory.name, client=remote_client)
+        response = recorder.get(self.URL, params=self.PARAMS, timeout=10)
+        self.assertEqual(response.content, b'{"team": 1}')
+
+        path = recorder.get_cassette_path(self.URL, self.PARAMS)
+        self.assertTrue(path.startswith(os.path.join(self.directory.name, 'stats.teamdetails')))
+        with open(path) as fp:
+            self.assertEqual(json.load(fp)['params'], self.PARAMS)
+
+        player = CassetteClient(self.directory.name, latency=0)
+        with patch('swish_acquisition.transport.time.sleep') as mocked_sleep:
+            response = player.get(self.URL, params=self.PARAMS, timeout=10)
+        mocked_sleep.assert_not_called()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'{"team": 1}')
+        self.assertEqual(response.headers['etag'], '"v1"')
+
+    def test_retried_response_not_recorded(self):
+        remote_client = MagicMock()
+        remote_client.get.return_value = get_mocked_response(503, b'')
+        recorder = CassetteClient(self.directory.name, client=remote_client)
+        self.assertEqual(recorder.get(self.URL, params=self.PARAMS).status_code, 503)
+        self.assertFalse(os.path.exists(recorder.get_cassette_path(self.URL, self.PARAMS)))
+
+    def test_not_modified_response_not_recorded(self):
+        remote_client = MagicMock()
+        remote_client.get.side_effect = [
+            get_mocked_response(200, b'{"team": 1}', {'ETag': '"v1"'}),
+            get_mocked_response(304, b'')
+        ]
+        recorder = CassetteClient(self.directory.name, client=remote_client)
+        recorder.get(self.URL, params=self.PARAMS)
+        self.assertEqual(
+            recorder.get(self.URL, params=self.PARAMS, headers={'if-none-match': '"v1"'}).status_code, 304
+        )
+
+        # the full response is kept
+        response = CassetteClient(self.directory.name, latency=0).get(self.URL, params=self.PARAMS)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.content, b'{"team": 1}')
+
+    @patch('swish_acquisition.endpoints.base.get_rate_limiter')
+    @patch('swish_acquisition.endpoints.base.get_circuit_breaker')
+    def test_replay_without_rate_limiter_and_circuit_breaker(self, mock_get_circuit_breaker,
+                                                             mock_get_rate_limiter):
+        endpoint = TeamDetailsEndpoint(game_date=datetime.date(2022, 5, 29), team_id=1610612737)
+        CassetteClient(self.directory.name).save(endpoint._url, endpoint.get_params(), 200, b'{"team": 1}')
+
+        with patch.object(settings, 'HTTP_CASSETTE_MODE', 'replay'), \
+                patch.object(settings, 'HTTP_CASSETTE_DIRECTORY', self.directory.name), \
+                patch.object(settings, 'HTTP_CASSETTE_LATENCY', 0):
+            response = endpoint.request()
+
+        self.assertEqual(response.content, b'{"team": 1}')
+        mock_get_rate_limiter.assert_not_called()
+        mock_get_circuit_breaker.assert_not_called()
+
+    def test_replay_with_latency(self):
+        CassetteClient(self.directory.name).save(self.URL, self.PARAMS, 200, b'{}', latency=0.2)
+        with patch('swish_acquisition.transport.time.sleep') as mocked_sleep:
+            CassetteClient(self.directory.name).get(self.URL, params=self.PARAMS)
+            mocked_sleep.assert_called_once_with(0.2)
+        with patch('swish_acquisition.transport.time.sleep') as mocked_sleep:
+            CassetteClient(self.directory.name, latency=1.5).get(self.URL, params=self.PARAMS)
+            mocked_sleep.assert_called_once_with(1.5)
+
+    def test_replay_not_recorded(self):
+        with self.assertRaises(CassetteNotFoundError):
+            CassetteClient(self.directory.name).get(self.URL, params=self.PARAMS)
+
+    def test_selected_by_settings(self):
+        with patch.object(settings, 'HTTP_CASSETTE_MODE', 'replay'), \
+                patch.object(settings, 'HTTP_CASSETTE_DIRECTORY', self.directory.name):
+            self.assertIsInstance(get_http_client(), CassetteClient)
+        reset_http_client()
+        with patch.object(settings, 'HTTP_CASSETTE_MODE', 'unknown'):
+            with self.assertRaises(ValueError):
+                get_http_client()
@@ -3,16 +3,18 @@ Utilities for test cases
 """
 from functools import partial
 from http import HTTPStatus
-from typing import cast
+from typing import cast, Dict, Optional
 
 from requests import Response
+from requests.structures import CaseInsensitiveDict
 
 
 class MockResponse(object):
 
-    def __init__(self, status_code: int, content: bytes):
+    def __init__(self, status_code: int, content: bytes, headers: Optional[Dict] = None):
         self._status_code = status_code
         self._content = content
+        self._headers = CaseInsensitiveDict(headers or {})
 
     @property
     def status_code(self):
@@ -22,9 +24,13 @@ class MockResponse(object):
     def content(self):
         return self._content
 
+    @property
+    def headers(self):
+        return self._headers
+
 
-def get_mocked_response(status_code: int, content: bytes) -> Response:
-    mock_resp = cast(Response, MockResponse(status_code, content))
+def get_mocked_response(status_code: int, content: bytes, headers: Optional[Dict] = None) -> Response:
+    mock_resp = cast(Response, MockResponse(status_code, content, headers))
     return mock_resp
 
 